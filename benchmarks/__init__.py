@@ -0,0 +1,2 @@
+# Door Kickers 2 Modding Tool - Benchmarks
+# Synthetic mod corpus generator and timing runner, see run.py
@@ -0,0 +1,159 @@
+import os
+import random
+import xml.etree.ElementTree as ET
+
+EQUIPMENT_TAGS = ["Firearm", "Armor", "Grenade", "Utility", "Shield", "HelmetNVG", "Scope", "Tool", "Crowbar"]
+CATEGORIES = ["pistol", "rifle", "smg", "shotgun", "sniper", ""]
+SLOTS = ["Primary", "Secondary", "Armor", "Utility", ""]
+MODIFIER_TYPES = ["accuracy", "moveSpeed", "reloadSpeed", "armorClass", "hearingRange", "fovRange"]
+
+DEFAULT_SIZES = {
+    "mods": 5,               # Mods under <game>/mods
+    "classes": 12,           # Classes per unit file
+    "equipment_files": 4,    # Equipment files per mod (and in data/equipment)
+    "items_per_file": 60,    # Equipment items per equipment file
+    "entities": 40,          # Human entities per mod
+    "doctrine_sections": 4,  # Sections in the doctrine tree
+    "doctrine_nodes": 48,    # Doctrine nodes per mod
+}
+
+def write_xml(root, file_path):
+    """Write an element tree with an XML declaration, creating directories"""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    ET.indent(root)
+    ET.ElementTree(root).write(file_path, encoding="utf-8", xml_declaration=True)
+
+def make_equipment(rng, prefix, item_count, class_names):
+    """Equipment file with items and bindings in all three <Bind> formats"""
+    root = ET.Element("Equipment")
+    names = []
+    for i in range(item_count):
+        tag = rng.choice(EQUIPMENT_TAGS)
+        name = f"{prefix}_{tag}_{i}"
+        names.append(name)
+        item = ET.SubElement(root, tag, name=name, category=rng.choice(CATEGORIES),
+                             inventoryBinding=rng.choice(SLOTS))
+        ET.SubElement(item, "Params", damage=str(rng.randint(10, 90)),
+                      range=str(rng.randint(5, 60)), weight=f"{rng.uniform(0.1, 9):.2f}")
+        if tag == "Firearm":
+            ET.SubElement(item, "Firing", rpm=str(rng.randint(300, 900)))
+        ET.SubElement(root, "Ammo", name=f"{name}_ammo")
+
+    for i, name in enumerate(names):
+        targets = rng.sample(class_names, k=min(len(class_names), rng.randint(1, 3)))
+        style = i % 3
+        if style == 0:
+            # Format 1: <Bind eqp="X" to="Y"/>
+            for target in targets:
+                ET.SubElement(root, "Bind", eqp=name, to=target)
+        elif style == 1:
+            # Format 2: <Bind eqp="X"><to name="Y"/></Bind>
+            bind = ET.SubElement(root, "Bind", eqp=name)
+            for target in targets:
+                ET.SubElement(bind, "to", name=target)
+        else:
+            # Format 3: <Bind to="Y"><eqp name="X"/></Bind>
+            for target in targets:
+                bind = ET.SubElement(root, "Bind", to=target)
+                ET.SubElement(bind, "eqp", name=name)
+    return root
+
+def make_units(faction, class_names):
+    root = ET.Element("Units")
+    unit = ET.SubElement(root, "Unit", name=faction)
+    classes = ET.SubElement(unit, "Classes")
+    for class_name in class_names:
+        ET.SubElement(classes, "Class", name=class_name, numSlots="4")
+    return root
+
+def make_entities(rng, faction, class_names, count):
+    root = ET.Element("Entities")
+    for i in range(count):
+        entity = ET.SubElement(root, "Entity", name=f"{faction}_Human_{i}", type="Human")
+        ET.SubElement(entity, "PhysicalParams", radius="20")
+        human = ET.SubElement(entity, "Human")
+        ET.SubElement(human, "Id", unit=faction, **{"class": rng.choice(class_names)})
+        ET.SubElement(human, "FOV", degrees=str(rng.randint(60, 120)))
+        mobility = ET.SubElement(human, "Mobility")
+        ET.SubElement(mobility, "MoveSpeed", value=str(rng.randint(200, 400)))
+    return root
+
+def make_doctrine(rng, faction, section_count, node_count):
+    """Doctrine nodes file and the matching doctrine tree GUI file"""
+    nodes_root = ET.Element("DoctrineNodes")
+    tree_root = ET.Element("GUIItems")
+    container = ET.SubElement(tree_root, "Item", name="#MARSOC_DoctrineTree")
+    sections = [ET.SubElement(container, "Item", name=f"section{s}", align="lt", sizeX="350",
+                              sizeY="780", origin=f"{s * 400} -70")
+                for s in range(section_count)]
+
+    names = []
+    for i in range(node_count):
+        name = f"{faction}_node_{i}"
+        node = ET.SubElement(nodes_root, "Node", name=name, nameUI=f"Node {i}",
+                             description=f"Doctrine node {i}", icon="data/textures/icon.dds",
+                             maxLevel=str(rng.randint(1, 3)))
+        # Requirements only point at earlier nodes, so the graph stays acyclic
+        if names:
+            requirements = ET.SubElement(node, "Requirements")
+            for requirement in rng.sample(names, k=min(len(names), rng.randint(0, 2))):
+                ET.SubElement(requirements, "Requirement", name=requirement)
+        modifiers = ET.SubElement(node, "Modifiers")
+        for mod_type in rng.sample(MODIFIER_TYPES, k=2):
+            ET.SubElement(modifiers, "Modifier", type=mod_type, value=str(rng.randint(-10, 25)))
+        names.append(name)
+
+        level = i // max(1, section_count)
+        ET.SubElement(sections[i % section_count], "Item", name=name, align="lt",
+                      origin=f"{80 + (i % 2) * 160} {-88 - level * 180}")
+    return nodes_root, tree_root
+
+def generate_mod(rng, mod_path, faction, sizes):
+    class_names = [f"{faction}_Class{i}" for i in range(sizes["classes"])]
+    lower = faction.lower()
+
+    mod_root = ET.Element("Mod", name=faction, version="1.0")
+    ET.SubElement(mod_root, "Description").text = f"Synthetic benchmark mod {faction}"
+    write_xml(mod_root, os.path.join(mod_path, "mod.xml"))
+
+    write_xml(make_units(faction, class_names), os.path.join(mod_path, "units", f"{lower}_unit.xml"))
+    for i in range(sizes["equipment_files"]):
+        write_xml(make_equipment(rng, f"{faction}{i}", sizes["items_per_file"], class_names),
+                  os.path.join(mod_path, "equipment", f"{lower}{i}_binds.xml"))
+    write_xml(make_entities(rng, faction, class_names, sizes["entities"]),
+              os.path.join(mod_path, "entities", f"{lower}_humans.xml"))
+
+    nodes_root, tree_root = make_doctrine(rng, faction, sizes["doctrine_sections"], sizes["doctrine_nodes"])
+    write_xml(nodes_root, os.path.join(mod_path, "units", f"{lower}_doctrine_nodes.xml"))
+    write_xml(tree_root, os.path.join(mod_path, "gui", f"{lower}_doctrine_tree.xml"))
+    write_xml(ET.Element("GUIItems", name=f"{faction}_deploy"), os.path.join(mod_path, "gui", f"{lower}_deploy.xml"))
+
+    localization_path = os.path.join(mod_path, "localization")
+    os.makedirs(localization_path, exist_ok=True)
+    with open(os.path.join(localization_path, f"{lower}_doctrine.txt"), "w", encoding="utf-8") as f:
+        for i in range(sizes["doctrine_nodes"]):
+            f.write(f"{faction}_node_{i}\tNode {i}\n")
+    strings = ET.Element("StringTable")
+    for class_name in class_names:
+        ET.SubElement(strings, "String", name=class_name, text=class_name.replace("_", " "))
+    write_xml(strings, os.path.join(localization_path, f"{lower}_strings.xml"))
+
+def generate_corpus(game_path, seed=0, **sizes):
+    """Create a synthetic game directory with vanilla equipment and mods.
+
+    Sizes default to DEFAULT_SIZES. Returns the list of generated mod paths.
+    """
+    sizes = dict(DEFAULT_SIZES, **sizes)
+    rng = random.Random(seed)
+
+    vanilla_classes = [f"Vanilla_Class{i}" for i in range(sizes["classes"])]
+    for i in range(sizes["equipment_files"]):
+        write_xml(make_equipment(rng, f"Vanilla{i}", sizes["items_per_file"], vanilla_classes),
+                  os.path.join(game_path, "data", "equipment", f"vanilla{i}_binds.xml"))
+
+    mod_paths = []
+    for m in range(sizes["mods"]):
+        mod_path = os.path.join(game_path, "mods", str(3400000000 + m))
+        generate_mod(rng, mod_path, f"BENCH{m}", sizes)
+        mod_paths.append(mod_path)
+    return mod_paths
@@ -0,0 +1,197 @@
+"""Time the headless parts of the modding tool against a synthetic corpus.
+
+Run from the repository root:
+
+    python -m benchmarks.run --mods 20 --items-per-file 200 -o benchmark_report.json
+    python -m benchmarks.run --baseline benchmark_report.json
+
+The report is JSON with the corpus sizes and, per benchmark, the min, median,
+mean and max seconds over --repeat runs. With --baseline, benchmarks whose
+median got slower than --threshold times the baseline median are reported
+and the exit code is 1.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import statistics
+import tempfile
+import xml.etree.ElementTree as ET
+
+from benchmarks.corpus import DEFAULT_SIZES, generate_corpus
+from modules.xml_cache import document_cache
+from modules.mod_files import ModFiles
+from modules.config_editor_module import is_valid_mod_directory
+from modules.doctrine_editor_module import parse_doctrine_nodes, parse_doctrine_tree, layout_section
+from modules.search_index import SearchIndex
+from modules.doctrine_evaluator import evaluate_builds
+import equipment_scanner_test
+
+REPORT_VERSION = 1
+
+def time_runs(func, repeat, setup=None):
+    """Run func repeat times and return the seconds each run took"""
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+def summarize(runs):
+    return {
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.mean(runs),
+        "max": max(runs),
+        "runs": len(runs)
+    }
+
+def find_files(directory, suffix):
+    found = []
+    for root, _, files in os.walk(directory):
+        found.extend(os.path.join(root, f) for f in files if f.endswith(suffix))
+    return sorted(found)
+
+def run_benchmarks(game_path, mod_paths, repeat, workers=None):
+    """Run every benchmark and return {name: summary}"""
+    results = {}
+
+    def scan_mods():
+        for mod_path in mod_paths:
+            mod_files = ModFiles()
+            mod_files.mod_path = mod_path
+            mod_files.scan_mod_directory()
+
+    results["mod_files.scan_mod_directory.cold"] = time_runs(scan_mods, repeat, setup=document_cache.clear)
+    results["mod_files.scan_mod_directory.warm"] = time_runs(scan_mods, repeat)
+
+    results["scan_equipment_files.serial"] = time_runs(
+        lambda: equipment_scanner_test.scan_equipment_files(game_path, workers=1, verbose=False), repeat)
+    results["scan_equipment_files.parallel"] = time_runs(
+        lambda: equipment_scanner_test.scan_equipment_files(game_path, workers=workers, verbose=False), repeat)
+
+    binds = []
+    for file_path in find_files(game_path, "_binds.xml"):
+        binds.extend(ET.parse(file_path).getroot().iter("Bind"))
+
+    def process_bindings():
+        bindings = {}
+        for bind in binds:
+            equipment_scanner_test.process_binding(bind, bindings)
+
+    results["process_binding"] = time_runs(process_bindings, repeat)
+
+    results["is_valid_mod_directory"] = time_runs(
+        lambda: [is_valid_mod_directory(mod_path) for mod_path in mod_paths], repeat)
+
+    nodes_files = [f for mod_path in mod_paths for f in find_files(mod_path, "_doctrine_nodes.xml")]
+    tree_files = [f for mod_path in mod_paths for f in find_files(mod_path, "_doctrine_tree.xml")]
+    definitions = {}
+    results["parse_doctrine_nodes"] = time_runs(
+        lambda: [definitions.update(parse_doctrine_nodes(f)) for f in nodes_files], repeat)
+    results["parse_doctrine_tree"] = time_runs(
+        lambda: [parse_doctrine_tree(f, definitions) for f in tree_files], repeat, setup=document_cache.clear)
+    trees = [parse_doctrine_tree(f, definitions) for f in tree_files]
+    results["evaluate_builds"] = time_runs(
+        lambda: evaluate_builds(definitions, points=3), repeat)
+    results["layout_section"] = time_runs(
+        lambda: [layout_section(section) for tree in trees if tree for section in tree.values()], repeat)
+
+    items = equipment_scanner_test.scan_equipment_files(game_path, workers=1, verbose=False)
+    index = SearchIndex(items)
+    results["search_index.build"] = time_runs(lambda: SearchIndex(items), repeat)
+    results["search_index.query"] = time_runs(
+        lambda: [index.search(query) for query in ("a", "fi", "rifle", "bench1 pistol", "xyz")], repeat)
+
+    return {name: summarize(runs) for name, runs in results.items()}
+
+def compare(results, baseline, threshold):
+    """Return (name, baseline median, median, ratio) for benchmarks that got slower"""
+    regressions = []
+    for name, summary in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median"):
+            continue
+        ratio = summary["median"] / previous["median"]
+        if ratio > threshold:
+            regressions.append((name, previous["median"], summary["median"], ratio))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the modding tool on a synthetic mod corpus")
+    for key, default in DEFAULT_SIZES.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, default=default,
+                            help=f"Corpus size: {key} (default: {default})")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the corpus")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Runs per benchmark (default: 5)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Processes for the parallel equipment scan (default: one per CPU)")
+    parser.add_argument("--corpus", help="Generate the corpus here and keep it (default: a temp dir)")
+    parser.add_argument("-o", "--output", default="benchmark_report.json", help="Report file")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio counted as a regression (default: 1.25)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = {key: getattr(args, key) for key in DEFAULT_SIZES}
+
+    # Start from an empty parse cache
+    document_cache.clear()
+    logging.getLogger("modules.doctrine_editor_module").setLevel(logging.WARNING)
+
+    game_path = args.corpus or tempfile.mkdtemp(prefix="dk2_bench_")
+    try:
+        start = time.perf_counter()
+        mod_paths = generate_corpus(game_path, seed=args.seed, **sizes)
+        print(f"Generated corpus in {time.perf_counter() - start:.2f}s: {game_path}", file=sys.stderr)
+
+        results = run_benchmarks(game_path, mod_paths, args.repeat, args.workers)
+    finally:
+        if not args.corpus:
+            shutil.rmtree(game_path, ignore_errors=True)
+
+    report = {
+        "version": REPORT_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "sizes": sizes,
+        "repeat": args.repeat,
+        "results": results
+    }
+
+    # Read the baseline before writing, it may be the same file
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name, summary in results.items():
+        print(f"{name:<40} {summary['median'] * 1000:10.2f} ms (min {summary['min'] * 1000:.2f})")
+    print(f"Report saved to: {args.output}")
+
+    if baseline is None:
+        return 0
+    if baseline.get("sizes") != sizes:
+        print("Warning: baseline was measured on a corpus of different size", file=sys.stderr)
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after, ratio in regressions:
+        print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
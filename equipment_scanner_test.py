@@ -1,10 +1,17 @@
 import os
+import sys
+import csv
+import time
+import argparse
 import xml.etree.ElementTree as ET
 from pathlib import Path
 import json
 from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor
+from modules.equipment_scan import (TYPE_REMAPPING, iterparse_equipment,
+                                    process_binding, create_equipment_item)
 
-# Define all known equipment types
+# Every equipment type the scanner knows; other top-level elements are reported
 EQUIPMENT_TYPES = [
     "Firearm", "Armor", "Grenade", "Utility",
     "Support", "Shield", "HelmetNVG", "Explosive", 
@@ -14,39 +21,6 @@ EQUIPMENT_TYPES = [
     "Scope", "Magazine"
 ]
 
-# Define type remapping for consolidation
-TYPE_REMAPPING = {
-    "Lockpick": "Utility",
-    "Crowbar": "Utility",
-    "Tool": "Utility"
-}
-
-class EquipmentItem:
-    def __init__(self):
-        self.name = ""
-        self.type = ""  # Firearm, Armor, etc.
-        self.category = ""  # pistol, rifle, etc.
-        self.inventory_slot = ""
-        self.source_file = ""
-        self.source_mod = ""  # vanilla or mod name
-        self.bindings = []  # list of classes/units that can use it
-        self.attributes = {}  # other attributes like damage, etc.
-    
-    def to_dict(self):
-        return {
-            "name": self.name,
-            "type": self.type,
-            "category": self.category,
-            "inventory_slot": self.inventory_slot,
-            "source_file": self.source_file,
-            "source_mod": self.source_mod,
-            "bindings": sorted(self.bindings) if self.bindings else [],
-            "attributes": dict(sorted(self.attributes.items())) if self.attributes else {}
-        }
-    
-    def __str__(self):
-        return f"{self.name} ({self.type}) - {self.source_mod}"
-
 def sort_equipment_items(items, sort_by="name", reverse=False):
     """Sort equipment items by specified criteria"""
     if sort_by == "name":
@@ -62,124 +36,123 @@ def sort_equipment_items(items, sort_by="name", reverse=False):
     else:
         return items
 
-def scan_equipment_files(base_path):
-    """Scan a directory for equipment files and parse them"""
-    equipment_items = []
-    bindings = {}  # Store bindings to process later
-    unknown_types = set()  # Track any equipment types we haven't seen before
-    
-    print("\nScanning for equipment files...")
-    
-    # Walk through all directories
+CSV_FIELDS = ["name", "type", "category", "inventory_slot", "source_mod", "source_file", "bindings", "attributes"]
+
+def log(message, verbose=True):
+    """Print a progress message to stderr so it never mixes with piped output"""
+    if verbose:
+        print(message, file=sys.stderr)
+
+def find_xml_files(base_path):
+    """Walk base_path and return the paths of all XML files"""
+    xml_files = []
     for root, dirs, files in os.walk(base_path):
         for file in files:
             if file.endswith('.xml'):
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, base_path)
-                mod_name = rel_path.split(os.sep)[0] if os.sep in rel_path else "vanilla"
-                
-                try:
-                    tree = ET.parse(file_path)
-                    root_elem = tree.getroot()
-                    
-                    # Process equipment definitions
-                    if root_elem.tag == "Equipment":
-                        print(f"\nProcessing file: {rel_path}")
-                        
-                        # Process bindings
-                        bindings_found = 0
-                        for bind in root_elem.findall(".//Bind"):
-                            process_binding(bind, bindings)
-                            bindings_found += 1
-                        print(f"  Found {bindings_found} bindings")
-                        
-                        # Process equipment items
-                        items_found = 0
-                        for elem in root_elem:
-                            # Skip Ammo type
-                            if elem.tag == "Ammo":
-                                continue
-                                
-                            # Track unknown types (excluding remapped types)
-                            if elem.tag not in EQUIPMENT_TYPES and elem.tag not in TYPE_REMAPPING and elem.tag != "Bind":
-                                unknown_types.add(elem.tag)
-                            
-                            # Process known equipment types and remapped types
-                            if elem.tag in EQUIPMENT_TYPES or elem.tag in TYPE_REMAPPING:
-                                item = create_equipment_item(elem, file_path, mod_name)
-                                if item:
-                                    equipment_items.append(item)
-                                    items_found += 1
-                        
-                        if items_found > 0:
-                            print(f"  Found {items_found} equipment items")
-                except ET.ParseError:
-                    print(f"Failed to parse XML file: {file_path}")
-                except Exception as e:
-                    print(f"Error processing file {file_path}: {str(e)}")
-    
+                xml_files.append(os.path.join(root, file))
+    return xml_files
+
+def scan_file(file_path, base_path):
+    """Parse one file; runs in the worker processes.
+
+    Returns (items, bindings, unknown_types, message) where message is a
+    parse error or None.
+    """
+    rel_path = os.path.relpath(file_path, base_path)
+    mod_name = rel_path.split(os.sep)[0] if os.sep in rel_path else "vanilla"
+    items = []
+    bindings = {}
+    unknown_types = set()
+
+    try:
+        # Stream the file; only top-level elements and <Bind>s are needed
+        for kind, elem in iterparse_equipment(file_path):
+            if kind == "bind":
+                process_binding(elem, bindings)
+                continue
+            
+            # Skip Ammo type
+            if elem.tag == "Ammo":
+                continue
+            
+            # Track unknown types (excluding remapped types)
+            if elem.tag not in EQUIPMENT_TYPES and elem.tag not in TYPE_REMAPPING:
+                unknown_types.add(elem.tag)
+            
+            # Process known equipment types and remapped types
+            if elem.tag in EQUIPMENT_TYPES or elem.tag in TYPE_REMAPPING:
+                item = create_equipment_item(elem, file_path, mod_name)
+                if item:
+                    items.append(item)
+    except ET.ParseError:
+        return [], {}, set(), f"Failed to parse XML file: {file_path}"
+    except Exception as e:
+        return [], {}, set(), f"Error processing file {file_path}: {str(e)}"
+
+    return items, bindings, unknown_types, None
+
+def scan_equipment_files(base_path, workers=None, timings=None, verbose=True):
+    """Scan a directory for equipment files and parse them.
+
+    Files are parsed on a process pool of the given number of workers (one
+    per CPU by default, 1 parses in this process). If a timings dict is
+    passed, the seconds spent walking, parsing and applying bindings are
+    stored in it.
+    """
+    if timings is None:
+        timings = {}
+    equipment_items = []
+    bindings = {}  # Store bindings to process later
+    unknown_types = set()  # Track any equipment types we haven't seen before
+
+    log("\nScanning for equipment files...", verbose)
+
+    start = time.perf_counter()
+    xml_files = find_xml_files(base_path)
+    timings["walk"] = time.perf_counter() - start
+    timings["files"] = len(xml_files)
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = (scan_file(file_path, base_path) for file_path in xml_files)
+        executor = None
+    else:
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # Chunks keep the per-task overhead low for thousands of small files
+        chunksize = max(1, len(xml_files) // (workers * 8))
+        results = executor.map(scan_file, xml_files, [base_path] * len(xml_files), chunksize=chunksize)
+    try:
+        for file_path, (items, file_bindings, file_unknown_types, message) in zip(xml_files, results):
+            if message:
+                log(message, verbose)
+                continue
+            if items or file_bindings:
+                log(f"\nProcessing file: {os.path.relpath(file_path, base_path)}", verbose)
+                log(f"  Found {sum(len(targets) for targets in file_bindings.values())} bindings", verbose)
+                if items:
+                    log(f"  Found {len(items)} equipment items", verbose)
+            equipment_items.extend(items)
+            unknown_types.update(file_unknown_types)
+            for eqp, targets in file_bindings.items():
+                bindings.setdefault(eqp, set()).update(targets)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    timings["parse"] = time.perf_counter() - start
+
     # Report any unknown types found
     if unknown_types:
-        print("\nFound unknown equipment types:")
+        log("\nFound unknown equipment types:", verbose)
         for type_name in sorted(unknown_types):
-            print(f"  - {type_name}")
-    
+            log(f"  - {type_name}", verbose)
+
     # Apply bindings to equipment items
+    start = time.perf_counter()
     apply_bindings(equipment_items, bindings)
-    
-    return equipment_items
-
-def process_binding(bind_elem, bindings):
-    """Process a binding element and add it to the bindings dictionary"""
-    # Format 1: <Bind eqp="X" to="Y"/>
-    eqp = bind_elem.get("eqp")
-    to = bind_elem.get("to")
-    
-    if eqp and to:
-        if eqp not in bindings:
-            bindings[eqp] = set()
-        bindings[eqp].add(to)
-        return
-    
-    # Format 2: <Bind eqp="X"><to name="Y"/></Bind>
-    if eqp:
-        for to_elem in bind_elem.findall("to"):
-            to = to_elem.get("name")
-            if to:
-                if eqp not in bindings:
-                    bindings[eqp] = set()
-                bindings[eqp].add(to)
-        return
-    
-    # Format 3: <Bind to="Y"><eqp name="X"/></Bind>
-    if to:
-        for eqp_elem in bind_elem.findall("eqp"):
-            eqp = eqp_elem.get("name")
-            if eqp:
-                if eqp not in bindings:
-                    bindings[eqp] = set()
-                bindings[eqp].add(to)
+    timings["bind_apply"] = time.perf_counter() - start
 
-def create_equipment_item(elem, file_path, mod_name):
-    """Create an EquipmentItem from an XML element"""
-    item = EquipmentItem()
-    item.name = elem.get("name", "")
-    
-    # Apply type remapping if needed
-    original_type = elem.tag
-    item.type = TYPE_REMAPPING.get(original_type, original_type)
-    
-    item.category = elem.get("category", "")
-    item.inventory_slot = elem.get("inventoryBinding", "")
-    item.source_file = file_path
-    item.source_mod = mod_name
-    
-    # Extract additional attributes
-    params_elem = elem.find("Params")
-    if params_elem is not None:
-        item.attributes = {key: value for key, value in params_elem.attrib.items()}
-    
-    return item
+    return equipment_items
 
 def apply_bindings(equipment_items, bindings):
     """Apply the collected bindings to equipment items"""
@@ -213,19 +186,8 @@ def print_sorted_equipment(items, sort_by="name"):
         bindings_str = f" (Used by: {', '.join(item.bindings)})" if item.bindings else ""
         print(f"  {item.name:<30} - {item.type:<10} - {item.source_mod}{bindings_str}")
 
-def main():
-    # Get the path to scan from user input
-    print("Enter the path to scan for equipment files:")
-    base_path = input().strip()
-    
-    if not os.path.exists(base_path):
-        print(f"Error: Path does not exist: {base_path}")
-        return
-    
-    print(f"\nScanning directory: {base_path}")
-    equipment_items = scan_equipment_files(base_path)
-    
-    # Create structured output with collapsible sections
+def build_grouped_output(equipment_items):
+    """Create structured output with collapsible sections"""
     output = {
         "summary": {
             "total_items": len(equipment_items),
@@ -242,62 +204,52 @@ def main():
     }
     
     # Build summary counts and grouped sections
-    for item in equipment_items:
-        item_dict = item.to_dict()
-        
+    for item, item_dict in zip(equipment_items, output["all_items"]):
         # Update summary counts
         output["summary"]["types"][item.type] = output["summary"]["types"].get(item.type, 0) + 1
         output["summary"]["mods"][item.source_mod] = output["summary"]["mods"].get(item.source_mod, 0) + 1
         output["summary"]["slots"][item.inventory_slot or "None"] = output["summary"]["slots"].get(item.inventory_slot or "None", 0) + 1
         output["summary"]["categories"][item.category or "None"] = output["summary"]["categories"].get(item.category or "None", 0) + 1
         
-        # Group by type
-        if item.type not in output["by_type"]:
-            output["by_type"][item.type] = []
-        output["by_type"][item.type].append(item_dict)
-        
-        # Group by mod
-        if item.source_mod not in output["by_mod"]:
-            output["by_mod"][item.source_mod] = []
-        output["by_mod"][item.source_mod].append(item_dict)
-        
-        # Group by slot
-        slot_key = item.inventory_slot or "None"
-        if slot_key not in output["by_slot"]:
-            output["by_slot"][slot_key] = []
-        output["by_slot"][slot_key].append(item_dict)
-        
-        # Group by category
-        category_key = item.category or "None"
-        if category_key not in output["by_category"]:
-            output["by_category"][category_key] = []
-        output["by_category"][category_key].append(item_dict)
+        # Group by type, mod, slot and category
+        output["by_type"].setdefault(item.type, []).append(item_dict)
+        output["by_mod"].setdefault(item.source_mod, []).append(item_dict)
+        output["by_slot"].setdefault(item.inventory_slot or "None", []).append(item_dict)
+        output["by_category"].setdefault(item.category or "None", []).append(item_dict)
     
     # Sort all lists within groups
-    for type_items in output["by_type"].values():
-        type_items.sort(key=lambda x: x["name"].lower())
-    for mod_items in output["by_mod"].values():
-        mod_items.sort(key=lambda x: x["name"].lower())
-    for slot_items in output["by_slot"].values():
-        slot_items.sort(key=lambda x: x["name"].lower())
-    for category_items in output["by_category"].values():
-        category_items.sort(key=lambda x: x["name"].lower())
+    for section in ("by_type", "by_mod", "by_slot", "by_category"):
+        for group_items in output[section].values():
+            group_items.sort(key=lambda x: x["name"].lower())
     
     # Sort the summary dictionaries
-    output["summary"]["types"] = dict(sorted(output["summary"]["types"].items()))
-    output["summary"]["mods"] = dict(sorted(output["summary"]["mods"].items()))
-    output["summary"]["slots"] = dict(sorted(output["summary"]["slots"].items()))
-    output["summary"]["categories"] = dict(sorted(output["summary"]["categories"].items()))
+    for key in ("types", "mods", "slots", "categories"):
+        output["summary"][key] = dict(sorted(output["summary"][key].items()))
     
-    # Save results to a JSON file
-    output_file = "equipment_scan_results.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
-    
-    print(f"\nFound {len(equipment_items)} equipment items")
-    print(f"Results saved to: {output_file}")
-    
-    # Print statistics
+    return output
+
+def write_ndjson(items, stream):
+    """Write one JSON object per line, item by item.
+
+    Rows are only written once every file is parsed: a <Bind> in any file
+    can add bindings to an item from another one.
+    """
+    for item in items:
+        stream.write(json.dumps(item.to_dict(), ensure_ascii=False))
+        stream.write("\n")
+
+def write_csv(items, stream):
+    """Write one row per item; bindings are ;-separated and attributes JSON encoded"""
+    writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for item in items:
+        row = item.to_dict()
+        row["bindings"] = ";".join(row["bindings"])
+        row["attributes"] = json.dumps(row["attributes"], ensure_ascii=False)
+        writer.writerow(row)
+
+def print_summary(output):
+    """Print statistics of a grouped output"""
     print("\nEquipment types found:")
     for type_name, count in output["summary"]["types"].items():
         print(f"  {type_name}: {count} items")
@@ -313,10 +265,101 @@ def main():
     print("\nCategories found:")
     for category_name, count in output["summary"]["categories"].items():
         print(f"  {category_name}: {count} items")
+
+def print_timings(timings, item_count):
+    """Print per-phase timings and throughput to stderr"""
+    total = sum(timings.get(phase, 0) for phase in ("walk", "parse", "bind_apply", "sort"))
+    print("\nTimings:", file=sys.stderr)
+    for phase in ("walk", "parse", "bind_apply", "sort"):
+        print(f"  {phase:<10} {timings.get(phase, 0) * 1000:10.1f} ms", file=sys.stderr)
+    print(f"  {'total':<10} {total * 1000:10.1f} ms", file=sys.stderr)
+    print(f"  {timings.get('files', 0)} files, {item_count} items, "
+          f"{item_count / total if total else 0:.0f} items/sec", file=sys.stderr)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scan Door Kickers 2 equipment files")
+    parser.add_argument("path", nargs="?", help="Directory to scan (asked for if omitted)")
+    parser.add_argument("-f", "--format", choices=["json", "ndjson", "csv"], default="json",
+                        help="Output format (default: json, grouped like before)")
+    parser.add_argument("-o", "--output",
+                        help="Output file, '-' for stdout (default: equipment_scan_results.json "
+                             "for json, stdout otherwise)")
+    parser.add_argument("-s", "--sort", choices=["name", "type", "mod", "slot", "category", "none"],
+                        default="name", help="Order of the ndjson/csv rows (default: name)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of parser processes (default: one per CPU, 1 to parse in-process)")
+    parser.add_argument("-t", "--timings", action="store_true",
+                        help="Print per-phase timings and items/sec to stderr")
+    parser.add_argument("--timings-file",
+                        help="Append the timings of this run as one JSON line to this file")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Report every processed file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    # Get the path to scan from user input
+    base_path = args.path
+    if base_path is None:
+        print("Enter the path to scan for equipment files:")
+        base_path = input().strip()
+    
+    if not os.path.exists(base_path):
+        print(f"Error: Path does not exist: {base_path}", file=sys.stderr)
+        return 1
     
-    # Print sorted views
-    for sort_criteria in ["type", "mod", "slot", "category"]:
-        print_sorted_equipment(equipment_items, sort_criteria)
+    output_file = args.output
+    if output_file is None:
+        output_file = "equipment_scan_results.json" if args.format == "json" else "-"
+    to_stdout = output_file == "-"
+    
+    # The interactive report only makes sense for the json format written to a file
+    report = args.format == "json" and not to_stdout
+    
+    log(f"\nScanning directory: {base_path}", report or args.verbose)
+    timings = {}
+    equipment_items = scan_equipment_files(base_path, workers=args.workers, timings=timings,
+                                           verbose=args.verbose)
+    
+    start = time.perf_counter()
+    if args.format == "json":
+        output = build_grouped_output(equipment_items)
+    elif args.sort != "none":
+        equipment_items = sort_equipment_items(equipment_items, args.sort)
+    timings["sort"] = time.perf_counter() - start
+    
+    stream = sys.stdout if to_stdout else open(output_file, "w", encoding="utf-8", newline="")
+    try:
+        if args.format == "json":
+            json.dump(output, stream, indent=2, ensure_ascii=False)
+        elif args.format == "ndjson":
+            write_ndjson(equipment_items, stream)
+        else:
+            write_csv(equipment_items, stream)
+    finally:
+        if not to_stdout:
+            stream.close()
+    
+    if args.timings:
+        print_timings(timings, len(equipment_items))
+    if args.timings_file:
+        record = dict(timings, path=os.path.abspath(base_path), items=len(equipment_items),
+                      timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        with open(args.timings_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    
+    if report:
+        print(f"\nFound {len(equipment_items)} equipment items")
+        print(f"Results saved to: {output_file}")
+        print_summary(output)
+        
+        # Print sorted views
+        for sort_criteria in ["type", "mod", "slot", "category"]:
+            print_sorted_equipment(equipment_items, sort_criteria)
+    elif not to_stdout:
+        log(f"Saved {len(equipment_items)} items to {output_file}")
+    return 0
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
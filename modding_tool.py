@@ -1,9 +1,18 @@
+# Start the startup profiler before anything else is imported, so that the
+# imports below are measured too (set DK2_PROFILE_STARTUP=1 or pass
+# --profile-startup; the report is written to the data directory)
+from modules.startup_profiler import profiler, profiling_requested
+# Plugins import this file again as a module; only the script run measures its imports
+_profile_imports = profiling_requested() and __name__ == "__main__"
+if _profile_imports:
+    profiler.start()
+    profiler.begin("module imports")
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
 import xml.etree.ElementTree as ET
-import zipfile
-from modules.units_editor_module import UnitsEditor
+import re
 import importlib.util
 import sys
 import json
@@ -11,9 +20,20 @@ import logging
 from utils import load_file, save_file, load_mod_info, load_xml, validate_xml
 from modules import config_editor_module
 from modules.mod_files import mod_files
+from modules.background import background
+from modules import mod_packager
+from modules.xml_validation import find_xml_files, validate_files
+from modules.virtual_treeview import VirtualTreeview
+from modules.symbol_index import symbol_index
+from modules.mod_context import mod_context, get_configured_mod_path
+from modules.persistent_cache import set_data_dir
 import datetime
 import ctypes
 import tempfile
+import multiprocessing
+
+if _profile_imports:
+    profiler.end()  # module imports
 
 # Global variables
 PROGRAM_DIR = None
@@ -61,11 +81,13 @@ def initialize_program():
     
     try:
         # Get program directories first
-        PROGRAM_DIR, DATA_DIR = get_program_dirs()
+        with profiler.phase("get_program_dirs"):
+            PROGRAM_DIR, DATA_DIR = get_program_dirs()
         
         # Ensure data directory exists
         os.makedirs(DATA_DIR, exist_ok=True)
         print(f"Ensured data directory exists: {DATA_DIR}")
+        set_data_dir(DATA_DIR)
         
         # Set up file paths
         CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
@@ -74,13 +96,16 @@ def initialize_program():
         # Create initial files if they don't exist
         if not os.path.exists(CONFIG_FILE) or not os.path.exists(log_file):
             print("Creating initial files...")
-            create_initial_files(DATA_DIR)
+            with profiler.phase("create_initial_files"):
+                create_initial_files(DATA_DIR)
         
         # Now that files exist, set up logging
-        setup_logging()
+        with profiler.phase("setup_logging"):
+            setup_logging()
         
         # Initialize configuration
-        config = initialize_config()
+        with profiler.phase("initialize_config"):
+            config = initialize_config()
         
         print("Program initialization complete!")
         return config
@@ -434,40 +459,28 @@ def initialize_config():
 def get_unit_file(mod_path):
     """Get the unit XML file for a mod."""
     global mod_files
-    mod_path = os.path.normpath(mod_path)
-    if mod_files.mod_path != mod_path:
-        mod_files.mod_path = mod_path
-        mod_files.scan_mod_directory()
+    mod_files.set_mod_path(mod_path)
     return mod_files.get_unit_file()
 
 def get_equipment_file(mod_path):
     """Get the equipment binds XML file for a mod."""
     global mod_files
-    mod_path = os.path.normpath(mod_path)
-    # Only scan if the path has changed
-    if mod_files.mod_path != mod_path:
-        mod_files.mod_path = mod_path
-        mod_files.scan_mod_directory()
+    # Only scans if the path has changed
+    mod_files.set_mod_path(mod_path)
     return mod_files.get_equipment_file()
 
 def get_entities_file(mod_path):
     """Get the entities XML file for a mod."""
     global mod_files
-    mod_path = os.path.normpath(mod_path)
-    # Only scan if the path has changed
-    if mod_files.mod_path != mod_path:
-        mod_files.mod_path = mod_path
-        mod_files.scan_mod_directory()
+    # Only scans if the path has changed
+    mod_files.set_mod_path(mod_path)
     return mod_files.get_entities_file()
 
 def get_gui_file(mod_path):
     """Get the GUI XML file for a mod."""
     global mod_files
-    mod_path = os.path.normpath(mod_path)
-    # Only scan if the path has changed
-    if mod_files.mod_path != mod_path:
-        mod_files.mod_path = mod_path
-        mod_files.scan_mod_directory()
+    # Only scans if the path has changed
+    mod_files.set_mod_path(mod_path)
     return mod_files.get_gui_file()
 
 def create_editor_tab(parent, file_path, tab_label):
@@ -514,17 +527,20 @@ def package_mod():
         messagebox.showerror("Error", f"Mod folder not found: {mod_dir}")
         return
         
-    zip_filename = f"{current_mod}.zip"
-    try:
-        with zipfile.ZipFile(zip_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for root_dir, dirs, files in os.walk(mod_dir):
-                for file in files:
-                    file_path = os.path.join(root_dir, file)
-                    arcname = os.path.relpath(file_path, mod_path)
-                    zipf.write(file_path, arcname)
-        messagebox.showinfo("Package Mod", f"Mod packaged as {zip_filename}")
-    except Exception as e:
-        messagebox.showerror("Package Mod", f"Error packaging mod: {e}")
+    zip_filename = os.path.abspath(f"{current_mod}.zip")
+
+    def on_packaged(stats):
+        messagebox.showinfo("Package Mod",
+                            f"Mod packaged as {zip_filename}\n\n"
+                            f"{stats['files']} files in {stats['seconds']:.1f}s: "
+                            f"{stats['reused']} unchanged, {stats['deflated']} compressed, "
+                            f"{stats['stored']} stored")
+
+    # Unchanged files are copied from the previous package, the rest are
+    # compressed on worker threads; see modules/mod_packager.py
+    background.submit(mod_packager.package_mod, mod_dir, zip_filename, mod_path,
+                      description="Packaging mod", progress=True, on_done=on_packaged,
+                      on_error=lambda e: messagebox.showerror("Package Mod", f"Error packaging mod: {e}"))
 
 
 def preview_mod_info():
@@ -556,6 +572,9 @@ def preview_mod_info():
     preview_win.geometry(f"+{x_coordinate}+{y_coordinate}")
 
 
+VALIDATION_COLUMNS = ("File", "Status", "Line", "Column", "Message")
+
+
 def create_xml_validator_tab(parent):
     frame = ttk.Frame(parent)
     
@@ -571,17 +590,8 @@ def create_xml_validator_tab(parent):
         
     mod_dir = os.path.normpath(os.path.join(mod_path, current_mod))
     
-    # Find all XML files in the mod directory recursively
-    xml_files = []
-    if os.path.exists(mod_dir):
-        for root, dirs, files in os.walk(mod_dir):
-            for file in files:
-                if file.endswith('.xml'):
-                    full_path = os.path.normpath(os.path.join(root, file))
-                    xml_files.append(full_path)
-    
-    # Sort files for consistent display
-    xml_files.sort()
+    # Find all XML files in the mod directory recursively, sorted
+    xml_files = find_xml_files(mod_dir) if os.path.exists(mod_dir) else []
     
     if not xml_files:
         label = ttk.Label(frame, text="No XML files found in the current mod")
@@ -597,13 +607,218 @@ def create_xml_validator_tab(parent):
     if xml_files:
         validator_combo.current(0)
 
-    btn_validate = ttk.Button(frame, text="Validate", command=lambda: validate_xml(validator_var.get()))
-    btn_validate.pack(padx=5, pady=5)
+    buttons = ttk.Frame(frame)
+    buttons.pack(padx=5, pady=5)
+    btn_validate = ttk.Button(buttons, text="Validate", command=lambda: validate_xml(validator_var.get()))
+    btn_validate.pack(side="left", padx=5)
+    btn_validate_all = ttk.Button(buttons, text="Validate All")
+    btn_validate_all.pack(side="left", padx=5)
+
+    summary_var = tk.StringVar(value=f"{len(xml_files)} XML files in the mod")
+    ttk.Label(frame, textvariable=summary_var).pack(anchor="w", padx=5)
+
+    # Results of Validate All, errors first; click a heading to sort by it
+    results = []
+    sort_state = {"column": None, "reverse": False}
+
+    def row_values(row):
+        result = results[row]
+        return (os.path.relpath(result.file_path, mod_dir),
+                "OK" if result.valid else "Error",
+                result.line or "", result.column or "", result.message)
+
+    grid = VirtualTreeview(frame, VALIDATION_COLUMNS, row_values)
+    grid.pack(fill="both", expand=True, padx=5, pady=5)
+    for column, width in zip(VALIDATION_COLUMNS, (300, 60, 60, 60, 300)):
+        grid.column(column, width=width)
+
+    def sort_results(column):
+        reverse = sort_state["column"] == column and not sort_state["reverse"]
+        sort_state.update(column=column, reverse=reverse)
+        results.sort(key=lambda result: _validation_sort_key(result, column, mod_dir), reverse=reverse)
+        grid.set_row_count(len(results), keep_position=True)
+
+    for column in VALIDATION_COLUMNS:
+        grid.heading(column, text=column, command=lambda c=column: sort_results(c))
+
+    def on_validated(file_results):
+        results[:] = sorted(file_results, key=lambda result: (result.valid, result.file_path))
+        sort_state.update(column=None, reverse=False)
+        grid.set_row_count(len(results))
+        errors = sum(1 for result in results if not result.valid)
+        parsed = sum(1 for result in results if not result.cached)
+        summary_var.set(f"{len(results)} files checked, {errors} with errors "
+                        f"({parsed} parsed, {len(results) - parsed} unchanged since the last run)")
+        btn_validate_all.config(state="normal")
+
+    def on_validation_error(error):
+        btn_validate_all.config(state="normal")
+        messagebox.showerror("XML Error", f"Failed to validate the mod:\n{error}")
+
+    def validate_all():
+        # List the files again, the mod may have changed since the tab was built
+        btn_validate_all.config(state="disabled")
+        summary_var.set("Validating...")
+        background.submit(lambda progress: validate_files(find_xml_files(mod_dir), progress=progress),
+                          description="Validating XML files", owner=frame, progress=True,
+                          on_done=on_validated, on_error=on_validation_error)
+
+    def show_result(event, row):
+        result = results[row]
+        if result.valid:
+            messagebox.showinfo("XML Valid", f"Great, the XML file is well-formed:\n{result.file_path}")
+        else:
+            messagebox.showerror("XML Error", f"{result.file_path}\n"
+                                              f"Line {result.line}, column {result.column}: {result.message}")
+
+    btn_validate_all.config(command=validate_all)
+    grid.bind_rows('<Double-1>', show_result)
     return frame
 
 
+def _validation_sort_key(result, column, mod_dir):
+    if column == "File":
+        return os.path.relpath(result.file_path, mod_dir).lower()
+    if column == "Status":
+        return result.valid
+    if column == "Line":
+        return result.line, result.column
+    if column == "Column":
+        return result.column
+    return result.message.lower()
+
+
+def open_xml_validator():
+    window = tk.Toplevel()
+    window.title("XML Validator")
+    window.geometry("900x600")
+    create_xml_validator_tab(window).pack(fill="both", expand=True)
+
+
+REFERENCE_COLUMNS = ("Kind", "Name", "File", "Line", "Used by")
+
+
+def find_dangling_references(mod_dir, game_path):
+    """Build or refresh the symbol index and list the references that resolve to nothing"""
+    base_paths = [os.path.join(game_path, "data")] if game_path else []
+    symbol_index.ensure(mod_dir, base_paths)
+    symbol_index.refresh()
+    return symbol_index.dangling()
+
+
+def open_reference_report():
+    config = config_editor_module.load_config()
+    mod_dir = get_configured_mod_path(config)
+    if not mod_dir or not os.path.isdir(mod_dir):
+        messagebox.showerror("Error", "No mod path or current mod configured")
+        return
+
+    window = tk.Toplevel()
+    window.title("Dangling References")
+    window.geometry("900x500")
+    summary_var = tk.StringVar(value="Indexing the mod...")
+    ttk.Label(window, textvariable=summary_var).pack(anchor="w", padx=5, pady=5)
+
+    dangling = []
+    grid = VirtualTreeview(window, REFERENCE_COLUMNS, lambda row: (
+        dangling[row].kind, dangling[row].name, os.path.relpath(dangling[row].file_path, mod_dir),
+        dangling[row].line, dangling[row].owner or ""))
+    grid.pack(fill="both", expand=True, padx=5, pady=5)
+    for column, width in zip(REFERENCE_COLUMNS, (100, 250, 300, 60, 200)):
+        grid.heading(column, text=column)
+        grid.column(column, width=width)
+
+    def on_done(symbols):
+        dangling[:] = symbols
+        grid.set_row_count(len(dangling))
+        if dangling:
+            summary_var.set(f"{len(dangling)} references to names that are not defined in the mod or the game")
+        else:
+            summary_var.set("Every reference resolves to a definition")
+
+    def on_error(error):
+        summary_var.set("Failed to index the mod")
+        messagebox.showerror("Error", f"Failed to index the mod: {error}")
+
+    background.submit(find_dangling_references, mod_dir, config.get("game_path", ""),
+                      description="Indexing references", owner=window,
+                      on_done=on_done, on_error=on_error)
+
+
+PLUGIN_TITLE_PATTERN = re.compile(r'^PLUGIN_TITLE\s*=\s*["\'](.+?)["\']', re.MULTILINE)
+
+# Plugin tabs that have not been built yet: placeholder frame -> build function
+pending_tabs = {}
+
+
+def read_plugin_title(file_path, module_name):
+    """Read PLUGIN_TITLE from a plugin's source without importing it.
+
+    Returns None if the module does not define get_plugin_tab.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            source = f.read()
+    except OSError as e:
+        print(f"Failed to read plugin {os.path.basename(file_path)}: {e}")
+        return None
+    if "def get_plugin_tab" not in source:
+        return None
+    match = PLUGIN_TITLE_PATTERN.search(source)
+    if match:
+        return match.group(1)
+    return module_name[:-len("_module")].replace("_", " ").title()
+
+
+def import_plugin(module_name, force_reload=False):
+    """Import or reload a plugin module"""
+    if module_name in sys.modules and force_reload:
+        return importlib.reload(sys.modules[module_name])
+    module = importlib.import_module(f"modules.{module_name}")
+    sys.modules[module_name] = module
+    return module
+
+
+def build_plugin_tab(notebook, placeholder):
+    """Import a plugin and swap its placeholder for the real tab"""
+    module_name, force_reload = pending_tabs.pop(placeholder)
+    try:
+        with profiler.phase(f"plugin {module_name}"):
+            with profiler.phase("import"):
+                module = import_plugin(module_name, force_reload)
+            with profiler.phase("construct"):
+                title, widget = module.get_plugin_tab(notebook)
+    except Exception as e:
+        print(f"Failed to load plugin {module_name}: {e}")
+        import traceback
+        traceback.print_exc()
+        ttk.Label(placeholder, text=f"Failed to load plugin: {e}").pack(padx=10, pady=10)
+        return
+
+    notebook.insert(placeholder, widget, text=title)
+    notebook.select(widget)
+    notebook.forget(placeholder)
+    placeholder.destroy()
+
+
+def on_tab_changed(event):
+    """Build a plugin tab the first time it is selected"""
+    notebook = event.widget
+    try:
+        selected = notebook.nametowidget(notebook.select())
+    except (KeyError, tk.TclError):
+        return
+    if selected in pending_tabs:
+        build_plugin_tab(notebook, selected)
+
+
 def load_plugins(notebook, force_reload=False):
-    """Load all plugin modules from the modules directory"""
+    """Register the plugin modules from the modules directory as tabs.
+
+    Only the configuration tab is built right away. Every other plugin gets a
+    placeholder tab titled from its PLUGIN_TITLE, and its module is imported
+    and its get_plugin_tab called when the tab is first selected.
+    """
     plugins_dir = os.path.join(os.path.dirname(__file__), "modules")
     if not os.path.isdir(plugins_dir):
         messagebox.showerror("Error", "Modules directory not found")
@@ -613,12 +828,16 @@ def load_plugins(notebook, force_reload=False):
     if plugins_dir not in sys.path:
         sys.path.insert(0, os.path.dirname(__file__))
         
-    # Keep track of loaded modules and their widgets
+    # Keep track of the tabs by module, placeholders included
     loaded_modules = {}
     
-    # First, remove any existing tabs
+    # First, remove any existing tabs. They are destroyed once the event that
+    # caused the reload has been handled, as it may come from one of them.
     for tab_id in notebook.tabs():
+        widget = notebook.nametowidget(tab_id)
         notebook.forget(tab_id)
+        pending_tabs.pop(widget, None)
+        notebook.after_idle(widget.destroy)
     
     # Load config module first
     try:
@@ -626,7 +845,8 @@ def load_plugins(notebook, force_reload=False):
             importlib.reload(sys.modules["config_editor_module"])
         
         # Add config tab first
-        title, widget = config_editor_module.get_plugin_tab(notebook)
+        with profiler.phase("plugin config_editor_module: construct"):
+            title, widget = config_editor_module.get_plugin_tab(notebook)
         notebook.add(widget, text=title)
         loaded_modules["config_editor_module"] = widget
         
@@ -635,29 +855,22 @@ def load_plugins(notebook, force_reload=False):
         import traceback
         traceback.print_exc()
     
-    # Then load all non-config modules
+    # Then register all non-config modules
+    profiler.begin("register plugin tabs")
     for filename in os.listdir(plugins_dir):
         if filename.endswith("_module.py") and filename != "config_editor_module.py":
-            try:
-                module_name = filename[:-3]
-                
-                # Import or reload module
-                if module_name in sys.modules and force_reload:
-                    module = importlib.reload(sys.modules[module_name])
-                else:
-                    module = importlib.import_module(f"modules.{module_name}")
-                    sys.modules[module_name] = module
-                
-                # Create tab if module has the required interface
-                if hasattr(module, "get_plugin_tab"):
-                    title, widget = module.get_plugin_tab(notebook)
-                    notebook.add(widget, text=title)
-                    loaded_modules[module_name] = widget
-                    
-            except Exception as e:
-                print(f"Failed to load plugin {filename}: {e}")
-                import traceback
-                traceback.print_exc()
+            module_name = filename[:-3]
+            title = read_plugin_title(os.path.join(plugins_dir, filename), module_name)
+            if title is None:
+                continue
+            placeholder = ttk.Frame(notebook)
+            notebook.add(placeholder, text=title)
+            pending_tabs[placeholder] = (module_name, force_reload)
+            loaded_modules[module_name] = placeholder
+    profiler.end()
+
+    if not notebook.bind("<<NotebookTabChanged>>"):
+        notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
                 
     # Select the configuration tab
     if notebook.tabs():
@@ -671,10 +884,48 @@ def reload_plugins(notebook):
     return load_plugins(notebook, force_reload=True)
 
 
+def create_status_bar(parent):
+    """Status bar showing the file loads and saves running in the background"""
+    status_frame = ttk.Frame(parent)
+    status_label = ttk.Label(status_frame, text="Ready", anchor="w")
+    status_label.pack(side="left", fill="x", expand=True, padx=5, pady=2)
+    progress_bar = ttk.Progressbar(status_frame, length=160)
+
+    def on_jobs_changed(jobs):
+        if not jobs:
+            progress_bar.stop()
+            progress_bar.config(mode="determinate", value=0)
+            progress_bar.pack_forget()
+            status_label.config(text="Ready")
+            return
+
+        job = jobs[0]
+        text = job.description or "Working"
+        if len(jobs) > 1:
+            text += f" (+{len(jobs) - 1} more)"
+        done, total, message = job.progress or (0, None, None)
+        if message:
+            text += f": {message}"
+        status_label.config(text=text)
+
+        if not progress_bar.winfo_ismapped():
+            progress_bar.pack(side="right", padx=5, pady=2)
+        if total:
+            progress_bar.stop()
+            progress_bar.config(mode="determinate", maximum=total, value=done)
+        elif str(progress_bar.cget("mode")) != "indeterminate":
+            progress_bar.config(mode="indeterminate", value=0)
+            progress_bar.start(10)
+
+    background.add_listener(on_jobs_changed)
+    return status_frame
+
+
 def main():
     try:
         # Initialize everything first
-        config = initialize_program()
+        with profiler.phase("initialize_program"):
+            config = initialize_program()
         
         # Only import modules after initialization is complete
         import importlib.util
@@ -683,28 +934,49 @@ def main():
         from modules import config_editor_module
         from modules.mod_files import mod_files
         
+        profiler.begin("create main window")
         root = tk.Tk()
+        # Results of background file I/O are delivered through the root window
+        background.attach(root)
+        mod_context.mod_path = get_configured_mod_path(config)
         
         # Load initial configuration
         root.title(f"Door Kickers 2 Mod Tools - {config.get('last_used_mod', '')}")
         
+        # Status bar at the bottom, packed first so it keeps its space
+        create_status_bar(root).pack(side="bottom", fill="x")
+        
+        # Tools that work on the whole mod
+        menubar = tk.Menu(root)
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        tools_menu.add_command(label="Package Mod", command=package_mod)
+        tools_menu.add_command(label="Preview Mod Info", command=preview_mod_info)
+        tools_menu.add_command(label="Validate XML...", command=open_xml_validator)
+        tools_menu.add_command(label="Check References...", command=open_reference_report)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        root.config(menu=menubar)
+        
         # Create Notebook
         notebook = ttk.Notebook(root)
         notebook.pack(fill="both", expand=True)
+        profiler.end()
         
         # Load dynamic plugins from modules folder
-        loaded_modules = load_plugins(notebook)
+        with profiler.phase("load_plugins"):
+            loaded_modules = load_plugins(notebook)
         
         # Handle configuration changes
         def on_config_change(event):
             config = config_editor_module.load_config()
             root.title(f"Door Kickers 2 Mod Tools - {config.get('last_used_mod', '')}")
-            # Reload plugins to reflect new configuration
-            load_plugins(notebook, force_reload=True)
+            # Let the open tabs refresh their data for the new mod; tabs that
+            # were not built yet read the new configuration when they are
+            mod_context.rebind(get_configured_mod_path(config))
         
         root.bind_all("<<ConfigurationChanged>>", on_config_change)
         
         # Center the main window
+        profiler.begin("layout main window")
         root.update_idletasks()
         window_width = root.winfo_width()
         window_height = root.winfo_height()
@@ -713,7 +985,10 @@ def main():
         x_coordinate = int((screen_width / 2) - (window_width / 2))
         y_coordinate = int((screen_height / 2) - (window_height / 2))
         root.geometry(f"+{x_coordinate}+{y_coordinate}")
+        profiler.end()
         
+        # Startup is over once the event loop has handled the first events
+        root.after_idle(lambda: profiler.finish(DATA_DIR))
         root.mainloop()
         
     except Exception as e:
@@ -725,4 +1000,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed for the equipment scan process pool in the frozen executable
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
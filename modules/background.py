@@ -0,0 +1,179 @@
+import os
+import json
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+PUMP_INTERVAL_MS = 30  # How often the Tk thread looks for finished jobs
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("background", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[Background] {message}")
+
+class Job:
+    """A function submitted to the background executor"""
+    def __init__(self, description, owner, on_done, on_error, on_progress):
+        self.description = description
+        self.owner = owner
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.progress = None  # (done, total, message) from the last report
+        self.cancelled = False
+
+    def cancel(self):
+        """Drop the callbacks of the job; a job that already started still runs"""
+        self.cancelled = True
+
+    def owner_alive(self):
+        if self.owner is None:
+            return True
+        try:
+            return bool(self.owner.winfo_exists())
+        except Exception:
+            return False
+
+class BackgroundExecutor:
+    """Runs file I/O off the Tk thread and hands the results back to it.
+
+    Jobs run one at a time in submission order on a worker thread, so a save
+    queued after a load of the same file sees that load finished. Callbacks
+    (on_done, on_error, on_progress) are called on the Tk thread by a pump
+    driven by after(), and are skipped if the job's owner widget has been
+    destroyed in the meantime. Listeners are told about the running jobs so
+    the main window can show progress.
+    """
+    def __init__(self, max_workers=1):
+        self.max_workers = max_workers
+        self._executor = None
+        self._results = queue.Queue()
+        self._jobs = []  # Jobs that have not been reported back yet
+        self._listeners = []
+        self._widget = None
+        self._pump_job = None
+
+    def attach(self, widget):
+        """Use widget (normally the root window) to schedule the result pump"""
+        self._widget = widget
+
+    def add_listener(self, callback):
+        """callback(jobs) is called on the Tk thread whenever the running jobs change"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def submit(self, func, *args, on_done=None, on_error=None, on_progress=None,
+               description="", owner=None, progress=False, **kwargs):
+        """Run func(*args, **kwargs) in the background.
+
+        on_done(result) or on_error(exception) is called on the Tk thread when
+        it finishes. With progress=True, func also gets a progress keyword
+        argument: a function progress(done, total=None, message=None) that
+        may be called from the worker to report how far it got.
+        """
+        job = Job(description, owner, on_done, on_error, on_progress)
+        if progress:
+            kwargs["progress"] = lambda done, total=None, message=None: \
+                self._results.put(("progress", job, (done, total, message)))
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="Background")
+        self._jobs.append(job)
+        self._executor.submit(self._run, job, func, args, kwargs)
+        log(f"Submitted job: {description or getattr(func, '__name__', func)}")
+        self._notify()
+        self._schedule_pump()
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        if job.cancelled:
+            self._results.put(("cancelled", job, None))
+            return
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            log(f"Job failed: {job.description}: {e}\n{traceback.format_exc()}")
+            self._results.put(("error", job, e))
+            return
+        self._results.put(("done", job, result))
+
+    def _schedule_pump(self):
+        if self._pump_job is not None:
+            return
+        widget = self._widget
+        if widget is None:
+            import tkinter
+            widget = tkinter._default_root
+        if widget is None:
+            return
+        self._pump_job = widget.after(PUMP_INTERVAL_MS, self._pump)
+
+    def _pump(self):
+        """Deliver finished jobs and progress reports on the Tk thread"""
+        self._pump_job = None
+        changed = False
+        while True:
+            try:
+                kind, job, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                job.progress = value
+                changed = True
+                if job.on_progress and not job.cancelled and job.owner_alive():
+                    self._call(job.on_progress, *value)
+                continue
+
+            if job in self._jobs:
+                self._jobs.remove(job)
+            changed = True
+            if job.cancelled or not job.owner_alive():
+                continue
+            if kind == "done" and job.on_done:
+                self._call(job.on_done, value)
+            elif kind == "error":
+                if job.on_error:
+                    self._call(job.on_error, value)
+                else:
+                    print(f"Background job failed: {job.description}: {value}")
+
+        if changed:
+            self._notify()
+        if self._jobs:
+            self._schedule_pump()
+
+    def _call(self, callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"Error in background job callback: {e}")
+            traceback.print_exc()
+
+    def _notify(self):
+        for listener in list(self._listeners):
+            self._call(listener, list(self._jobs))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+# Global instance shared by all plugins
+background = BackgroundExecutor()
@@ -4,15 +4,30 @@
 
 import tkinter as tk
 from tkinter import ttk
+import tkinter.font as tkfont
 import xml.etree.ElementTree as ET
-import xml.dom.minidom
 import os
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 import tkinter.messagebox as messagebox
+import tkinter.simpledialog as simpledialog
+from modules.xml_cache import document_cache
+from modules.background import background
+from modules.mod_files import mod_files
+from modules.mod_context import mod_context, get_configured_mod_path
+from modules.symbol_index import symbol_index, DOCTRINE_NODE, LOCALIZATION
+from modules import config_editor_module
+from utils import write_files
+from modules.xml_writer import write_element, write_xml_file
+from modules.spatial_grid import SpatialGrid
+from modules.doctrine_layout import layered_layout, doctrine_edges
+from modules.doctrine_graph import DoctrineGraph, CONNECTION
+from modules.xml_recovery import recover_xml
+from modules.doctrine_evaluator import evaluate_builds, DEFAULT_POINTS
+from modules.virtual_treeview import VirtualTreeview
 
-# File paths (adjust as needed)
+# Default file paths, used when the current mod does not have the file
 DOCTRINE_TREE_XML = r"C:\Program Files (x86)\Steam\steamapps\common\DoorKickers2\mods\3418188703\gui\raider_doctrine_tree.xml"
 DOCTRINE_NODES_XML = r"C:\Program Files (x86)\Steam\steamapps\common\DoorKickers2\mods\3418188703\units\msoc_doctrine_nodes.xml"
 UNIT_XML = r"C:\Program Files (x86)\Steam\steamapps\common\DoorKickers2\mods\3418188703\units\msoc_unit.xml"
@@ -34,6 +49,10 @@ GRID_CELL_SIZE_Y = 180  # Vertical spacing between nodes
 GRID_PADDING = 10
 XML_OFFSET_X = 80  # Default X offset for XML export
 XML_OFFSET_Y = 88  # Default Y offset for XML export
+TREE_MARGIN = 50  # Canvas margin around the drawn tree
+DRAG_THRESHOLD = 4  # Pixels the mouse moves before a press on a node becomes a drag
+MAX_PROBLEMS_SHOWN = 30  # Problems listed in the problems dialog
+BUILD_COLUMNS = ("Stat", "Lowest", "Highest", "Highest build")
 
 # Available skills and their descriptions
 SKILLS = {
@@ -237,6 +256,7 @@ class DoctrineNodeDefinition:
     requirements: List[str]
     modifiers: Dict[str, str]
     max_level: int = 1
+    equipment_modifiers: Dict[str, Dict[str, str]] = field(default_factory=dict)  # target -> attribute -> value
 
 @dataclass
 class DoctrineNode:
@@ -298,6 +318,196 @@ class Section:
         return (x, y)
 
 
+def definition_from_element(node_elem: ET.Element) -> Optional[DoctrineNodeDefinition]:
+    """The definition a <Node> element of a doctrine nodes file gives, None without a name"""
+    name = node_elem.get('name')
+    if not name:
+        return None
+    display_name = node_elem.get('nameUI', name)
+    description = node_elem.get('description', '')
+    icon = node_elem.get('icon', '')
+    max_level = int(node_elem.get('maxLevel', '1'))
+    requirements = []
+    reqs_elem = node_elem.find('Requirements')
+    if reqs_elem is not None:
+        for req in reqs_elem.findall('Requirement'):
+            req_name = req.get('name')
+            if req_name:
+                requirements.append(req_name)
+    modifiers = {}
+    for modifier in node_elem.findall('.//Modifier'):
+        mod_type = modifier.get('type', '')
+        mod_value = modifier.get('value', '')
+        if mod_type:
+            modifiers[mod_type] = mod_value
+    equipment_modifiers = {}
+    for equip_mod in node_elem.findall('EquipmentModifier'):
+        target = equip_mod.get('target')
+        if target:
+            equipment_modifiers.setdefault(target, {}).update(
+                (attr, value) for attr, value in equip_mod.attrib.items() if attr != 'target')
+    return DoctrineNodeDefinition(
+        name=name,
+        display_name=display_name,
+        description=description,
+        icon=icon,
+        requirements=requirements,
+        modifiers=modifiers,
+        max_level=max_level,
+        equipment_modifiers=equipment_modifiers
+    )
+
+def parse_doctrine_nodes(file_path: str, repairs: Optional[list] = None) -> Dict[str, DoctrineNodeDefinition]:
+    """Read the doctrine node definitions of a doctrine nodes file, by node name.
+
+    Mod files are often merged by hand and carry several XML declarations,
+    several DoctrineNodes roots or none; recover_xml repairs these while
+    reading and the repairs are added to repairs if given. Raises
+    FileNotFoundError or ET.ParseError if the file can't be read.
+    """
+    root, found = recover_xml(file_path, "DoctrineNodes")
+    if repairs is not None:
+        repairs.extend(found)
+    for repair in found:
+        logger.info(f"Repaired {file_path}: {repair}")
+    node_definitions = {}
+    
+    for node_elem in root.findall(".//Node"):
+        node_def = definition_from_element(node_elem)
+        if node_def is None:
+            continue
+        node_definitions[node_def.name] = node_def
+        logger.debug(f"Loaded doctrine node definition: {node_def.name}")
+    return node_definitions
+
+def parse_doctrine_tree(file_path: str, node_definitions: Dict[str, DoctrineNodeDefinition]) -> Optional[Dict[str, Section]]:
+    """Read the sections and node positions of a doctrine tree GUI file.
+
+    Nodes are linked to their entry in node_definitions. Returns None if the
+    file has no doctrine tree container.
+    """
+    tree = document_cache.parse(file_path)
+    root = tree.getroot()
+    sections = {}
+    main_container = root.find(".//Item[@name='#MARSOC_DoctrineTree']")
+    if main_container is None:
+        return None
+    for section_elem in main_container.findall("Item[@name]"):
+        section_name = section_elem.get('name', '')
+        if not section_name or section_name == '#template_doctrine_button':
+            continue
+        origin = section_elem.get('origin', '0 0').split()
+        x = int(origin[0]) if len(origin) > 0 else 0
+        y = int(origin[1]) if len(origin) > 1 else 0
+        width = int(section_elem.get('sizeX', 400))
+        height = int(section_elem.get('sizeY', 600))
+        align = section_elem.get('align', 'lt')
+        section = Section(
+            name=section_name,
+            x=x,
+            y=y,
+            width=width,
+            height=height,
+            align=align
+        )
+        for node_elem in section_elem.findall("./Item[@name]"):
+            node_name = node_elem.get('name', '')
+            if (node_name and 
+                node_name not in ['#template_doctrine_button', '#doctrinenode_disabled', '#doctrinenode_active', 'level'] and
+                not node_name.startswith('#')):
+                origin = node_elem.get('origin', '0 0').split()
+                # Subtract XML offsets from the loaded coordinates
+                x = int(origin[0]) - XML_OFFSET_X if len(origin) > 0 else 0
+                y = int(origin[1]) + XML_OFFSET_Y if len(origin) > 1 else 0  # Add because Y is negative in game coords
+                align = node_elem.get('align', 'lt')
+                node = DoctrineNode(
+                    name=node_name,
+                    x=x,
+                    y=y,
+                    align=align
+                )
+                if node_name in node_definitions:
+                    node.definition = node_definitions[node_name]
+                    logger.debug(f"Linked node {node_name} to its definition")
+                else:
+                    logger.warning(f"No definition found for node: {node_name}")
+                section.add_node(node)
+                logger.debug(f"Added node {node_name} to section {section.name}")
+        sections[section.name] = section
+        logger.debug(f"Loaded section: {section.name}")
+    return sections
+
+
+def cell_to_game(cell_x: int, cell_y: int) -> Tuple[int, int]:
+    """Game coordinates of a node in a grid cell, without display padding"""
+    return cell_x * GRID_CELL_SIZE_X, -((cell_y * GRID_CELL_SIZE_Y) + 72)  # 72 is the header height in game coordinates
+
+def section_columns(section: Section) -> int:
+    """Number of grid columns a node can be snapped to in a section"""
+    return max(0, (section.width - GRID_CELL_SIZE_X // 2) // GRID_CELL_SIZE_X) + 1
+
+def layout_section(section: Section):
+    """Lay out the nodes of a section in rows by requirements and connections.
+
+    Rows are filled up to the section's width; the nodes start in their
+    current left to right order.
+    """
+    nodes = sorted(section.nodes, key=lambda node: (node.x, -node.y))
+    cells = layered_layout([node.name for node in nodes], doctrine_edges(nodes),
+                           max_columns=section_columns(section))
+    for node in nodes:
+        node.x, node.y = cell_to_game(*cells[node.name])
+
+
+def find_doctrine_files(mod_path: Optional[str]) -> Tuple[str, str, str]:
+    """Doctrine nodes, doctrine tree and unit file of a mod, falling back to the defaults"""
+    paths = (None, None, None)
+    if mod_path and os.path.isdir(mod_path):
+        mod_files.set_mod_path(mod_path)
+        paths = (mod_files.get_doctrine_nodes_file(), mod_files.get_doctrine_tree_file(),
+                 mod_files.get_unit_file())
+    defaults = (DOCTRINE_NODES_XML, DOCTRINE_TREE_XML, UNIT_XML)
+    return tuple(path or default for path, default in zip(paths, defaults))
+
+def read_unit_doctrine(unit_path: str) -> Optional[Dict[str, int]]:
+    """Nodes of the unit's <Doctrine> list and their numLevels, or None if the
+    unit file can't be read or has no list"""
+    try:
+        root = document_cache.parse(unit_path).getroot()
+    except (OSError, ET.ParseError) as e:
+        logger.warning(f"Could not read the unit file {unit_path}: {e}")
+        return None
+    doctrine_elem = root.find('.//Doctrine')
+    if doctrine_elem is None:
+        return None
+    levels = {}
+    for node_elem in doctrine_elem.findall('Node'):
+        name = node_elem.get('name')
+        if name:
+            try:
+                levels[name] = int(node_elem.get('numLevels', '1'))
+            except ValueError:
+                levels[name] = 1
+    return levels
+
+def read_doctrine_files(nodes_path: str, tree_path: str):
+    """Parse the nodes and the tree file; runs in the background.
+
+    Returns (node definitions, error from the nodes file or None, sections,
+    repairs made to the nodes file). A nodes file that fails to load leaves
+    the definitions empty, the tree is still read; errors from the tree
+    file are raised.
+    """
+    node_definitions = {}
+    nodes_error = None
+    repairs = []
+    try:
+        node_definitions = parse_doctrine_nodes(nodes_path, repairs)
+    except Exception as e:
+        nodes_error = e
+    return node_definitions, nodes_error, parse_doctrine_tree(tree_path, node_definitions), repairs
+
+
 # DoctrineEditor is a Frame to be embedded in a notebook in DK2 modding tools
 class DoctrineEditor(tk.Frame):
     def __init__(self, parent):
@@ -315,17 +525,33 @@ class DoctrineEditor(tk.Frame):
         self.dragging_node = None
         self.node_definitions = {}
         self.selected_node = None
+        self.load_job = None
+        # Canvas items of the drawn tree, kept between redraws
+        self.node_items = {}  # node name -> (node, rectangle id, text id)
+        self.node_lines = {}  # node name -> ids of the connection lines at the node
+        self.line_ends = {}  # connection line id -> (source node name, target node name)
+        self.preview_rect = None
+        self.drawn_scale = None  # Scale factor the items are drawn at
+        self._rescale_job = None
+        self.node_grids: Dict[str, SpatialGrid] = {}  # section name -> node rectangles in canvas coordinates
+        self.selected_nodes = set()  # Names of the selected nodes
+        self.band = None  # Rubber band selection in progress
+        self.graph = DoctrineGraph()  # Requirements and connections, checked on every edit
+        self.mod_path = get_configured_mod_path(config_editor_module.load_config())
+        self.nodes_xml = DOCTRINE_NODES_XML
+        self.tree_xml = DOCTRINE_TREE_XML
+        self.unit_xml = UNIT_XML
         
         # Build UI
         self.create_widgets()
-        self.load_doctrine_nodes()
-        self.load_doctrine_tree()
+        self.load_doctrine()
+        mod_context.subscribe(self.rebind, owner=self)
         
-        # Bind canvas events
-        self.canvas.tag_bind("node", "<Button-1>", self.on_node_press)
-        self.canvas.tag_bind("node", "<B1-Motion>", self.on_node_drag)
-        self.canvas.tag_bind("node", "<ButtonRelease-1>", self.on_node_release)
-        self.canvas.tag_bind("node", "<Button-3>", self.on_node_right_click)
+        # Bind canvas events; the node under the mouse is found in node_grids
+        self.canvas.bind("<Button-1>", self.on_node_press)
+        self.canvas.bind("<B1-Motion>", self.on_node_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.on_node_release)
+        self.canvas.bind("<Button-3>", self.on_node_right_click)
         
         self.bind('<Configure>', self.on_window_resize)
 
@@ -347,8 +573,18 @@ class DoctrineEditor(tk.Frame):
         self.connection_btn = ttk.Checkbutton(toolbar, text="Connection Mode", variable=self.connection_mode, command=self.toggle_connection_mode)
         self.connection_btn.pack(side="left", padx=5)
 
+        auto_layout_btn = ttk.Button(toolbar, text="Auto Layout", command=self.auto_layout)
+        auto_layout_btn.pack(side="left", padx=5)
+
+        evaluate_btn = ttk.Button(toolbar, text="Evaluate Builds", command=self.evaluate_builds)
+        evaluate_btn.pack(side="left", padx=5)
+
         save_xml_btn = ttk.Button(toolbar, text="Save to XML", command=self.save_to_xml)
         save_xml_btn.pack(side="right", padx=5)
+
+        self.problems_label = ttk.Label(toolbar, text="", cursor="hand2")
+        self.problems_label.pack(side="right", padx=5)
+        self.problems_label.bind("<Button-1>", lambda e: self.show_problems())
         
         # Canvas frame
         canvas_frame = tk.Frame(self.main_container, bg=COLORS['background'])
@@ -366,6 +602,10 @@ class DoctrineEditor(tk.Frame):
         self.canvas.bind("<MouseWheel>", self.on_mousewheel)
         self.canvas.bind("<Control-MouseWheel>", self.on_zoom)
         
+        # Shared fonts, so zooming resizes every text item at once
+        self.section_font = tkfont.Font(self, family="Arial", size=16)
+        self.node_font = tkfont.Font(self, family="Arial", size=10)
+        
         # Initialize connection variables
         self.connection_source = None
 
@@ -376,7 +616,7 @@ class DoctrineEditor(tk.Frame):
             width_scale = (event.width - 20) / BASE_WIDTH
             height_scale = (event.height - 20) / BASE_HEIGHT
             self.scale_factor = 1.40 * min(width_scale, height_scale)
-            self.draw_doctrine_tree()
+            self.schedule_rescale()
 
     def on_mousewheel(self, event):
         self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
@@ -386,7 +626,7 @@ class DoctrineEditor(tk.Frame):
             self.scale_factor *= 1.1
         else:
             self.scale_factor *= 0.9
-        self.draw_doctrine_tree()
+        self.schedule_rescale()
     
     def get_scaled_coords(self, x: int, y: int, width: int, height: int, align: str = 'lt') -> Tuple[int, int, int, int]:
         base_x = x
@@ -405,138 +645,154 @@ class DoctrineEditor(tk.Frame):
         scaled_height = int(height * self.scale_factor)
         return scaled_x, scaled_y, scaled_width, scaled_height
     
-    def load_doctrine_nodes(self):
-        try:
-            # First try to read the file contents
-            with open(DOCTRINE_NODES_XML, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-            
-            # Clean up the content by removing all XML declarations and extra whitespace
-            content = '\n'.join(line for line in content.split('\n') if line.strip())
-            if '<?xml' in content:
-                # Keep only the first XML declaration
-                declarations = content.count('<?xml')
-                if declarations > 1:
-                    # Remove all declarations and add a single one at the start
-                    content = content.replace('<?xml version="1.0" encoding="utf-8"?>', '')
-                    content = content.replace('<?xml version=\'1.0\' encoding=\'utf-8\'?>', '')
-                    content = '<?xml version="1.0" encoding="utf-8"?>\n' + content.strip()
-            
-            # If no XML declaration exists, add one
-            if not content.startswith('<?xml'):
-                content = '<?xml version="1.0" encoding="utf-8"?>\n' + content
-            
-            # Ensure content starts with DoctrineNodes if not present
-            if '<DoctrineNodes>' not in content:
-                content = content.replace('<?xml version="1.0" encoding="utf-8"?>\n',
-                                       '<?xml version="1.0" encoding="utf-8"?>\n<DoctrineNodes>\n')
-                content += '\n</DoctrineNodes>'
-            
-            # Parse the cleaned content
-            root = ET.fromstring(content)
-            
-            for node_elem in root.findall(".//Node"):
-                name = node_elem.get('name')
-                if not name:
-                    continue
-                display_name = node_elem.get('nameUI', name)
-                description = node_elem.get('description', '')
-                icon = node_elem.get('icon', '')
-                max_level = int(node_elem.get('maxLevel', '1'))
-                requirements = []
-                reqs_elem = node_elem.find('Requirements')
-                if reqs_elem is not None:
-                    for req in reqs_elem.findall('Requirement'):
-                        req_name = req.get('name')
-                        if req_name:
-                            requirements.append(req_name)
-                modifiers = {}
-                for modifier in node_elem.findall('.//Modifier'):
-                    mod_type = modifier.get('type', '')
-                    mod_value = modifier.get('value', '')
-                    if mod_type:
-                        modifiers[mod_type] = mod_value
-                node_def = DoctrineNodeDefinition(
-                    name=name,
-                    display_name=display_name,
-                    description=description,
-                    icon=icon,
-                    requirements=requirements,
-                    modifiers=modifiers,
-                    max_level=max_level
-                )
-                self.node_definitions[name] = node_def
-                logger.debug(f"Loaded doctrine node definition: {name}")
-        except FileNotFoundError:
-            logger.error(f"Doctrine nodes file not found: {DOCTRINE_NODES_XML}")
-            messagebox.showerror("Error", f"Doctrine nodes file not found: {DOCTRINE_NODES_XML}")
-        except ET.ParseError as e:
-            logger.error(f"Error parsing doctrine nodes XML: {e}")
-            messagebox.showerror("Error", f"Failed to parse doctrine nodes XML: {e}")
-        except Exception as e:
-            logger.error(f"Error loading doctrine nodes: {e}")
-            messagebox.showerror("Error", f"Failed to load doctrine nodes: {e}")
-    
-    def load_doctrine_tree(self):
+    def rebind(self, mod_path):
+        """Show the doctrine of another mod"""
+        if self.load_job:
+            self.load_job.cancel()
+        self.mod_path = mod_path
+        self.node_definitions.clear()
+        self.sections.clear()
+        self.selected_node = None
+        self.selected_nodes = set()
+        self.dragging_node = None
+        self.connection_source = None
+        self.graph.clear()
+        self.clear_canvas()
+        self.load_doctrine()
+
+    def read_doctrine(self, mod_path):
+        """Find and parse the doctrine files of a mod; runs in the background"""
+        paths = find_doctrine_files(mod_path)
+        return (paths,) + read_doctrine_files(paths[0], paths[1]) + (read_unit_doctrine(paths[2]),)
+
+    def load_doctrine(self):
+        """Parse the nodes and tree files in the background, then draw the tree"""
+        self.load_job = background.submit(self.read_doctrine, self.mod_path,
+                                          owner=self, description="Loading doctrine",
+                                          on_done=self.on_doctrine_loaded,
+                                          on_error=self.on_doctrine_tree_error)
+        # Saving looks up renamed nodes in the symbol index; build it now
+        # rather than on the first save
+        if self.mod_path and not symbol_index.is_ready(self.mod_path):
+            background.submit(symbol_index.ensure, self.mod_path,
+                              owner=self, description="Indexing mod symbols")
+
+    def on_doctrine_loaded(self, result):
+        paths, node_definitions, nodes_error, sections, repairs, unit_levels = result
+        self.load_job = None
+        self.nodes_xml, self.tree_xml, self.unit_xml = paths
+        if nodes_error is not None:
+            self.on_doctrine_nodes_error(nodes_error)
+        elif repairs:
+            messagebox.showwarning(
+                "Doctrine Nodes Repaired",
+                f"The doctrine nodes file needed repairs to load:\n{self.nodes_xml}\n\n" +
+                "\n".join(f"• {repair}" for repair in repairs) +
+                "\n\nThe file on disk has not been changed.")
+        self.node_definitions.update(node_definitions)
         try:
-            tree = ET.parse(DOCTRINE_TREE_XML)
-            root = tree.getroot()
             self.sections.clear()
-            main_container = root.find(".//Item[@name='#MARSOC_DoctrineTree']")
-            if not main_container:
+            if sections is None:
                 logger.error("Could not find main doctrine tree container")
                 return
-            for section_elem in main_container.findall("Item[@name]"):
-                section_name = section_elem.get('name', '')
-                if not section_name or section_name == '#template_doctrine_button':
-                    continue
-                origin = section_elem.get('origin', '0 0').split()
-                x = int(origin[0]) if len(origin) > 0 else 0
-                y = int(origin[1]) if len(origin) > 1 else 0
-                width = int(section_elem.get('sizeX', 400))
-                height = int(section_elem.get('sizeY', 600))
-                align = section_elem.get('align', 'lt')
-                section = Section(
-                    name=section_name,
-                    x=x,
-                    y=y,
-                    width=width,
-                    height=height,
-                    align=align
-                )
-                for node_elem in section_elem.findall("./Item[@name]"):
-                    node_name = node_elem.get('name', '')
-                    if (node_name and 
-                        node_name not in ['#template_doctrine_button', '#doctrinenode_disabled', '#doctrinenode_active', 'level'] and
-                        not node_name.startswith('#')):
-                        origin = node_elem.get('origin', '0 0').split()
-                        # Subtract XML offsets from the loaded coordinates
-                        x = int(origin[0]) - XML_OFFSET_X if len(origin) > 0 else 0
-                        y = int(origin[1]) + XML_OFFSET_Y if len(origin) > 1 else 0  # Add because Y is negative in game coords
-                        align = node_elem.get('align', 'lt')
-                        node = DoctrineNode(
-                            name=node_name,
-                            x=x,
-                            y=y,
-                            align=align
-                        )
-                        if node_name in self.node_definitions:
-                            node.definition = self.node_definitions[node_name]
-                            logger.debug(f"Linked node {node_name} to its definition")
-                        else:
-                            logger.warning(f"No definition found for node: {node_name}")
-                        section.add_node(node)
-                        logger.debug(f"Added node {node_name} to section {section.name}")
-                self.sections[section.name] = section
-                logger.debug(f"Loaded section: {section.name}")
+            self.sections.update(sections)
+            # Levels are kept in the unit's doctrine list
+            for section in self.sections.values():
+                for node in section.nodes:
+                    node.level = (unit_levels or {}).get(node.name, node.level)
+            self.build_graph(unit_levels)
             self.draw_doctrine_tree()
         except Exception as e:
-            logger.error(f"Error loading doctrine tree: {e}")
-            messagebox.showerror("Error", f"Failed to load doctrine tree: {e}")
+            self.on_doctrine_tree_error(e)
+
+    def on_doctrine_nodes_error(self, e):
+        if isinstance(e, FileNotFoundError):
+            logger.error(f"Doctrine nodes file not found: {self.nodes_xml}")
+            messagebox.showerror("Error", f"Doctrine nodes file not found: {self.nodes_xml}")
+        elif isinstance(e, ET.ParseError):
+            logger.error(f"Error parsing doctrine nodes XML: {e}")
+            messagebox.showerror("Error", f"Failed to parse doctrine nodes XML: {e}")
+        else:
+            logger.error(f"Error loading doctrine nodes: {e}")
+            messagebox.showerror("Error", f"Failed to load doctrine nodes: {e}")
+
+    def on_doctrine_tree_error(self, e):
+        logger.error(f"Error loading doctrine tree: {e}")
+        messagebox.showerror("Error", f"Failed to load doctrine tree: {e}")
     
-    def draw_doctrine_tree(self):
+    def build_graph(self, unit_levels: Optional[Dict[str, int]]):
+        """Load the definitions, the tree and the unit's list into the graph"""
+        self.graph.clear()
+        for definition in self.node_definitions.values():
+            self.graph.define(definition.name, definition.max_level, definition.requirements)
+        for section in self.sections.values():
+            for node in section.nodes:
+                self.graph.add_node(node.name, node.level)
+        for section in self.sections.values():
+            for node in section.nodes:
+                for target in node.connections:
+                    self.graph.add_edge(node.name, target.name, CONNECTION)
+        self.graph.set_unit_nodes(None if unit_levels is None else list(unit_levels))
+        self.update_problems_label()
+    
+    def node_outline(self, node_name: str) -> str:
+        if node_name == self.connection_source:
+            return COLORS['node']['active']
+        return "#c0392b" if node_name in self.graph.issues else "#4a4641"
+    
+    def show_graph_changes(self, node_names):
+        """Recolor the nodes whose problems changed and update the problem count"""
+        for name in node_names:
+            if name in self.node_items:
+                self.canvas.itemconfigure(self.node_items[name][1], outline=self.node_outline(name))
+        if self.selected_node and self.selected_node.name in node_names:
+            self.update_info_panel()
+        self.update_problems_label()
+    
+    def update_problems_label(self):
+        count = self.graph.problem_count()
+        if count:
+            self.problems_label.config(text=f"{count} problem{'s' if count != 1 else ''}", foreground="#c0392b")
+        else:
+            self.problems_label.config(text="No problems", foreground=COLORS['text'])
+    
+    def show_problems(self):
+        problems = self.graph.problems()
+        if not problems:
+            messagebox.showinfo("Doctrine Problems", "No problems found in the doctrine.")
+            return
+        lines = [f"• {problem}" for problem in problems[:MAX_PROBLEMS_SHOWN]]
+        if len(problems) > MAX_PROBLEMS_SHOWN:
+            lines.append(f"... and {len(problems) - MAX_PROBLEMS_SHOWN} more")
+        messagebox.showwarning("Doctrine Problems", "\n".join(lines))
+    
+    def clear_canvas(self):
+        """Forget every canvas item of the tree"""
+        if self._rescale_job is not None:
+            self.after_cancel(self._rescale_job)
+            self._rescale_job = None
         self.canvas.delete("all")
-        margin_x, margin_y = 50, 50
+        self.section_bounds.clear()
+        self.node_items.clear()
+        self.node_lines.clear()
+        self.line_ends.clear()
+        self.node_grids.clear()
+        self.selected_nodes = set()
+        self.preview_rect = None
+        self.band = None
+        self.drawn_scale = None
+    
+    def draw_doctrine_tree(self):
+        """Create the canvas items of the whole tree at the current scale.
+
+        Only needed when nodes or sections are added or removed: zooming and
+        resizing scale the existing items (apply_scale) and dragging moves
+        the items of one node (move_node_items).
+        """
+        selected = self.selected_nodes
+        self.clear_canvas()
+        self.section_font.configure(size=max(8, int(16 * self.scale_factor)))
+        self.node_font.configure(size=max(6, int(10 * self.scale_factor)))
         scaled_positions = []
         for s in self.sections.values():
             x, y, _, _ = self.get_scaled_coords(s.x, s.y, s.width, s.height, align=s.align)
@@ -546,10 +802,14 @@ class DoctrineEditor(tk.Frame):
             min_y = min(y for x, y in scaled_positions)
         else:
             min_x, min_y = 0, 0
-        offset_x = margin_x - min_x
-        offset_y = margin_y - min_y
+        offset_x = TREE_MARGIN - min_x
+        offset_y = TREE_MARGIN - min_y
         for section in self.sections.values():
             self.draw_section(section, offset_x, offset_y)
+        self.draw_connections()
+        self.drawn_scale = self.scale_factor
+        # Nodes that were deleted drop out of the selection
+        self.set_selection(selected)
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
     
     def draw_section(self, section: Section, offset_x: int, offset_y: int):
@@ -559,7 +819,8 @@ class DoctrineEditor(tk.Frame):
             x + width + offset_x, y + height + offset_y,
             fill=COLORS['section']['background'],
             outline=COLORS['section']['border'],
-            width=max(1, int(2 * self.scale_factor))
+            width=max(1, int(2 * self.scale_factor)),
+            tags=("section",)
         )
         header_height = int(72 * self.scale_factor)
         self.canvas.create_rectangle(
@@ -567,7 +828,8 @@ class DoctrineEditor(tk.Frame):
             x + width + offset_x, y + header_height + offset_y,
             fill=COLORS['section']['header'],
             outline=COLORS['section']['border'],
-            width=max(1, int(2 * self.scale_factor))
+            width=max(1, int(2 * self.scale_factor)),
+            tags=("section",)
         )
         scaled_cell_size_x = int(GRID_CELL_SIZE_X * self.scale_factor)
         scaled_cell_size_y = int(GRID_CELL_SIZE_Y * self.scale_factor)
@@ -585,7 +847,8 @@ class DoctrineEditor(tk.Frame):
                 line_x, grid_start_y - scaled_cell_size_y//2,
                 line_x, grid_start_y + total_grid_height - scaled_cell_size_y//2,
                 fill=COLORS['section']['grid'],
-                width=1
+                width=1,
+                tags=("grid",)
             )
         for i in range(num_cells_y + 1):
             line_y = grid_start_y + i * scaled_cell_size_y - scaled_cell_size_y//2
@@ -593,16 +856,17 @@ class DoctrineEditor(tk.Frame):
                 grid_start_x - scaled_cell_size_x//2, line_y,
                 grid_start_x + total_grid_width - scaled_cell_size_x//2, line_y,
                 fill=COLORS['section']['grid'],
-                width=1
+                width=1,
+                tags=("grid",)
             )
-        font_size = int(16 * self.scale_factor)
         self.canvas.create_text(
             x + width // 2 + offset_x,
             y + header_height // 2 + offset_y,
             text=f"@menu_doctrine_branch_{section.name}",
             fill=COLORS['text'],
-            font=("Arial", max(8, font_size)),
-            anchor="center"
+            font=self.section_font,
+            anchor="center",
+            tags=("section_text",)
         )
         self.section_bounds[section.name] = {
             'x': x + offset_x,
@@ -621,54 +885,139 @@ class DoctrineEditor(tk.Frame):
         }
         self.draw_nodes(section, x + offset_x, y + offset_y)
     
-    def draw_nodes(self, section: Section, section_x: int, section_y: int):
-        # Define display-only padding (applied only for visual display in the editor)
+    def node_canvas_box(self, node: DoctrineNode, section_x: float, section_y: float,
+                        position: Optional[Tuple[int, int]] = None) -> Tuple[float, float, int, int]:
+        """Canvas center and size of a node in a section drawn at section_x, section_y.
+
+        position overrides the node's game coordinates, to place it somewhere else.
+        """
+        game_x, game_y = position if position is not None else (node.x, node.y)
+        # Display-only padding, applied only for visual display in the editor
         display_padding_x = int(35 * self.scale_factor)
         display_padding_y = int(26 * self.scale_factor)
+        # Raw scaled coordinates based on the stored game coordinates
+        raw_x, raw_y, node_width, node_height = self.get_scaled_coords(game_x, game_y, node.width, node.height, align=node.align)
+        center_x = section_x + raw_x + display_padding_x + node_width // 2
+        center_y = section_y + raw_y + display_padding_y + node_height // 2
+        return center_x, center_y, node_width, node_height
+    
+    def draw_nodes(self, section: Section, section_x: int, section_y: int):
+        grid = self.node_grids[section.name] = SpatialGrid(int(GRID_CELL_SIZE_X * self.scale_factor))
         for node in section.nodes:
-            # Get raw scaled coordinates based on the stored game coordinates (without display padding)
-            raw_x, raw_y, node_width, node_height = self.get_scaled_coords(node.x, node.y, node.width, node.height, align=node.align)
-            # Apply display padding for visualization
-            node_x = raw_x + display_padding_x
-            node_y = raw_y + display_padding_y
-            node_center_x = section_x + node_x + node_width // 2
-            node_center_y = section_y + node_y + node_height // 2
-            rect_x1 = node_center_x - node_width // 2
-            rect_y1 = node_center_y - node_height // 2
-            rect_x2 = node_center_x + node_width // 2
-            rect_y2 = node_center_y + node_height // 2
-            for target in node.connections:
-                raw_tx, raw_ty, target_width, target_height = self.get_scaled_coords(target.x, target.y, target.width, target.height, align=target.align)
-                target_x = raw_tx + display_padding_x
-                target_y = raw_ty + display_padding_y
-                target_center_x = section_x + target_x + target_width // 2
-                target_center_y = section_y + target_y + target_height // 2
-                self.canvas.create_line(
-                    node_center_x, node_center_y,
-                    target_center_x, target_center_y,
-                    fill="#716b5f",
-                    width=max(1, int(2 * self.scale_factor))
-                )
-            self.canvas.create_rectangle(
-                rect_x1, rect_y1,
-                rect_x2, rect_y2,
-                fill="#3a3631",
-                outline="#4a4641",
+            node_center_x, node_center_y, node_width, node_height = self.node_canvas_box(node, section_x, section_y)
+            coords = (node_center_x - node_width // 2, node_center_y - node_height // 2,
+                      node_center_x + node_width // 2, node_center_y + node_height // 2)
+            grid.insert(node.name, coords)
+            rect = self.canvas.create_rectangle(
+                *coords,
+                fill=self.node_fill(node.name),
+                outline=self.node_outline(node.name),
                 width=max(1, int(1 * self.scale_factor)),
                 tags=("node", f"{section.name}:{node.name}")
             )
-            node_font_size = int(10 * self.scale_factor)
             display_name = node.name.split('_')[-1]
-            self.canvas.create_text(
+            text = self.canvas.create_text(
                 node_center_x,
                 node_center_y,
                 text=display_name,
                 fill=COLORS['text'],
-                font=("Arial", max(6, node_font_size)),
+                font=self.node_font,
                 anchor="center",
                 width=node_width,
                 tags=("node_text", node.name)
             )
+            self.node_items[node.name] = (node, rect, text)
+    
+    def node_center(self, node_name: str) -> Tuple[float, float]:
+        """Center of a drawn node, read back from its rectangle"""
+        x1, y1, x2, y2 = self.canvas.coords(self.node_items[node_name][1])
+        return (x1 + x2) / 2, (y1 + y2) / 2
+    
+    def draw_connections(self):
+        """Draw a line between the centers of each connected pair of nodes"""
+        for node, _, _ in self.node_items.values():
+            for target in node.connections:
+                if target.name in self.node_items:
+                    self.create_connection_line(node.name, target.name)
+        # Lines run under the nodes they connect
+        self.canvas.tag_raise("node")
+        self.canvas.tag_raise("node_text")
+    
+    def create_connection_line(self, source: str, target: str):
+        line = self.canvas.create_line(
+            *self.node_center(source), *self.node_center(target),
+            fill="#716b5f",
+            width=max(1, int(2 * self.scale_factor)),
+            tags=("connection",)
+        )
+        self.line_ends[line] = (source, target)
+        self.node_lines.setdefault(source, []).append(line)
+        self.node_lines.setdefault(target, []).append(line)
+        return line
+    
+    def delete_connection_line(self, source: str, target: str):
+        for line in list(self.node_lines.get(source, [])):
+            if self.line_ends.get(line) == (source, target):
+                del self.line_ends[line]
+                self.node_lines[source].remove(line)
+                self.node_lines[target].remove(line)
+                self.canvas.delete(line)
+    
+    def move_node_items(self, section: Section, node: DoctrineNode):
+        """Move the items of one node to its stored position and follow it with its lines"""
+        _, rect, text = self.node_items[node.name]
+        bounds = self.section_bounds[section.name]
+        center_x, center_y, _, _ = self.node_canvas_box(node, bounds['x'], bounds['y'])
+        old_x, old_y = self.node_center(node.name)
+        self.canvas.move(rect, center_x - old_x, center_y - old_y)
+        self.canvas.move(text, center_x - old_x, center_y - old_y)
+        self.node_grids[section.name].move(node.name, self.canvas.coords(rect))
+        for line in self.node_lines.get(node.name, []):
+            source, target = self.line_ends[line]
+            self.canvas.coords(line, *self.node_center(source), *self.node_center(target))
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+    
+    def schedule_rescale(self):
+        """Apply scale_factor once the pending events are handled.
+
+        A window drag or a fast wheel sends many events in a row; they all end
+        up in one apply_scale call.
+        """
+        if self._rescale_job is None:
+            self._rescale_job = self.after_idle(self.apply_scale)
+    
+    def apply_scale(self):
+        """Scale the drawn tree to scale_factor without recreating its items"""
+        self._rescale_job = None
+        if self.drawn_scale is None or self.drawn_scale == self.scale_factor:
+            return
+        ratio = self.scale_factor / self.drawn_scale
+        self.drawn_scale = self.scale_factor
+        
+        # The tree is laid out from the margin, so it scales around that point
+        self.canvas.scale("all", TREE_MARGIN, TREE_MARGIN, ratio, ratio)
+        for grid in self.node_grids.values():
+            grid.transform(TREE_MARGIN, TREE_MARGIN, ratio)
+        for bounds in self.section_bounds.values():
+            for key in ('x', 'y', 'grid_start_x', 'grid_start_y'):
+                bounds[key] = TREE_MARGIN + (bounds[key] - TREE_MARGIN) * ratio
+            for key in ('width', 'height', 'header_height', 'grid_width', 'grid_height', 'cell_size_x', 'cell_size_y'):
+                bounds[key] *= ratio
+        
+        # canvas.scale only moves coordinates; line widths, fonts and text
+        # wrapping are set per tag or through the shared fonts
+        self.canvas.itemconfigure("section", width=max(1, int(2 * self.scale_factor)))
+        self.canvas.itemconfigure("connection", width=max(1, int(2 * self.scale_factor)))
+        self.canvas.itemconfigure("node", width=max(1, int(1 * self.scale_factor)))
+        self.section_font.configure(size=max(8, int(16 * self.scale_factor)))
+        self.node_font.configure(size=max(6, int(10 * self.scale_factor)))
+        widths = {node.width for node, _, _ in self.node_items.values()}
+        if len(widths) == 1:
+            self.canvas.itemconfigure("node_text", width=int(widths.pop() * self.scale_factor))
+        else:
+            for node, _, text in self.node_items.values():
+                self.canvas.itemconfigure(text, width=int(node.width * self.scale_factor))
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
     
     def create_new_node(self):
         dialog = tk.Toplevel(self)
@@ -761,8 +1110,11 @@ class DoctrineEditor(tk.Frame):
             # Create the node
             section = self.sections[section_name]
             node = DoctrineNode(name, x=0, y=-160, align='lt')
+            node.definition = self.node_definitions.get(name)
             section.add_node(node)
+            changed = self.graph.add_node(name, node.level)
             self.draw_doctrine_tree()
+            self.show_graph_changes(changed)
             dialog.destroy()
         
         # Buttons
@@ -787,80 +1139,252 @@ class DoctrineEditor(tk.Frame):
         y = self.winfo_rooty() + (self.winfo_height() // 2) - (200 // 2)
         dialog.geometry(f"+{x}+{y}")
     
+    def auto_layout(self):
+        """Arrange the nodes of every section by their requirements and connections"""
+        if not self.sections:
+            return
+        if not messagebox.askyesno("Auto Layout",
+                                   "Rearrange the nodes of every section?\n"
+                                   "Their current positions are lost once you save."):
+            return
+        overflowing = []
+        for section in self.sections.values():
+            layout_section(section)
+            # Sections keep their size, so tall trees run past the bottom edge
+            if any(-node.y + node.height > section.height for node in section.nodes):
+                overflowing.append(section.name)
+        self.draw_doctrine_tree()
+        if overflowing:
+            messagebox.showinfo("Auto Layout",
+                                "These sections have more rows than fit in their height:\n" +
+                                "\n".join(overflowing))
+    
+    def evaluate_builds(self):
+        """Add up the modifiers of every build of the tree's nodes and show the extremes per stat"""
+        if not self.sections:
+            return
+        points = simpledialog.askinteger("Evaluate Builds", "Doctrine points a build may spend:",
+                                         initialvalue=DEFAULT_POINTS, minvalue=1, maxvalue=100, parent=self)
+        if points is None:
+            return
+        node_names = [node.name for section in self.sections.values() for node in section.nodes]
+
+        window = tk.Toplevel(self)
+        window.title("Doctrine Builds")
+        window.geometry("900x500")
+        summary_var = tk.StringVar(value="Evaluating builds...")
+        ttk.Label(window, textvariable=summary_var).pack(anchor="w", padx=5, pady=5)
+
+        rows = []
+        grid = VirtualTreeview(window, BUILD_COLUMNS, lambda row: rows[row])
+        grid.pack(fill="both", expand=True, padx=5, pady=5)
+        for column, width in zip(BUILD_COLUMNS, (200, 80, 80, 500)):
+            grid.heading(column, text=column)
+            grid.column(column, width=width)
+
+        def describe(build):
+            return ", ".join(f"{name} {level}" if level > 1 else name for name, level in build) or "(nothing)"
+
+        def on_done(result):
+            for stat in result.stats:
+                highest, build = result.best[stat]
+                rows.append((stat, f"{result.worst[stat][0]:g}", f"{highest:g}", describe(build)))
+            grid.set_row_count(len(rows))
+            summary = (f"{result.builds} builds with {points} points in {result.seconds:.2f} s "
+                       f"({result.builds_per_second():.0f} builds/s)")
+            if result.truncated:
+                summary += f"; stopped after {result.builds} builds, try fewer points"
+            summary_var.set(summary)
+
+        def on_error(error):
+            summary_var.set("Failed to evaluate the builds")
+            messagebox.showerror("Error", f"Failed to evaluate the builds: {error}")
+
+        # The worker gets its own copy of the definitions
+        background.submit(evaluate_builds, dict(self.node_definitions), node_names, points,
+                          description="Evaluating doctrine builds", owner=window, progress=True,
+                          on_done=on_done, on_error=on_error)
+    
     def toggle_connection_mode(self):
         if not self.connection_mode.get():
-            self.connection_source = None
+            self.set_connection_source(None)
+    
+    def set_connection_source(self, node_name: Optional[str]):
+        previous, self.connection_source = self.connection_source, node_name
+        for name in (previous, node_name):
+            if name in self.node_items:
+                self.canvas.itemconfigure(self.node_items[name][1], outline=self.node_outline(name))
+    
+    def toggle_connection(self, source: DoctrineNode, target: DoctrineNode):
+        """Connect source to target, or remove the connection if there is one.
+
+        A connection that would close a cycle is refused, naming the nodes
+        on the cycle.
+        """
+        if self.graph.has_edge(source.name, target.name, CONNECTION):
+            source.remove_connection(target)
+            self.delete_connection_line(source.name, target.name)
+            self.show_graph_changes(self.graph.remove_edge(source.name, target.name, CONNECTION))
+            return
+        path = self.graph.cycle_path(source.name, target.name)
+        if path:
+            messagebox.showwarning("Connection Mode",
+                                   f"Connecting {source.name} to {target.name} would make a cycle:\n\n" +
+                                   " → ".join(path + [target.name]))
+            return
+        source.add_connection(target)
+        self.create_connection_line(source.name, target.name)
+        self.canvas.tag_raise("node")
+        self.canvas.tag_raise("node_text")
+        self.show_graph_changes(self.graph.add_edge(source.name, target.name, CONNECTION))
+    
+    def on_connection_click(self, node_name: str):
+        """First click picks the source, the second the target; the same node again cancels"""
+        if self.connection_source is None or self.connection_source not in self.node_items:
+            self.set_connection_source(node_name)
+            return
+        source = self.node_items[self.connection_source][0]
+        self.set_connection_source(None)
+        if source.name != node_name:
+            self.toggle_connection(source, self.node_items[node_name][0])
+    
+    def canvas_point(self, event) -> Tuple[float, float]:
+        """Canvas coordinates of a mouse event, taking scrolling into account"""
+        return self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+    
+    def node_at(self, x: float, y: float) -> Optional[Tuple[str, str]]:
+        """(section name, node name) of the topmost node at a canvas point"""
+        # Nodes can lie outside their section's box, so every section is asked
+        for section_name, grid in self.node_grids.items():
+            hits = grid.at(x, y)
+            if hits:
+                return section_name, hits[0]
+        return None
+    
+    def node_fill(self, node_name: str) -> str:
+        return COLORS['node']['selected'] if node_name in self.selected_nodes else COLORS['node']['normal']
+    
+    def set_selection(self, node_names):
+        """Select exactly these nodes, recoloring only the nodes that changed"""
+        node_names = {name for name in node_names if name in self.node_items}
+        changed = node_names ^ self.selected_nodes
+        self.selected_nodes = node_names
+        for name in changed:
+            if name not in self.node_items:
+                continue  # Deleted or no longer drawn
+            self.canvas.itemconfigure(self.node_items[name][1], fill=self.node_fill(name))
+        # The info panel shows the node when exactly one is selected
+        selected = self.node_items[next(iter(node_names))][0] if len(node_names) == 1 else None
+        if selected is not self.selected_node:
+            self.selected_node = selected
+            self.update_info_panel()
+    
+    def drop_position(self, section_name: str, node: DoctrineNode, x: float, y: float):
+        """Where a node dragged to canvas point x, y ends up.
+
+        Returns the game coordinates of the grid cell under the point and the
+        canvas rectangle the node will have there.
+        """
+        snapped_x, snapped_y = self.snap_to_grid(section_name, x, y)
+        bounds = self.section_bounds[section_name]
+
+        # Calculate relative position from grid start
+        rel_x = snapped_x - bounds['grid_start_x']
+        rel_y = snapped_y - bounds['grid_start_y']
+
+        # Convert to cell coordinates
+        cell_x = round(rel_x / bounds['cell_size_x'])
+        cell_y = round(rel_y / bounds['cell_size_y'])
+
+        game_x, game_y = cell_to_game(cell_x, cell_y)
+        center_x, center_y, width, height = self.node_canvas_box(node, bounds['x'], bounds['y'], (game_x, game_y))
+        rect = (center_x - width // 2, center_y - height // 2, center_x + width // 2, center_y + height // 2)
+        return (game_x, game_y), rect
     
     def on_node_press(self, event):
-        if not self.connection_mode.get():
-            node_id = self.canvas.find_closest(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))[0]
-            tags = self.canvas.gettags(node_id)
-            if len(tags) < 2 or ':' not in tags[1]:
-                # Try to find an overlapping item with the proper compound tag
-                overlapping_items = self.canvas.find_overlapping(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y), self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
-                found = False
-                for item in overlapping_items:
-                    t = self.canvas.gettags(item)
-                    if len(t) >= 2 and ':' in t[1]:
-                        tags = t
-                        found = True
-                        break
-                if not found:
-                    return
-            try:
-                section_name, node_name = tags[1].split(':')
-            except Exception:
-                return
-            self.dragging_node = {
-                'section': section_name,
-                'node': node_name,
-                'start_x': event.x,
-                'start_y': event.y
-            }
+        x, y = self.canvas_point(event)
+        hit = self.node_at(x, y)
+        if self.connection_mode.get():
+            if hit is not None:
+                self.on_connection_click(hit[1])
+            return
+        if hit is None:
+            # Pressing on empty canvas starts a rubber band selection
+            self.band = {'x': x, 'y': y, 'rect': None, 'add': bool(event.state & 0x0001)}
+            return
+        section_name, node_name = hit
+        self.dragging_node = {
+            'section': section_name,
+            'node': node_name,
+            'start_x': x,
+            'start_y': y,
+            'moved': False,
+            'add': bool(event.state & 0x0001)
+        }
     
     def on_node_drag(self, event):
+        x, y = self.canvas_point(event)
+        if self.band:
+            coords = (self.band['x'], self.band['y'], x, y)
+            if self.band['rect'] is None:
+                self.band['rect'] = self.canvas.create_rectangle(*coords, outline=COLORS['node']['active'], dash=(3,))
+            else:
+                self.canvas.coords(self.band['rect'], *coords)
+            return
         if self.dragging_node:
-            snapped_x, snapped_y = self.snap_to_grid(self.dragging_node['section'], event.x, event.y)
-            if hasattr(self, 'preview_rect'):
-                self.canvas.delete(self.preview_rect)
-            preview_size = int(120 * self.scale_factor)
-            self.preview_rect = self.canvas.create_rectangle(
-                snapped_x - preview_size//2,
-                snapped_y - preview_size//2,
-                snapped_x + preview_size//2,
-                snapped_y + preview_size//2,
-                outline="#f97b03",
-                dash=(5,),
-                width=2
-            )
+            drag = self.dragging_node
+            if not drag['moved'] and abs(x - drag['start_x']) < DRAG_THRESHOLD and abs(y - drag['start_y']) < DRAG_THRESHOLD:
+                return
+            drag['moved'] = True
+            node = self.node_items[drag['node']][0]
+            _, coords = self.drop_position(drag['section'], node, x, y)
+            # The preview turns red over a cell that another node takes
+            blocked = self.node_grids[drag['section']].overlapping(coords, exclude=node.name)
+            outline = "#c0392b" if blocked else "#f97b03"
+            # One preview rectangle follows the mouse for the whole drag
+            if self.preview_rect is None:
+                self.preview_rect = self.canvas.create_rectangle(
+                    *coords,
+                    outline=outline,
+                    dash=(5,),
+                    width=2
+                )
+            else:
+                self.canvas.coords(self.preview_rect, *coords)
+                self.canvas.itemconfigure(self.preview_rect, outline=outline)
     
     def on_node_release(self, event):
+        x, y = self.canvas_point(event)
+        if self.band:
+            band, self.band = self.band, None
+            if band['rect'] is not None:
+                self.canvas.delete(band['rect'])
+            rect = (band['x'], band['y'], x, y)
+            selected = set(self.selected_nodes) if band['add'] else set()
+            for grid in self.node_grids.values():
+                selected |= grid.overlapping(rect, touching=True)
+            self.set_selection(selected)
+            return
         if self.dragging_node:
-            snapped_x, snapped_y = self.snap_to_grid(self.dragging_node['section'], event.x, event.y)
-            section = self.sections[self.dragging_node['section']]
-            for node in section.nodes:
-                if node.name == self.dragging_node['node']:
-                    bounds = self.section_bounds[section.name]
-
-                    # Calculate relative position from grid start
-                    rel_x = snapped_x - bounds['grid_start_x']
-                    rel_y = snapped_y - bounds['grid_start_y']
-
-                    # Convert to cell coordinates
-                    cell_x = round(rel_x / bounds['cell_size_x'])
-                    cell_y = round(rel_y / bounds['cell_size_y'])
-
-                    # Calculate raw game coordinates without display padding
-                    game_x = cell_x * GRID_CELL_SIZE_X
-                    game_y = -((cell_y * GRID_CELL_SIZE_Y) + 72)  # 72 is the header height in game coordinates
-
-                    node.x = game_x
-                    node.y = game_y
-                    break
-            if hasattr(self, 'preview_rect'):
+            drag, self.dragging_node = self.dragging_node, None
+            if self.preview_rect is not None:
                 self.canvas.delete(self.preview_rect)
-            self.dragging_node = None
-            self.draw_doctrine_tree()
+                self.preview_rect = None
+            if not drag['moved']:
+                # A click: select the node, or toggle it with Shift
+                if drag['add']:
+                    self.set_selection(self.selected_nodes ^ {drag['node']})
+                else:
+                    self.set_selection({drag['node']})
+                return
+            section = self.sections[drag['section']]
+            node = self.node_items[drag['node']][0]
+            position, coords = self.drop_position(section.name, node, x, y)
+            if self.node_grids[section.name].overlapping(coords, exclude=node.name):
+                logger.info(f"Not moving {node.name}: the cell is taken")
+                return
+            node.x, node.y = position
+            self.move_node_items(section, node)
     
     def snap_to_grid(self, section_name: str, mouse_x: int, mouse_y: int) -> tuple:
         bounds = self.section_bounds.get(section_name)
@@ -882,14 +1406,10 @@ class DoctrineEditor(tk.Frame):
         return snapped_x, snapped_y
     
     def on_node_right_click(self, event):
-        node_id = self.canvas.find_closest(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))[0]
-        tags = self.canvas.gettags(node_id)
-        if len(tags) < 2:
-            return
-        try:
-            section_name, node_name = tags[1].split(':')
-        except Exception:
+        hit = self.node_at(*self.canvas_point(event))
+        if hit is None:
             return
+        section_name, node_name = hit
         
         # Create context menu
         context_menu = tk.Menu(self, tearoff=0)
@@ -957,7 +1477,7 @@ class DoctrineEditor(tk.Frame):
                     messagebox.showerror("Error", "Level must be greater than 0")
                     return
                 node.level = new_level
-                self.draw_doctrine_tree()
+                self.show_graph_changes(self.graph.set_level(node.name, new_level))
                 dialog.destroy()
             except ValueError:
                 messagebox.showerror("Error", "Please enter a valid number")
@@ -994,6 +1514,10 @@ class DoctrineEditor(tk.Frame):
                     
                     # Remove the node from its section
                     section.nodes.remove(node_to_delete)
+                    changed = self.graph.remove_node(node_name)
+                    if self.connection_source == node_name:
+                        self.connection_source = None
+                    self.selected_nodes.discard(node_name)
                     
                     # If this was the selected node, clear selection
                     if self.selected_node and self.selected_node.name == node_name:
@@ -1002,6 +1526,7 @@ class DoctrineEditor(tk.Frame):
                     
                     # Redraw the tree
                     self.draw_doctrine_tree()
+                    self.show_graph_changes(changed)
                     logger.info(f"Successfully deleted node {node_name}")
                 else:
                     logger.error(f"Node {node_name} not found in section {section_name}")
@@ -1013,9 +1538,9 @@ class DoctrineEditor(tk.Frame):
         try:
             # First, check all files exist and are accessible
             required_files = {
-                'doctrine_nodes': DOCTRINE_NODES_XML,
-                'doctrine_tree': DOCTRINE_TREE_XML,
-                'unit': UNIT_XML
+                'doctrine_nodes': self.nodes_xml,
+                'doctrine_tree': self.tree_xml,
+                'unit': self.unit_xml
             }
             
             for file_type, file_path in required_files.items():
@@ -1025,14 +1550,23 @@ class DoctrineEditor(tk.Frame):
                     raise PermissionError(f"No write permission for {file_type} file: {file_path}")
             
             # Load all required XML files
-            tree_nodes = ET.parse(DOCTRINE_NODES_XML)
-            tree_layout = ET.parse(DOCTRINE_TREE_XML)
-            tree_unit = ET.parse(UNIT_XML)
+            root_nodes, _ = recover_xml(self.nodes_xml, "DoctrineNodes")
+            tree_layout = ET.parse(self.tree_xml)
+            tree_unit = ET.parse(self.unit_xml)
             
-            root_nodes = tree_nodes.getroot()
             root_layout = tree_layout.getroot()
             root_unit = tree_unit.getroot()
             
+            # The symbol index knows which nodes the nodes file defines and
+            # which files refer to them; bring these three files up to date.
+            # It is built in the background on load; until it is ready,
+            # renames are not checked.
+            index = symbol_index if symbol_index.is_ready(self.mod_path) else None
+            if index is not None:
+                for file_path in required_files.values():
+                    index.update_file(file_path, is_base=False)
+            nodes_path = os.path.normpath(self.nodes_xml)
+            
             # Track node name changes
             name_changes = []
             active_nodes = set()
@@ -1043,16 +1577,16 @@ class DoctrineEditor(tk.Frame):
                     if len(node.name) > 48:
                         raise ValueError(f"Node name '{node.name}' exceeds maximum length of 48 characters")
                     
-                    # Check if this is a renamed node
-                    old_name = None
-                    existing_node = root_nodes.find(f".//Node[@name='{node.name}']")
-                    if existing_node is None:
-                        # Look for a node with matching display name or description
-                        for old_node in root_nodes.findall(".//Node"):
-                            if (old_node.get('nameUI', '').lower() == f"@{node.name.lower()}_name" or
-                                old_node.get('description', '').lower() == f"@{node.name.lower()}_desc"):
-                                old_name = old_node.get('name')
-                                name_changes.append((old_name, node.name))
+                    # A node the nodes file does not define, whose localization
+                    # keys another node there uses, is a renamed node
+                    if index is not None and not any(symbol.file_path == nodes_path
+                               for symbol in index.find_definitions(DOCTRINE_NODE, node.name)):
+                        for attribute, key in (("nameUI", f"{node.name}_name"), ("description", f"{node.name}_desc")):
+                            old_node = next((symbol for symbol in index.find_references(LOCALIZATION, key)
+                                             if symbol.file_path == nodes_path and symbol.tag == "Node"
+                                             and symbol.attribute == attribute), None)
+                            if old_node is not None:
+                                name_changes.append((old_node.owner, node.name))
                                 break
                     
                     active_nodes.add(node.name)
@@ -1062,6 +1596,8 @@ class DoctrineEditor(tk.Frame):
                 warning_msg = "The following node names have changed:\n\n"
                 for old_name, new_name in name_changes:
                     warning_msg += f"• {old_name} → {new_name}\n"
+                    for symbol in index.find_references(DOCTRINE_NODE, old_name):
+                        warning_msg += f"    still used in {os.path.basename(symbol.file_path)}, line {symbol.line}\n"
                 warning_msg += "\nPlease ensure you update these names in:\n"
                 warning_msg += "1. units.xml (for each unit's doctrine)\n"
                 warning_msg += "2. gui/doctrine.xml\n\n"
@@ -1070,17 +1606,25 @@ class DoctrineEditor(tk.Frame):
                 if not messagebox.askyesno("Warning - Node Names Changed", warning_msg):
                     return
             
-            # Proceed with saving
-            new_root = ET.Element("DoctrineNodes")
+            # Every name the save looks up, found in one pass per file
+            defined_names = {node_elem.get("name") for node_elem in root_nodes.iter("Node")}
+            
+            main_container = root_layout.find(".//Item[@name='#MARSOC_DoctrineTree']")
+            if main_container is None:
+                logger.error("Could not find main doctrine tree container")
+                return
+            layout_items = {}
+            for item in main_container.iter("Item"):
+                if item is not main_container:
+                    layout_items.setdefault(item.get("name"), item)
+            
+            # Add a definition for every new node; the existing definitions
+            # are written back as they are
+            added = []  # (node, its new <Node> element)
             for section in self.sections.values():
                 for node in section.nodes:
-                    existing_node = root_nodes.find(f".//Node[@name='{node.name}']")
-                    if existing_node is not None:
-                        existing_node.set("nameUI", f"@{node.name.lower()}_name")
-                        existing_node.set("description", f"@{node.name.lower()}_desc")
-                        existing_node.set("texturePrefix", "data/textures/gui/doctrines/doctrine_empty")
-                    else:
-                        node_def = ET.SubElement(new_root, "Node")
+                    if node.name not in defined_names:
+                        node_def = ET.SubElement(root_nodes, "Node")
                         node_def.set("name", node.name)
                         node_def.set("nameUI", f"@{node.name.lower()}_name")
                         node_def.set("description", f"@{node.name.lower()}_desc")
@@ -1089,36 +1633,20 @@ class DoctrineEditor(tk.Frame):
                         equip_mod.set("target", "rifle")
                         equip_mod.set("readyTime", "-50")
                         equip_mod.set("accuracyAdd", "+10")
+                        added.append((node, node_def))
             
-            # Format and save doctrine nodes XML
-            xml_str = ET.tostring(new_root, encoding='unicode')
-            dom = xml.dom.minidom.parseString(xml_str)
-            pretty_xml = dom.toprettyxml(indent='    ')
-            lines = [line for line in pretty_xml.split('\n') if line.strip()]
-            formatted_xml = '\n'.join(lines)
-            
-            with open(DOCTRINE_NODES_XML, 'w', encoding='utf-8') as f:
-                if formatted_xml.startswith('<?xml'):
-                    formatted_xml = formatted_xml[formatted_xml.find('?>')+2:].strip()
-                f.write('<?xml version="1.0" encoding="utf-8"?>\n')
-                f.write(formatted_xml)
-            
-            # Update doctrine tree XML
-            main_container = root_layout.find(".//Item[@name='#MARSOC_DoctrineTree']")
-            if main_container is None:
-                logger.error("Could not find main doctrine tree container")
-                return
-            
+            # Update the doctrine tree XML
             for section_name, section in self.sections.items():
-                section_elem = main_container.find(f".//Item[@name='{section_name}']")
+                section_elem = layout_items.get(section_name)
                 if section_elem is None:
                     continue
                 
-                for item in section_elem.findall(".//Item[@name]"):
-                    if (item.get('name') not in ['#template_doctrine_button', '#doctrinenode_disabled', '#doctrinenode_active', 'level'] and
-                        not item.get('name', '').startswith('#')):
-                        parent = section_elem
-                        parent.remove(item)
+                # Drop the node items and keep the templates, rebuilding the
+                # children once instead of removing them one at a time
+                section_elem[:] = [item for item in section_elem
+                                   if item.tag != "Item" or item.get('name') is None or
+                                   item.get('name') in ['#template_doctrine_button', '#doctrinenode_disabled', '#doctrinenode_active', 'level'] or
+                                   item.get('name', '').startswith('#')]
                 
                 for node in section.nodes:
                     node_elem = ET.SubElement(section_elem, "Item")
@@ -1139,29 +1667,44 @@ class DoctrineEditor(tk.Frame):
                         arrow_image = ET.SubElement(active_image, "StaticImage", origin="0 -16", align="b")
                         ET.SubElement(arrow_image, "RenderObject2D", texture="data/textures/gui/doctrines/doctrine_arrow.dds", color="f97b03")
             
-            # Save doctrine tree XML
-            xml_str = ET.tostring(root_layout, encoding='unicode')
-            dom = xml.dom.minidom.parseString(xml_str)
-            pretty_xml = dom.toprettyxml(indent='    ')
-            pretty_xml = '\n'.join(line for line in pretty_xml.split('\n') if line.strip())
-            with open(DOCTRINE_TREE_XML, 'w', encoding='utf-8') as f:
-                f.write(pretty_xml)
+            # Each file is streamed straight into its temporary file
+            outputs = {
+                self.nodes_xml: lambda f: write_element(root_nodes, f),
+                self.tree_xml: lambda f: write_element(root_layout, f)
+            }
             
             # Update unit XML
             doctrine_elem = root_unit.find('.//Doctrine')
             if doctrine_elem is not None:
-                for child in list(doctrine_elem):
-                    doctrine_elem.remove(child)
+                doctrine_elem[:] = []
                 for section in self.sections.values():
                     for node in section.nodes:
                         unit_node = ET.SubElement(doctrine_elem, 'Node')
                         unit_node.set('name', node.name)
                         if node.level > 1:
                             unit_node.set('numLevels', str(node.level))
-                tree_unit.write(UNIT_XML, encoding='utf-8', xml_declaration=True)
+                outputs[self.unit_xml] = lambda f: write_element(root_unit, f)
+                unit_nodes = [node.name for section in self.sections.values() for node in section.nodes]
             else:
                 logger.warning('No <Doctrine> element found in the units file.')
             
+            # All files are replaced together, or none if a write fails
+            write_files(outputs)
+            for file_path in outputs:
+                document_cache.invalidate(file_path)
+            if self.unit_xml in outputs:
+                self.show_graph_changes(self.graph.set_unit_nodes(unit_nodes))
+            # The nodes file now defines the new nodes
+            changed = set()
+            for node, node_def in added:
+                definition = definition_from_element(node_def)
+                self.node_definitions[node.name] = node.definition = definition
+                changed |= self.graph.define(definition.name, definition.max_level, definition.requirements)
+            self.show_graph_changes(changed)
+            if index is not None:
+                for file_path in required_files.values():
+                    index.update_file(file_path, is_base=False)
+            
             logger.info("Successfully saved doctrine tree and node definitions")
             if name_changes:
                 messagebox.showinfo(
@@ -1219,14 +1762,12 @@ class DoctrineEditor(tk.Frame):
         self.canvas.tag_bind(text_id, '<Button-1>', lambda e: self.on_node_click(node))
     
     def on_node_click(self, node: DoctrineNode):
-        self.selected_node = node
-        self.update_info_panel()
-        self.draw_doctrine_tree()
+        self.set_selection({node.name})
     
     def update_info_panel(self):
         if not hasattr(self, 'info_panel'):
             self.info_panel = ttk.Frame(self)
-            self.info_panel.pack(side=tk.RIGHT, fill=tk.Y, padx=5, pady=5)
+            self.info_panel.grid(row=0, column=1, sticky="ns", padx=5, pady=5)
             self.node_name_label = ttk.Label(self.info_panel, text="")
             self.node_name_label.pack(anchor=tk.W, pady=2)
             self.node_desc_label = ttk.Label(self.info_panel, text="", wraplength=200)
@@ -1242,6 +1783,8 @@ class DoctrineEditor(tk.Frame):
             self.reqs_label.pack(anchor=tk.W, pady=(10,2))
             self.reqs_text = tk.Text(self.info_panel, height=4, width=30)
             self.reqs_text.pack(anchor=tk.W, pady=2)
+            self.node_problems_label = ttk.Label(self.info_panel, text="", wraplength=200, foreground="#c0392b")
+            self.node_problems_label.pack(anchor=tk.W, pady=2)
             self.mods_label = ttk.Label(self.info_panel, text="Modifiers:", font=('TkDefaultFont', 10, 'bold'))
             self.mods_label.pack(anchor=tk.W, pady=(10,2))
             self.mods_text = tk.Text(self.info_panel, height=6, width=30)
@@ -1258,6 +1801,8 @@ class DoctrineEditor(tk.Frame):
                     self.reqs_text.insert(tk.END, f"• {req}\n")
             else:
                 self.reqs_text.insert(tk.END, "No requirements")
+            self.node_problems_label.config(text="\n".join(
+                issue.message for issue in self.graph.issues.get(self.selected_node.name, [])))
             self.mods_text.delete('1.0', tk.END)
             if def_node.modifiers:
                 for mod_type, value in def_node.modifiers.items():
@@ -1269,6 +1814,7 @@ class DoctrineEditor(tk.Frame):
             self.node_desc_label.config(text="")
             self.level_var.set("1")
             self.reqs_text.delete('1.0', tk.END)
+            self.node_problems_label.config(text="")
             self.mods_text.delete('1.0', tk.END)
     
     def on_level_change(self):
@@ -1277,7 +1823,7 @@ class DoctrineEditor(tk.Frame):
                 new_level = int(self.level_var.get())
                 if new_level != self.selected_node.level:
                     self.selected_node.level = new_level
-                    self.draw_doctrine_tree()
+                    self.show_graph_changes(self.graph.set_level(self.selected_node.name, new_level))
             except ValueError:
                 pass
 
@@ -1311,8 +1857,7 @@ class DoctrineEditor(tk.Frame):
         current_skills = {}
         current_equipment = {}
         try:
-            tree = ET.parse(DOCTRINE_NODES_XML)
-            root = tree.getroot()
+            root, _ = recover_xml(self.nodes_xml, "DoctrineNodes")
             node_elem = root.find(f".//Node[@name='{node_name}']")
             if node_elem is not None:
                 # Load skills
@@ -1558,8 +2103,7 @@ class DoctrineEditor(tk.Frame):
         """Apply the node settings and update the XML"""
         try:
             # Parse the current doctrine nodes XML
-            tree = ET.parse(DOCTRINE_NODES_XML)
-            root = tree.getroot()
+            root, _ = recover_xml(self.nodes_xml, "DoctrineNodes")
             
             # Find or create the node
             node_elem = root.find(f".//Node[@name='{node_name}']")
@@ -1597,26 +2141,15 @@ class DoctrineEditor(tk.Frame):
                             equip_mod.set(attr, value)
             
             # Save the XML with proper formatting
-            xml_str = ET.tostring(root, encoding='unicode')
-            dom = xml.dom.minidom.parseString(xml_str)
-            pretty_xml = dom.toprettyxml(indent='    ')
-            # Clean up empty lines while preserving structure
-            lines = [line for line in pretty_xml.split('\n') if line.strip()]
-            formatted_xml = '\n'.join(lines)
-            
-            # Write the formatted XML to file, ensuring only one XML declaration
-            with open(DOCTRINE_NODES_XML, 'w', encoding='utf-8') as f:
-                # Remove any existing XML declaration from formatted_xml
-                if formatted_xml.startswith('<?xml'):
-                    formatted_xml = formatted_xml[formatted_xml.find('?>')+2:].strip()
-                f.write('<?xml version="1.0" encoding="utf-8"?>\n')
-                f.write(formatted_xml)
+            write_xml_file(root, self.nodes_xml)
+            if symbol_index.is_ready(self.mod_path):
+                symbol_index.update_file(self.nodes_xml)
             
             dialog.destroy()
             messagebox.showinfo("Success", "Node settings saved successfully!")
             
         except FileNotFoundError:
-            error_msg = f"Could not find doctrine nodes file: {DOCTRINE_NODES_XML}"
+            error_msg = f"Could not find doctrine nodes file: {self.nodes_xml}"
             logger.error(error_msg)
             messagebox.showerror("Error", error_msg)
         except ET.ParseError as e:
@@ -1624,7 +2157,7 @@ class DoctrineEditor(tk.Frame):
             logger.error(error_msg)
             messagebox.showerror("Error", error_msg)
         except PermissionError:
-            error_msg = f"Permission denied when trying to save to: {DOCTRINE_NODES_XML}"
+            error_msg = f"Permission denied when trying to save to: {self.nodes_xml}"
             logger.error(error_msg)
             messagebox.showerror("Error", error_msg)
         except Exception as e:
@@ -0,0 +1,228 @@
+import os
+import json
+import time
+from array import array
+from operator import add
+from bisect import bisect_left, insort
+
+DEFAULT_POINTS = 10  # Doctrine points a build may spend, one per node level
+DEFAULT_MAX_BUILDS = 1_000_000
+BATCH_SIZE = 4096  # Builds whose totals are gathered before the columns are scanned
+MAX_VIOLATIONS = 200
+PROGRESS_INTERVAL = 50_000
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("doctrine_evaluator", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[DoctrineEvaluator] {message}")
+
+def parse_modifier_value(value):
+    """Number in a modifier value like "+10", "-50" or "15%"; None if it isn't one"""
+    try:
+        return float(str(value).strip().rstrip("%"))
+    except ValueError:
+        return None
+
+def node_stats(definition):
+    """What one level of a node adds: {stat: value}.
+
+    Modifier types are stats of their own; equipment modifiers are named
+    "target.attribute", e.g. "rifle.readyTime", so they add up per target.
+    """
+    stats = {}
+    for stat, value in definition.modifiers.items():
+        number = parse_modifier_value(value)
+        if number is not None:
+            stats[stat] = stats.get(stat, 0.0) + number
+    for target, attributes in definition.equipment_modifiers.items():
+        for attribute, value in attributes.items():
+            number = parse_modifier_value(value)
+            if number is not None:
+                stat = f"{target}.{attribute}"
+                stats[stat] = stats.get(stat, 0.0) + number
+    return stats
+
+class EvaluationResult:
+    """What the builds of a doctrine add up to.
+
+    A build is a tuple of (node name, level) pairs. best and worst map each
+    stat to (value, build) for the build with the highest and the lowest
+    total; violations lists (stat, value, build) for builds above a limit.
+    """
+    def __init__(self, stats):
+        self.stats = stats
+        self.builds = 0
+        self.best = {}
+        self.worst = {}
+        self.violations = []
+        self.truncated = False  # Stopped at max_builds
+        self.seconds = 0.0
+
+    def builds_per_second(self):
+        return self.builds / self.seconds if self.seconds else 0.0
+
+class _Accumulator:
+    """Collects build totals row by row in a flat array and scans them a
+    batch at a time: each stat is a strided slice of the batch, so max(),
+    min() and index() run over it in C instead of a Python loop per build."""
+    def __init__(self, result, limits):
+        self.result = result
+        self.width = len(result.stats)
+        self.limits = [(column, stat, limits[stat]) for column, stat in enumerate(result.stats)
+                       if stat in limits]
+        self.rows = array('d')
+        self.builds = []
+
+    def add(self, totals, build):
+        self.rows.extend(totals)
+        self.builds.append(build)
+        if len(self.builds) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.builds:
+            return
+        result = self.result
+        rows, width = self.rows, self.width
+        for column, stat in enumerate(result.stats):
+            values = rows[column::width]
+            highest = max(values)
+            if stat not in result.best or highest > result.best[stat][0]:
+                result.best[stat] = (highest, self.builds[values.index(highest)])
+            lowest = min(values)
+            if stat not in result.worst or lowest < result.worst[stat][0]:
+                result.worst[stat] = (lowest, self.builds[values.index(lowest)])
+        for column, stat, limit in self.limits:
+            values = rows[column::width]
+            if max(values) > limit and len(result.violations) < MAX_VIOLATIONS:
+                over = [(stat, value, self.builds[row]) for row, value in enumerate(values) if value > limit]
+                result.violations.extend(over[:MAX_VIOLATIONS - len(result.violations)])
+        result.builds += len(self.builds)
+        self.rows = array('d')
+        self.builds = []
+
+def evaluate_builds(definitions, node_names=None, points=DEFAULT_POINTS, limits=None,
+                    max_builds=DEFAULT_MAX_BUILDS, progress=None):
+    """Add up the modifiers of every build a doctrine allows.
+
+    definitions maps node names to DoctrineNodeDefinitions; node_names
+    limits the builds to the nodes in the tree. A build unlocks nodes whose
+    requirements are all unlocked, each at a level from 1 to its maxLevel,
+    spending one of points per level; a node's modifiers count once per
+    level. limits maps stats to the highest total allowed.
+
+    Unlock order does not change the totals, so each set of nodes is built
+    once, adding nodes in a fixed topological order: a node may only follow
+    nodes that come before it, and only once its requirements are in, so
+    only the nodes whose requirements are met are looked at. Nodes
+    whose requirements can never be met are left out, branches stop when
+    the points run out, and running totals are extended one node at a time
+    instead of being summed again for every build.
+    """
+    start = time.perf_counter()
+    limits = limits or {}
+    names = [name for name in (definitions if node_names is None else node_names) if name in definitions]
+    order = _unlock_order(names, definitions)
+    index = {name: i for i, name in enumerate(order)}
+    requirements = [tuple(index[requirement] for requirement in definitions[name].requirements)
+                    for name in order]
+
+    per_node = [node_stats(definitions[name]) for name in order]
+    stats = sorted({stat for node in per_node for stat in node} | set(limits))
+    column = {stat: i for i, stat in enumerate(stats)}
+    # Totals a node adds at each level, as arrays over the stats
+    level_rows = []
+    for name, node in zip(order, per_node):
+        row = array('d', bytes(8 * len(stats)))
+        for stat, value in node.items():
+            row[column[stat]] = value
+        level_rows.append([None] + [array('d', (value * level for value in row))
+                                    for level in range(1, max(1, definitions[name].max_level) + 1)])
+
+    # Nodes waiting on requirements become available as those are unlocked
+    dependents = [[] for _ in order]
+    for node, required in enumerate(requirements):
+        for requirement in required:
+            dependents[requirement].append(node)
+    missing = [len(required) for required in requirements]
+    available = [node for node in range(len(order)) if not missing[node]]  # Kept sorted
+
+    result = EvaluationResult(stats)
+    accumulator = _Accumulator(result, limits)
+    build = []
+    count = 0
+
+    def visit(first, remaining, totals):
+        nonlocal count
+        if count >= max_builds:
+            result.truncated = True
+            return
+        accumulator.add(totals, tuple(build))
+        count += 1
+        if progress and count % PROGRESS_INTERVAL == 0:
+            progress(count, None, f"{count} builds")
+        if not remaining:
+            return
+        for node in available[bisect_left(available, first):]:
+            opened = []
+            for dependent in dependents[node]:
+                missing[dependent] -= 1
+                if not missing[dependent]:
+                    insort(available, dependent)
+                    opened.append(dependent)
+            rows = level_rows[node]
+            for level in range(1, min(len(rows) - 1, remaining) + 1):
+                build.append((order[node], level))
+                visit(node + 1, remaining - level, array('d', map(add, totals, rows[level])))
+                build.pop()
+            for dependent in opened:
+                del available[bisect_left(available, dependent)]
+            for dependent in dependents[node]:
+                missing[dependent] += 1
+            if result.truncated:
+                return
+
+    visit(0, points, array('d', bytes(8 * len(stats))))
+    accumulator.flush()
+    result.seconds = time.perf_counter() - start
+    log(f"Evaluated {result.builds} builds of {len(order)} nodes over {len(stats)} stats "
+        f"in {result.seconds:.2f} s")
+    return result
+
+def _unlock_order(names, definitions):
+    """The nodes that can be unlocked, each after its requirements.
+
+    Nodes requiring a node outside names, or on a requirement cycle, can
+    never be unlocked and are left out.
+    """
+    available = set(names)
+    order = []
+    placed = set()
+    pending = list(names)
+    while pending:
+        waiting = []
+        for name in pending:
+            requirements = definitions[name].requirements
+            if any(requirement not in available for requirement in requirements):
+                continue
+            if all(requirement in placed for requirement in requirements):
+                order.append(name)
+                placed.add(name)
+            else:
+                waiting.append(name)
+        if len(waiting) == len(pending):
+            break  # The rest wait on each other
+        pending = waiting
+    return order
@@ -0,0 +1,334 @@
+import os
+import json
+import heapq
+
+# Kinds of edges: a node requires another, or the tree draws a link to it
+REQUIREMENT = "requirement"
+CONNECTION = "connection"
+
+# Kinds of problems
+CYCLE = "cycle"
+DANGLING = "dangling"
+UNREACHABLE = "unreachable"
+UNDEFINED = "undefined"
+LEVEL = "level"
+NOT_IN_TREE = "not_in_tree"
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("doctrine_graph", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[DoctrineGraph] {message}")
+
+class GraphIssue:
+    """A problem with one doctrine node"""
+    __slots__ = ("kind", "node", "message")
+
+    def __init__(self, kind, node, message):
+        self.kind = kind
+        self.node = node
+        self.message = message
+
+    def __eq__(self, other):
+        return (isinstance(other, GraphIssue) and
+                (self.kind, self.node, self.message) == (other.kind, other.node, other.message))
+
+    def __str__(self):
+        return f"{self.node}: {self.message}"
+
+class DoctrineGraph:
+    """Requirements and connections between doctrine nodes, checked as they change.
+
+    Vertices are node names: nodes defined in the doctrine nodes file, nodes
+    placed in the tree, and names only referred to. An edge parent -> child
+    means the child needs the parent, because the child's definition
+    requires it or the tree connects them; both kinds can share an edge.
+
+    Every edit updates only what it can affect. Edges are kept in a
+    topological order (Pearce and Kelly's algorithm), so an edge that would
+    close a cycle is found by searching just the nodes ordered between its
+    ends; such edges are set aside in `cyclic` and tried again when an edge
+    is removed. Whether a node can be unlocked is recomputed only
+    downstream of a change. Each method returns the names whose problems
+    changed, so the editor can redraw just those nodes.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.max_levels = {}  # Defined node -> maxLevel
+        self.requirements = {}  # Defined node -> names it requires
+        self.levels = {}  # Node placed in the tree -> its level in the unit
+        self.unit_nodes = None  # Names in the unit's <Doctrine> list, None if unknown
+        self.kinds = {}  # (parent, child) -> set of edge kinds
+        self.out = {}  # Vertex -> children over edges in the topological order
+        self.inn = {}  # Vertex -> parents over edges in the topological order
+        self.cyclic = {}  # Child -> parents whose edge would close a cycle
+        self.order = {}  # Vertex -> position in the topological order
+        self.reachable = set()  # Placed nodes that can be unlocked
+        self.issues = {}  # Node -> list of GraphIssues
+        self._next_order = 0
+
+    # Edits
+
+    def define(self, name, max_level=1, requirements=()):
+        """Add or change a node definition; its requirements become edges"""
+        self._vertex(name)
+        self.max_levels[name] = max_level
+        old = self.requirements.get(name, ())
+        new = tuple(dict.fromkeys(requirements))
+        self.requirements[name] = new
+        changed = self._refresh({name})
+        for parent in old:
+            if parent not in new:
+                changed |= self.remove_edge(parent, name, REQUIREMENT)
+        for parent in new:
+            if parent not in old:
+                changed |= self.add_edge(parent, name, REQUIREMENT)
+        return changed
+
+    def add_node(self, name, level=1):
+        """A node was placed in the tree"""
+        self._vertex(name)
+        self.levels[name] = level
+        return self._refresh({name})
+
+    def remove_node(self, name):
+        """A node was taken out of the tree, with its connections"""
+        if name not in self.levels:
+            return set()
+        del self.levels[name]
+        changed = self._refresh({name})
+        for parent, child in [edge for edge, kinds in self.kinds.items()
+                              if CONNECTION in kinds and name in edge]:
+            changed |= self.remove_edge(parent, child, CONNECTION)
+        return changed
+
+    def set_level(self, name, level):
+        if name not in self.levels or self.levels[name] == level:
+            return set()
+        self.levels[name] = level
+        return self._refresh({name})
+
+    def set_unit_nodes(self, names):
+        """The names listed in the unit's <Doctrine> element, or None if unknown"""
+        old = self.unit_nodes or set()
+        self.unit_nodes = None if names is None else set(names)
+        for name in self.unit_nodes or ():
+            self._vertex(name)
+        return self._refresh(old | (self.unit_nodes or set()))
+
+    def add_edge(self, parent, child, kind):
+        self._vertex(parent)
+        self._vertex(child)
+        kinds = self.kinds.setdefault((parent, child), set())
+        if kind in kinds:
+            return set()
+        kinds.add(kind)
+        if len(kinds) == 1 and not self._insert(parent, child):
+            self.cyclic.setdefault(child, set()).add(parent)
+            log(f"{parent} -> {child} closes a cycle")
+        return self._refresh({child})
+
+    def remove_edge(self, parent, child, kind):
+        kinds = self.kinds.get((parent, child))
+        if not kinds or kind not in kinds:
+            return set()
+        kinds.discard(kind)
+        if kinds:
+            return set()
+        del self.kinds[(parent, child)]
+        starts = {child}
+        if parent in self.cyclic.get(child, ()):
+            self._discard_cyclic(parent, child)
+        else:
+            self.out[parent].discard(child)
+            self.inn[child].discard(parent)
+            # Edges that closed a cycle may not any more
+            for other_child, parents in list(self.cyclic.items()):
+                for other_parent in list(parents):
+                    if self._insert(other_parent, other_child):
+                        self._discard_cyclic(other_parent, other_child)
+                        starts.add(other_child)
+        return self._refresh(starts)
+
+    # Queries
+
+    def has_edge(self, parent, child, kind=None):
+        kinds = self.kinds.get((parent, child), ())
+        return bool(kinds) if kind is None else kind in kinds
+
+    def cycle_path(self, parent, child):
+        """The path child -> ... -> parent that an edge parent -> child would
+        close into a cycle, or None if the edge is safe"""
+        if parent == child:
+            return [child]
+        if parent not in self.order or child not in self.order:
+            return None
+        came_from = {child: None}
+        queue = [child]
+        for vertex in queue:
+            following = set(self.out[vertex])
+            following.update(other for other, parents in self.cyclic.items() if vertex in parents)
+            for next_vertex in following:
+                if next_vertex in came_from:
+                    continue
+                came_from[next_vertex] = vertex
+                if next_vertex == parent:
+                    path = [parent]
+                    while came_from[path[-1]] is not None:
+                        path.append(came_from[path[-1]])
+                    return path[::-1]
+                queue.append(next_vertex)
+        return None
+
+    def problems(self):
+        """Every current problem, by node name"""
+        return [issue for name in sorted(self.issues) for issue in self.issues[name]]
+
+    def problem_count(self):
+        return sum(len(issues) for issues in self.issues.values())
+
+    # Internals
+
+    def _vertex(self, name):
+        if name not in self.order:
+            self.order[name] = self._next_order
+            self._next_order += 1
+            self.out[name] = set()
+            self.inn[name] = set()
+
+    def _discard_cyclic(self, parent, child):
+        parents = self.cyclic[child]
+        parents.discard(parent)
+        if not parents:
+            del self.cyclic[child]
+
+    def _insert(self, parent, child):
+        """Add an edge to the topological order; False if it would close a cycle.
+
+        When the order has to change, only the nodes between the edge's ends
+        are searched: those reachable from child that come before parent, and
+        those reaching parent that come after child. The two groups swap
+        their positions.
+        """
+        if parent == child:
+            return False
+        order = self.order
+        lower, upper = order[child], order[parent]
+        if upper > lower:
+            forward = []
+            stack = [child]
+            seen = {child}
+            while stack:
+                vertex = stack.pop()
+                forward.append(vertex)
+                for next_vertex in self.out[vertex]:
+                    if next_vertex == parent:
+                        return False
+                    if next_vertex not in seen and order[next_vertex] < upper:
+                        seen.add(next_vertex)
+                        stack.append(next_vertex)
+            backward = []
+            stack = [parent]
+            seen = {parent}
+            while stack:
+                vertex = stack.pop()
+                backward.append(vertex)
+                for previous in self.inn[vertex]:
+                    if previous not in seen and order[previous] > lower:
+                        seen.add(previous)
+                        stack.append(previous)
+            backward.sort(key=order.__getitem__)
+            forward.sort(key=order.__getitem__)
+            moved = backward + forward
+            for vertex, position in zip(moved, sorted(order[vertex] for vertex in moved)):
+                order[vertex] = position
+        self.out[parent].add(child)
+        self.inn[child].add(parent)
+        return True
+
+    def _can_unlock(self, name):
+        return (name in self.levels and name not in self.cyclic and
+                all(parent in self.reachable for parent in self.inn[name]))
+
+    def _update_reachable(self, starts):
+        """Recompute which nodes can be unlocked, from starts down; returns those that flipped"""
+        heap = [(self.order[name], name) for name in starts if name in self.order]
+        heapq.heapify(heap)
+        queued = set(starts)
+        flipped = set()
+        while heap:
+            _, name = heapq.heappop(heap)
+            queued.discard(name)
+            can_unlock = self._can_unlock(name)
+            if can_unlock == (name in self.reachable):
+                continue
+            if can_unlock:
+                self.reachable.add(name)
+            else:
+                self.reachable.discard(name)
+            flipped.add(name)
+            # Children come later in the order, so each is checked after all its parents
+            for child in self.out[name]:
+                if child not in queued:
+                    queued.add(child)
+                    heapq.heappush(heap, (self.order[child], child))
+        return flipped
+
+    def _refresh(self, starts):
+        """Bring reachability and problems up to date after starts changed"""
+        flipped = self._update_reachable(starts)
+        touched = set(starts) | flipped
+        # Problems name a node's parents, so its children are checked too
+        for name in list(touched):
+            if name in self.order:
+                touched.update(self.out[name])
+        touched.update(child for child, parents in self.cyclic.items() if parents & touched)
+        changed = set()
+        for name in touched:
+            issues = self._find_issues(name)
+            if issues != self.issues.get(name, []):
+                changed.add(name)
+                if issues:
+                    self.issues[name] = issues
+                else:
+                    self.issues.pop(name, None)
+        return changed
+
+    def _find_issues(self, name):
+        issues = []
+        if name not in self.levels:
+            if self.unit_nodes is not None and name in self.unit_nodes:
+                issues.append(GraphIssue(NOT_IN_TREE, name, "is in the unit's doctrine list but not in the tree"))
+            return issues
+
+        max_level = self.max_levels.get(name)
+        if max_level is None:
+            issues.append(GraphIssue(UNDEFINED, name, "has no definition in the doctrine nodes file"))
+        elif not 1 <= self.levels[name] <= max_level:
+            issues.append(GraphIssue(LEVEL, name, f"has {self.levels[name]} levels, its definition allows 1 to {max_level}"))
+
+        for parent in sorted(self.cyclic.get(name, ())):
+            issues.append(GraphIssue(CYCLE, name, f"needs {parent}, which needs it in turn"))
+        for parent in self.requirements.get(name, ()):
+            if parent not in self.levels:
+                where = "the tree" if parent in self.max_levels else "the doctrine nodes file"
+                issues.append(GraphIssue(DANGLING, name, f"requires {parent}, which is not in {where}"))
+        if not issues or all(issue.kind in (UNDEFINED, LEVEL) for issue in issues):
+            blockers = sorted(parent for parent in self.inn[name]
+                              if parent in self.levels and parent not in self.reachable)
+            if blockers:
+                issues.append(GraphIssue(UNREACHABLE, name, f"can't be unlocked because {', '.join(blockers)} can't"))
+        return issues
@@ -0,0 +1,254 @@
+import os
+import json
+import time
+
+DEFAULT_SWEEPS = 12  # Up and down ordering passes; the best ordering seen is kept
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("doctrine_layout", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[DoctrineLayout] {message}")
+
+def doctrine_edges(nodes):
+    """(parent, child) name pairs between the given doctrine nodes.
+
+    A node is a child of every node it requires and of every node that
+    connects to it. Edges to nodes outside the list are left out, so a
+    section is laid out on its own.
+    """
+    names = {node.name for node in nodes}
+    edges = []
+    for node in nodes:
+        if node.definition:
+            for requirement in node.definition.requirements:
+                if requirement in names:
+                    edges.append((requirement, node.name))
+        for target in node.connections:
+            if target.name in names:
+                edges.append((node.name, target.name))
+    return edges
+
+def layered_layout(names, edges, max_columns=None, sweeps=DEFAULT_SWEEPS):
+    """Place a graph on a grid of cells, parents in rows above their children.
+
+    names is the list of nodes; their order is the starting order within a
+    row, so passing them sorted by their current column keeps the layout
+    close to what the user had. edges are (parent, child) pairs. With
+    max_columns, no row gets more nodes than that and the tree grows
+    downwards instead.
+
+    The steps are the usual ones for layered drawings: edges closing a cycle
+    are reversed, every node gets the first row below all its parents,
+    edges spanning several rows get a placeholder in each row between,
+    the rows are reordered by the barycenter of their neighbours to cut
+    down crossings, and columns are picked near the parents' columns.
+    Returns {name: (column, row)}.
+    """
+    start = time.perf_counter()
+    index = {name: i for i, name in enumerate(names)}
+    count = len(names)
+    children = [[] for _ in range(count)]
+    seen = set()
+    for parent, child in edges:
+        if parent in index and child in index and parent != child:
+            edge = (index[parent], index[child])
+            if edge not in seen:
+                seen.add(edge)
+                children[edge[0]].append(edge[1])
+
+    children = _break_cycles(children)
+    parents = [[] for _ in range(count)]
+    for parent in range(count):
+        for child in children[parent]:
+            parents[child].append(parent)
+
+    rows = _assign_rows(children, parents, max_columns)
+    layers, up, down = _add_placeholders(rows, children, count)
+    crossings = _order_layers(layers, up, down, sweeps)
+    columns = _assign_columns(layers, parents, children, count, max_columns)
+
+    log(f"Laid out {count} nodes in {len(layers)} rows with {crossings} crossings "
+        f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return {name: (columns[i], rows[i]) for i, name in enumerate(names)}
+
+def _break_cycles(children):
+    """Reverse the edges that close a cycle, found by a depth first search"""
+    count = len(children)
+    state = [0] * count  # 0 unvisited, 1 on the stack, 2 done
+    acyclic = [[] for _ in range(count)]
+    for root in range(count):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(children[root]))]
+        while stack:
+            node, pending = stack[-1]
+            for child in pending:
+                if state[child] == 1:
+                    acyclic[child].append(node)  # Back edge: turned around
+                else:
+                    acyclic[node].append(child)
+                    if state[child] == 0:
+                        state[child] = 1
+                        stack.append((child, iter(children[child])))
+                        break
+            else:
+                state[node] = 2
+                stack.pop()
+    # Reversing can duplicate an edge that already went the other way
+    return [list(dict.fromkeys(targets)) for targets in acyclic]
+
+def _assign_rows(children, parents, max_columns):
+    """Row of every node: the first row below all of its parents that has room"""
+    count = len(children)
+    waiting = [len(p) for p in parents]
+    ready = [node for node in range(count) if not waiting[node]]
+    rows = [0] * count
+    filled = {}
+    position = 0
+    while position < len(ready):
+        node = ready[position]
+        position += 1
+        row = max((rows[parent] + 1 for parent in parents[node]), default=0)
+        if max_columns:
+            while filled.get(row, 0) >= max_columns:
+                row += 1
+        filled[row] = filled.get(row, 0) + 1
+        rows[node] = row
+        for child in children[node]:
+            waiting[child] -= 1
+            if not waiting[child]:
+                ready.append(child)
+    return rows
+
+def _add_placeholders(rows, children, count):
+    """Rows of vertices, with placeholder vertices on edges spanning several rows.
+
+    Vertices below count are the nodes, the others are placeholders.
+    Returns (layers, up, down): up and down list each vertex's neighbours in
+    the row above and below.
+    """
+    height = max(rows, default=-1) + 1
+    layers = [[] for _ in range(height)]
+    for node in range(count):
+        layers[rows[node]].append(node)
+    up = [[] for _ in range(count)]
+    down = [[] for _ in range(count)]
+    for parent in range(count):
+        for child in children[parent]:
+            previous = parent
+            for row in range(rows[parent] + 1, rows[child]):
+                placeholder = len(up)
+                up.append([previous])
+                down.append([])
+                down[previous].append(placeholder)
+                layers[row].append(placeholder)
+                previous = placeholder
+            down[previous].append(child)
+            up[child].append(previous)
+    return layers, up, down
+
+def _order_layers(layers, up, down, sweeps):
+    """Reorder the rows in place to reduce edge crossings; returns the crossings left"""
+    position = [0] * len(up)
+
+    def number(layer):
+        for i, vertex in enumerate(layer):
+            position[vertex] = i
+
+    for layer in layers:
+        number(layer)
+    best = [list(layer) for layer in layers]
+    best_crossings = _count_crossings(layers, down, position)
+
+    for sweep in range(sweeps):
+        if not best_crossings:
+            break
+        if sweep % 2 == 0:
+            order, neighbours = range(1, len(layers)), up
+        else:
+            order, neighbours = range(len(layers) - 2, -1, -1), down
+        for row in order:
+            layer = layers[row]
+            # Vertices without neighbours on that side keep their place
+            keys = {}
+            for vertex in layer:
+                linked = neighbours[vertex]
+                keys[vertex] = (sum(position[n] for n in linked) / len(linked)
+                                if linked else position[vertex])
+            layer.sort(key=keys.__getitem__)
+            number(layer)
+        crossings = _count_crossings(layers, down, position)
+        if crossings < best_crossings:
+            best_crossings = crossings
+            best = [list(layer) for layer in layers]
+
+    layers[:] = best
+    return best_crossings
+
+def _count_crossings(layers, down, position):
+    """Edge crossings between neighbouring rows, as inversions counted with a Fenwick tree"""
+    total = 0
+    for row in range(len(layers) - 1):
+        targets = []
+        for vertex in layers[row]:  # Already in position order
+            targets.extend(sorted(position[child] for child in down[vertex]))
+        size = len(layers[row + 1])
+        tree = [0] * (size + 1)
+        for seen, target in enumerate(targets):
+            # Earlier edges that end to the right of this one cross it
+            i, not_greater = target + 1, 0
+            while i > 0:
+                not_greater += tree[i]
+                i -= i & -i
+            total += seen - not_greater
+            i = target + 1
+            while i <= size:
+                tree[i] += 1
+                i += i & -i
+    return total
+
+def _assign_columns(layers, parents, children, count, max_columns):
+    """Columns of the nodes: rows keep their order, each node near its parents.
+
+    Placeholders only serve the ordering and take no cell, as connections
+    are drawn as straight lines.
+    """
+    columns = [None] * count
+    rows = [[vertex for vertex in layer if vertex < count] for layer in layers]
+
+    def place(row, wanted):
+        previous = -1
+        last = len(row) - 1
+        for i, node in enumerate(row):
+            column = max(round(wanted(node, i)), previous + 1)
+            if max_columns:
+                column = min(column, max_columns - 1 - (last - i))
+            columns[node] = previous = column
+
+    def near(linked, node, i):
+        if not linked:
+            return i if columns[node] is None else columns[node]
+        return sum(columns[other] for other in linked) / len(linked)
+
+    for row in rows:
+        place(row, lambda node, i: near(parents[node], node, i))
+    # Nodes without parents follow their children instead
+    for row in reversed(rows):
+        place(row, lambda node, i: near(children[node], node, i) if not parents[node] else columns[node])
+
+    # Shift everything so the leftmost column is 0
+    shift = min((column for column in columns if column is not None), default=0)
+    return [column - shift for column in columns]
@@ -4,6 +4,11 @@ import xml.etree.ElementTree as ET
 import os
 import json
 from modules import config_editor_module
+from modules.mod_files import mod_files
+from modules.xml_cache import document_cache
+from modules.background import background
+from modules.mod_context import mod_context
+from modules.symbol_index import write_text_indexed
 
 PLUGIN_TITLE = "Entities Editor"
 
@@ -28,6 +33,8 @@ class EntitiesEditor(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.tree = None
+        self.xml_path = None  # File the tree was loaded from
+        self.load_job = None  # Background load of the humans file
         self.entities = []
         self.current_entity = None
         self.config = config_editor_module.load_config()
@@ -44,6 +51,22 @@ class EntitiesEditor(tk.Frame):
 
         self.build_ui()
         self.load_xml()
+        mod_context.subscribe(self.rebind, owner=self)
+
+    def rebind(self, mod_path):
+        """Show the entities of another mod in the existing editor"""
+        if self.load_job:
+            self.load_job.cancel()
+        self.config = config_editor_module.load_config()
+        self.tree = None
+        self.xml_path = None
+        self.unit_elem = None
+        self.entities = []
+        self.current_entity = None
+        self.entity_select_combobox['values'] = []
+        self.entity_select_combobox.set('')
+        self.clear_entries()
+        self.load_xml()
 
     def get_mod_path(self):
         """Get the current mod path based on configuration"""
@@ -59,6 +82,15 @@ class EntitiesEditor(tk.Frame):
         if not mod_path:
             return None
             
+        # Use the humans file from the shared mod index if it really holds humans
+        mod_files.set_mod_path(mod_path)
+        indexed_tree = mod_files.get_tree("entities")
+        if indexed_tree is not None:
+            if any(elem.get("type") == "Human" for elem in indexed_tree.iter()):
+                xml_path = mod_files.get_entities_file()
+                log(f"Found human entities in indexed file: {os.path.basename(xml_path)}")
+                return xml_path
+
         # Find all XML files in the entities directory
         entities_dir = os.path.join(mod_path, "entities")
         if not os.path.exists(entities_dir):
@@ -90,18 +122,26 @@ class EntitiesEditor(tk.Frame):
         log("No file found containing human entities")
         return None
 
+    def read_xml(self):
+        """Find and parse the humans file; runs in the background"""
+        xml_path = self.get_xml_path()
+        if not xml_path or not os.path.exists(xml_path):
+            return None, None
+        return xml_path, document_cache.parse(xml_path)
+
     def load_xml(self):
+        self.load_job = background.submit(self.read_xml, owner=self, description="Loading entities",
+                                          on_done=self.on_xml_loaded, on_error=self.on_xml_error)
+
+    def on_xml_loaded(self, result):
         try:
-            xml_path = self.get_xml_path()
-            if not xml_path:
-                messagebox.showinfo("Info", "No human entities file found. Please create one in your mod's entities folder.")
-                return
-                
-            if not os.path.exists(xml_path):
+            xml_path, tree = result
+            if tree is None:
                 messagebox.showinfo("Info", "No human entities file found. Please create one in your mod's entities folder.")
                 return
-                
-            self.tree = ET.parse(xml_path)
+
+            self.xml_path = xml_path
+            self.tree = tree
             self.unit_elem = self.tree.getroot()
             
             self.entities = self.unit_elem.findall('Entity')
@@ -115,8 +155,19 @@ class EntitiesEditor(tk.Frame):
             self.current_entity = self.entities[0]
             self.load_entity(self.current_entity)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load XML: {e}")
-            print(f"XML load error details: {str(e)}")  # For debugging
+            self.on_xml_error(e)
+
+    def on_xml_error(self, e):
+        messagebox.showerror("Error", f"Failed to load XML: {e}")
+        print(f"XML load error details: {str(e)}")  # For debugging
+
+    def write_xml(self, success_message, error_prefix):
+        """Serialize the tree and write it to the loaded file in the background"""
+        data = ET.tostring(self.tree.getroot(), encoding='utf-8', xml_declaration=True).decode('utf-8')
+        background.submit(write_text_indexed, self.xml_path, data, owner=self,
+                          description="Saving entities",
+                          on_done=lambda _: messagebox.showinfo("Success", success_message),
+                          on_error=lambda e: messagebox.showerror("Error", f"{error_prefix}: {e}"))
 
     def build_ui(self):
         top_frame = ttk.Frame(self)
@@ -305,9 +356,7 @@ class EntitiesEditor(tk.Frame):
         if self.current_entity is None:
             return
             
-        # Get the XML path
-        xml_path = self.get_xml_path()
-        if not xml_path:
+        if not self.xml_path:
             messagebox.showerror("Error", "No mod path configured")
             return
             
@@ -366,11 +415,7 @@ class EntitiesEditor(tk.Frame):
             item_elem = ET.SubElement(equipment_elem, 'Item')
             item_elem.set("name", item)
         
-        try:
-            self.tree.write(xml_path, encoding='utf-8', xml_declaration=True)
-            messagebox.showinfo("Success", "XML file updated successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to write XML: {e}")
+        self.write_xml("XML file updated successfully.", "Failed to write XML")
 
     def create_new_entity(self):
         """Create a new entity dialog"""
@@ -633,6 +678,17 @@ class EntitiesEditor(tk.Frame):
         # Add initial RenderObject3D
         add_render_object()
 
+    def clear_entries(self):
+        """Clear all entries"""
+        for entries in [self.entity_attr_entries, self.human_attr_entries, 
+                      self.id_attr_entries, self.fov_attr_entries, 
+                      self.brain_attr_entries, self.move_speed_entries,
+                      self.turn_speed_entries, self.physical_params_entries]:
+            for entry in entries.values():
+                entry.delete(0, tk.END)
+        if self.equipment_entry:
+            self.equipment_entry.delete(0, tk.END)
+
     def delete_current_entity(self):
         """Delete the currently selected entity"""
         if not self.current_entity:
@@ -662,21 +718,11 @@ class EntitiesEditor(tk.Frame):
             else:
                 self.entity_select_combobox.set('')
                 self.current_entity = None
-                # Clear all entries
-                for entries in [self.entity_attr_entries, self.human_attr_entries, 
-                              self.id_attr_entries, self.fov_attr_entries, 
-                              self.brain_attr_entries, self.move_speed_entries,
-                              self.turn_speed_entries, self.physical_params_entries]:
-                    for entry in entries.values():
-                        entry.delete(0, tk.END)
-                if self.equipment_entry:
-                    self.equipment_entry.delete(0, tk.END)
+                self.clear_entries()
             
             # Save changes to file
-            xml_path = self.get_xml_path()
-            if xml_path:
-                self.tree.write(xml_path, encoding='utf-8', xml_declaration=True)
-                messagebox.showinfo("Success", f"Entity '{entity_name}' deleted successfully")
+            if self.xml_path:
+                self.write_xml(f"Entity '{entity_name}' deleted successfully", "Failed to delete entity")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete entity: {str(e)}")
@@ -1,11 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import xml.etree.ElementTree as ET
+import io
 import os
 import json
 from pathlib import Path
 from modules import config_editor_module
 from modding_tool import get_equipment_file, get_unit_file, mod_files
+from modules.xml_cache import document_cache
+from modules.background import background
+from modules.mod_context import mod_context
+from modules.symbol_index import write_text_indexed
+from modules.xml_writer import XmlWriter
 
 PLUGIN_TITLE = "Equipment & Bindings"
 
@@ -34,23 +40,32 @@ class EquipmentBindingEditor(tk.Frame):
         self.binding_widgets = []
         self.config = config_editor_module.load_config()
         self.clipboard = None  # Store copied binding
-        
+        self.load_job = None  # Background load of the bindings file
+        self.init_faction_name()
+            
+        self.binding_sources = {
+            "equipment": {"path": "equipment/binds.xml", "xpath": ".//Bind"}
+        }
+        self.build_ui()
+        self.load_all_bindings()
+        mod_context.subscribe(self.rebind, owner=self)
+
+    def rebind(self, mod_path):
+        """Show the bindings of another mod in the existing editor"""
+        self.config = config_editor_module.load_config()
+        self.init_faction_name()
+        self.load_all_bindings()
+
+    def init_faction_name(self):
         # Get mod path and initialize ModFiles
         mod_path = self.get_mod_path()
         if mod_path:
-            mod_files.mod_path = mod_path
-            mod_files.scan_mod_directory()
+            mod_files.set_mod_path(mod_path)
             self.faction_name = mod_files.get_mod_name()
             log(f"Initialized with faction name: {self.faction_name}")
         else:
             self.faction_name = "FACTION"
             log("No mod path, using default faction name: FACTION")
-            
-        self.binding_sources = {
-            "equipment": {"path": "equipment/binds.xml", "xpath": ".//Bind"}
-        }
-        self.build_ui()
-        self.load_all_bindings()
 
     def get_mod_path(self):
         """Get the current mod path based on configuration"""
@@ -131,76 +146,78 @@ class EquipmentBindingEditor(tk.Frame):
     def get_available_classes(self):
         """Get available classes from the unit file"""
         from modding_tool import mod_files
-        # Only scan if the path has changed
-        if mod_files.mod_path != self.get_mod_path():
-            mod_files.mod_path = self.get_mod_path()
-            mod_files.scan_mod_directory()
-            log("Rescanned mod directory due to path change")
+        # Only scans if the path has changed
+        mod_files.set_mod_path(self.get_mod_path())
         classes = mod_files.get_available_classes()
         log(f"Available classes: {classes}")
         return classes
 
-    def load_xml_file(self, file_path, xpath):
-        """Load XML file and return bindings"""
-        try:
-            mod_path = self.get_mod_path()
-            if not mod_path:
-                messagebox.showerror("Error", "No mod path configured")
-                return []
-            
-            # Get the appropriate XML path based on the source
-            if file_path == "equipment/binds.xml":
-                full_path = get_equipment_file(mod_path)
-            elif file_path == "units/unit.xml":
-                full_path = get_unit_file(mod_path)
-            else:
-                full_path = os.path.normpath(os.path.join(mod_path, file_path))
-            
-            if not full_path or not os.path.exists(full_path):
-                messagebox.showerror("Error", f"File not found: {os.path.basename(file_path)}\nPlease create the file first.")
-                return []
-            
-            tree = ET.parse(full_path)
-            root = tree.getroot()
-            
-            # Find all elements matching the XPath
-            elements = root.findall(xpath)
-            return elements
-            
-        except ET.ParseError as e:
-            messagebox.showerror("XML Error", f"Failed to parse {os.path.basename(file_path)}: {str(e)}")
-            return []
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load {os.path.basename(file_path)}: {str(e)}")
-            return []
+    def read_xml_file(self, file_path):
+        """Resolve and parse a binding source file; runs in the background.
+
+        Returns (file name, tree), with tree None if the file does not exist.
+        """
+        mod_path = self.get_mod_path()
+        if not mod_path:
+            raise ValueError("No mod path configured")
+
+        # Get the appropriate XML path based on the source
+        if file_path == "equipment/binds.xml":
+            full_path = get_equipment_file(mod_path)
+        elif file_path == "units/unit.xml":
+            full_path = get_unit_file(mod_path)
+        else:
+            full_path = os.path.normpath(os.path.join(mod_path, file_path))
+
+        if not full_path or not os.path.exists(full_path):
+            return os.path.basename(file_path), None
+        log(f"Loading equipment tree from: {os.path.basename(full_path)}")
+        return os.path.basename(full_path), document_cache.parse(full_path)
 
     def load_all_bindings(self):
-        """Load all bindings from XML files"""
+        """Load all bindings from XML files in the background and rebuild the views"""
         log("Loading all bindings...")
-        
+        source = self.binding_sources["equipment"]
+        if self.load_job:
+            self.load_job.cancel()
+        self.load_job = background.submit(self.read_xml_file, source["path"], owner=self,
+                                          description="Loading equipment bindings",
+                                          on_done=self.on_bindings_loaded,
+                                          on_error=self.on_bindings_error)
+
+    def on_bindings_error(self, e):
+        source_name = os.path.basename(self.binding_sources["equipment"]["path"])
+        if isinstance(e, ET.ParseError):
+            messagebox.showerror("XML Error", f"Failed to parse {source_name}: {str(e)}")
+        elif isinstance(e, ValueError):
+            messagebox.showerror("Error", str(e))
+        else:
+            messagebox.showerror("Error", f"Failed to load {source_name}: {str(e)}")
+        self.rebuild_bindings(None)
+
+    def on_bindings_loaded(self, result):
+        file_name, tree = result
+        if tree is None:
+            messagebox.showerror("Error", f"File not found: {file_name}\nPlease create the file first.")
+        self.rebuild_bindings(tree)
+
+    def rebuild_bindings(self, tree):
+        """Show the bindings of tree (None if it could not be loaded)"""
         # Store old widget references before clearing
         old_widgets = self.binding_widgets.copy()
         
         self.all_bindings = {}
         self.binding_trees = {}
         self.binding_widgets = []  # Clear widget references
-        
-        # Load bindings from equipment source
-        log("Loading bindings from equipment...")
-        elements = self.load_xml_file(self.binding_sources["equipment"]["path"], 
-                                    self.binding_sources["equipment"]["xpath"])
+
+        # The bindings come from the same tree that add/remove modify
+        elements = []
+        if tree is not None:
+            self.binding_trees["equipment"] = tree
+            elements = tree.getroot().findall(self.binding_sources["equipment"]["xpath"])
         if elements:
             log(f"Found {len(elements)} bindings in equipment")
             self.all_bindings["equipment"] = elements
-            
-            try:
-                file_path = get_equipment_file(self.get_mod_path())
-                if os.path.exists(file_path):
-                    log(f"Loading equipment tree from: {os.path.basename(file_path)}")
-                    tree = ET.parse(file_path)
-                    self.binding_trees["equipment"] = tree
-            except Exception as e:
-                log(f"Warning: Failed to load equipment tree: {e}")
         else:
             log("No bindings found in equipment")
             self.all_bindings["equipment"] = []
@@ -650,48 +667,57 @@ class EquipmentBindingEditor(tk.Frame):
             # Write the XML content
             file_path = os.path.normpath(os.path.join(self.get_mod_path(), self.binding_sources["equipment"]["path"]))
             
-            # Create formatted output
-            output = ['<?xml version="1.0" encoding="utf-8"?>']
-            output.append('<Equipment>')
-            output.append('')
-            
-            # Add faction bindings
-            if faction_bindings:
-                output.append('<!-- Overall faction bindings -->')
-                output.append(f'\t<Bind to="{self.faction_name}">')
-                for eqp in sorted(set(faction_bindings)):  # Use set to remove duplicates
-                    output.append(f'\t\t<eqp name="{eqp}"/>')
-                output.append('\t</Bind>')
-                output.append('')
-
-            # Add class-specific bindings
-            if class_bindings:
-                output.append('<!-- Class-specific bindings -->')
-                for cls in sorted(class_bindings.keys()):
-                    if not cls:  # Skip empty class names
-                        continue
-                    output.append(f'<!-- {cls} equipment -->')
-                    output.append(f'\t<Bind to="{cls}">')
-                    for eqp in sorted(set(class_bindings[cls])):  # Use set to remove duplicates
-                        output.append(f'\t\t<eqp name="{eqp}"/>')
-                    output.append('\t</Bind>')
-                    output.append('')
-
-            output.append('</Equipment>')
-
-            # Write the content
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(output))
-            
-            messagebox.showinfo("Success", "Changes saved successfully")
-            
-            # Reload to show the current bindings
-            self.load_all_bindings()
+            # Write the content in the background, then reload to show the current bindings
+            self.write_bindings(file_path, self.format_bindings(faction_bindings, class_bindings),
+                                "Changes saved successfully",
+                                "Failed to save changes")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save changes: {e}")
             raise  # Re-raise the exception for debugging
 
+    def format_bindings(self, faction_bindings, class_bindings):
+        """Bindings file content: one nested <Bind> for the faction, then one per class"""
+        out = io.StringIO()
+        writer = XmlWriter(out)
+        writer.start("Equipment")
+        writer.blank_line()
+        
+        # Add faction bindings in the nested format
+        faction_equipment = sorted(eqp for eqp in set(faction_bindings) if eqp)
+        if faction_equipment:
+            writer.comment("Overall faction bindings")
+            writer.start("Bind", {"to": self.faction_name})
+            for eqp in faction_equipment:
+                writer.empty("eqp", {"name": eqp})
+            writer.end()
+            writer.blank_line()
+        
+        # Add class-specific bindings in the same nested format
+        classes = [cls for cls in sorted(class_bindings) if cls]  # Skip empty class names
+        if classes:
+            writer.comment("Class-specific bindings")
+            for cls in classes:
+                writer.comment(f"{cls} equipment")
+                writer.start("Bind", {"to": cls})
+                for eqp in sorted(eqp for eqp in set(class_bindings[cls]) if eqp):
+                    writer.empty("eqp", {"name": eqp})
+                writer.end()
+                writer.blank_line()
+        
+        writer.end()
+        return out.getvalue()
+
+    def write_bindings(self, file_path, content, success_message, error_prefix):
+        """Write the bindings file in the background and reload the views"""
+        def on_done(_):
+            self.load_all_bindings()
+            messagebox.showinfo("Success", success_message)
+        background.submit(write_text_indexed, file_path, content,
+                          owner=self, description="Saving equipment bindings",
+                          on_done=on_done,
+                          on_error=lambda e: messagebox.showerror("Error", f"{error_prefix}: {e}"))
+
     def indent_xml(self, elem, level=0):
         """Add proper indentation to XML elements"""
         i = "\n" + level * "\t"
@@ -733,48 +759,11 @@ class EquipmentBindingEditor(tk.Frame):
                         class_bindings[to] = set()
                     class_bindings[to].add(eqp)
 
-            # Create new XML content
-            output = ['<?xml version="1.0" encoding="utf-8"?>']
-            output.append('<Equipment>')
-            output.append('')
-            
-            # Add faction bindings in the nested format
-            if faction_bindings:
-                output.append('<!-- Overall faction bindings -->')
-                output.append(f'\t<Bind to="{self.faction_name}">')
-                for eqp in sorted(faction_bindings):
-                    if eqp:  # Only add non-empty equipment
-                        output.append(f'\t\t<eqp name="{eqp}"/>')
-                output.append('\t</Bind>')
-                output.append('')
-
-            # Add class-specific bindings in the same nested format
-            if class_bindings:
-                output.append('<!-- Class-specific bindings -->')
-                # For each class
-                for cls in sorted(class_bindings.keys()):
-                    if not cls:  # Skip empty class names
-                        continue
-                    # Add comment for this class
-                    output.append(f'<!-- {cls} equipment -->')
-                    output.append(f'\t<Bind to="{cls}">')
-                    # Add all equipment for this class
-                    for eqp in sorted(class_bindings[cls]):
-                        if eqp:  # Only add non-empty equipment
-                            output.append(f'\t\t<eqp name="{eqp}"/>')
-                    output.append('\t</Bind>')
-                    output.append('')  # Add empty line between classes
-
-            output.append('</Equipment>')
-
             # Write the organized content
             file_path = os.path.normpath(os.path.join(self.get_mod_path(), self.binding_sources["equipment"]["path"]))
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(output))
-
-            # Reload the view
-            self.load_all_bindings()
-            messagebox.showinfo("Success", "Bindings organized successfully")
+            self.write_bindings(file_path, self.format_bindings(faction_bindings, class_bindings),
+                                "Bindings organized successfully",
+                                "Failed to organize bindings")
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to organize bindings: {e}")
@@ -0,0 +1,379 @@
+import os
+import json
+import queue
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from modules.persistent_cache import load_pickle, save_pickle
+
+# Define equipment types and remapping from scanner
+EQUIPMENT_TYPES = [
+    "Firearm", "Armor", "Grenade", "Utility",
+    "Shield", "HelmetNVG", "Scope"
+]
+
+TYPE_REMAPPING = {
+    "Lockpick": "Utility",
+    "Crowbar": "Utility",
+    "Tool": "Utility"
+}
+
+INDEX_FILE = "equipment_index.pickle"  # In the data directory
+INDEX_VERSION = 2
+MIN_POOL_FILES = 8  # Fewer changed files than this are parsed on the scan thread
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("equipment_scan", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[EquipmentScan] {message}")
+
+class EquipmentItem:
+    def __init__(self):
+        self.name = ""
+        self.type = ""  # Firearm, Armor, etc.
+        self.category = ""  # pistol, rifle, etc.
+        self.inventory_slot = ""
+        self.source_file = ""
+        self.source_mod = ""  # vanilla or mod name
+        self.bindings = []  # list of classes/units that can use it
+        self.attributes = {}  # other attributes like damage, etc.
+        self.details = {}  # element attributes and child sections, see create_equipment_item
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "type": self.type,
+            "category": self.category,
+            "inventory_slot": self.inventory_slot,
+            "source_file": self.source_file,
+            "source_mod": self.source_mod,
+            "bindings": sorted(self.bindings) if self.bindings else [],
+            "attributes": dict(sorted(self.attributes.items())) if self.attributes else {}
+        }
+
+    def __str__(self):
+        return f"{self.name} ({self.type}) - {self.source_mod}"
+
+def find_equipment_files(game_path):
+    """List the equipment XML files of the game and its mods.
+
+    Returns a list of (file_path, mod_name) work items, vanilla first, and the
+    set of mod names that have an equipment directory.
+    """
+    work_items = []
+    mods = {"vanilla"}
+
+    equipment_path = os.path.join(game_path, "data", "equipment")
+    if os.path.exists(equipment_path):
+        work_items.extend(_walk_xml_files(equipment_path, "vanilla"))
+
+    mods_path = os.path.join(game_path, "mods")
+    if os.path.exists(mods_path):
+        for mod in os.listdir(mods_path):
+            mod_equipment_path = os.path.join(mods_path, mod, "equipment")
+            if os.path.exists(mod_equipment_path):
+                work_items.extend(_walk_xml_files(mod_equipment_path, mod))
+                mods.add(mod)
+
+    return work_items, mods
+
+def _walk_xml_files(directory, mod_name):
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith('.xml'):
+                yield os.path.join(root, file), mod_name
+
+def iterparse_equipment(file_path):
+    """Stream the elements of an equipment file without building the whole tree.
+
+    Yields ("bind", elem) for every <Bind> element and ("child", elem) for
+    every other top-level element once it has been read completely. Handled
+    top-level elements are dropped from the tree when the consumer asks for
+    the next one, so memory stays flat however large the file is. Files
+    whose root element is not <Equipment> stop after the first start tag and
+    yield nothing. Raises ET.ParseError for malformed files.
+    """
+    root = None
+    depth = 0
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                if elem.tag != "Equipment":
+                    return
+                root = elem
+            depth += 1
+            continue
+
+        depth -= 1
+        if elem.tag == "Bind":
+            yield "bind", elem
+        elif depth == 1:
+            yield "child", elem
+        if depth == 1:
+            # The element and everything in it has been handled
+            root.clear()
+
+def parse_equipment_file(file_path, mod_name):
+    """Parse one equipment file and return its EquipmentItems.
+
+    Runs in the worker processes, so it only touches the file system and
+    returns an empty list for files that are not equipment definitions.
+    """
+    bindings = {}
+    items = []
+    try:
+        for kind, elem in iterparse_equipment(file_path):
+            if kind == "bind":
+                process_binding(elem, bindings)
+            elif elem.tag in EQUIPMENT_TYPES or elem.tag in TYPE_REMAPPING:
+                items.append(create_equipment_item(elem, file_path, mod_name))
+    except (OSError, ET.ParseError):
+        return []
+
+    # Bindings may come after the items they refer to
+    for item in items:
+        if item.name in bindings:
+            item.bindings = list(bindings[item.name])
+    return items
+
+def process_binding(bind_elem, bindings):
+    """Process a binding element"""
+    # Format 1: <Bind eqp="X" to="Y"/>
+    eqp = bind_elem.get("eqp")
+    to = bind_elem.get("to")
+
+    if eqp and to:
+        if eqp not in bindings:
+            bindings[eqp] = set()
+        bindings[eqp].add(to)
+        return
+
+    # Format 2: <Bind eqp="X"><to name="Y"/></Bind>
+    if eqp:
+        for to_elem in bind_elem.findall("to"):
+            to = to_elem.get("name")
+            if to:
+                if eqp not in bindings:
+                    bindings[eqp] = set()
+                bindings[eqp].add(to)
+        return
+
+    # Format 3: <Bind to="Y"><eqp name="X"/></Bind>
+    if to:
+        for eqp_elem in bind_elem.findall("eqp"):
+            eqp = eqp_elem.get("name")
+            if eqp:
+                if eqp not in bindings:
+                    bindings[eqp] = set()
+                bindings[eqp].add(to)
+
+def create_equipment_item(elem, file_path, mod_name):
+    """Create an EquipmentItem from an XML element"""
+    item = EquipmentItem()
+    item.name = elem.get("name", "")
+
+    # Apply type remapping if needed
+    original_type = elem.tag
+    item.type = TYPE_REMAPPING.get(original_type, original_type)
+
+    item.category = elem.get("category", "")
+    item.inventory_slot = elem.get("inventoryBinding", "")
+    item.source_file = file_path
+    item.source_mod = mod_name
+
+    # Extract additional attributes
+    params_elem = elem.find("Params")
+    if params_elem is not None:
+        item.attributes = {key: value for key, value in params_elem.attrib.items()}
+
+    # Keep what the details window shows so it never has to re-read the file
+    item.details = {
+        "attributes": {key: value for key, value in elem.attrib.items() if key != "name"},
+        "sections": {}
+    }
+    for child in elem:
+        if child.attrib and child.tag not in item.details["sections"]:
+            item.details["sections"][child.tag] = dict(child.attrib)
+
+    return item
+
+class EquipmentIndex:
+    """Persistent index of the items found in each equipment file.
+
+    Every file is recorded with the mtime and size it had when it was parsed
+    and the items it contributed, with the bindings from the same file
+    already applied. A rescan only has to re-parse files whose stat changed;
+    files that disappeared are pruned. The index is pickled to cache_file in
+    the data directory.
+    """
+    def __init__(self, cache_file=INDEX_FILE):
+        self.cache_file = cache_file
+        self.files = {}  # file path -> (mtime_ns, size, mod_name, items)
+        self.lock = threading.Lock()  # Held by the scan that is updating the index
+        self._loaded = False
+        self._dirty = False
+
+    def lookup(self, file_path, mod_name, stat):
+        """Return the indexed items for an unchanged file, or None"""
+        entry = self.files.get(file_path)
+        if entry is None:
+            return None
+        mtime_ns, size, indexed_mod, items = entry
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size or indexed_mod != mod_name:
+            return None
+        return items
+
+    def update(self, file_path, mod_name, stat, items):
+        self.files[file_path] = (stat.st_mtime_ns, stat.st_size, mod_name, items)
+        self._dirty = True
+
+    def prune(self, file_paths):
+        """Forget files that are not in file_paths any more"""
+        removed = [path for path in self.files if path not in file_paths]
+        for path in removed:
+            del self.files[path]
+        if removed:
+            self._dirty = True
+        return removed
+
+    def load(self):
+        """Read the persisted index from disk once per session"""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = load_pickle(self.cache_file, INDEX_VERSION)
+        if data is not None:
+            self.files = data.get("files", {})
+            log(f"Loaded equipment index with {len(self.files)} files")
+
+    def save(self):
+        """Write the index to disk if it changed"""
+        if self._dirty and save_pickle(self.cache_file, INDEX_VERSION, {"files": self.files}):
+            self._dirty = False
+            log(f"Saved equipment index with {len(self.files)} files")
+
+# Global instance shared by all scans
+equipment_index = EquipmentIndex()
+
+class EquipmentScan:
+    """Scan the equipment files of a game directory in the background.
+
+    A background thread lists the files, takes unchanged ones from the
+    equipment index and hands the rest to a process pool. Results are put on
+    a queue: first ("start", total, mods), then one ("batch", index, items)
+    per file, where index is the position of the file in the listing, and
+    finally a single ("done", cancelled) or ("error", message). The Tk side
+    reads them with poll() from an after() callback, so nothing is parsed on
+    the Tk thread.
+    """
+    def __init__(self, game_path, index=None, max_workers=None):
+        self.game_path = game_path
+        self.index = equipment_index if index is None else index
+        self.max_workers = max_workers
+        self.total = 0
+        self.parsed = 0
+        self.messages = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="EquipmentScan", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Ask the scan to stop. Files already being parsed are still finished."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def poll(self):
+        """Return all messages that arrived since the last call"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def _run(self):
+        # Only one scan may update the index at a time
+        with self.index.lock:
+            try:
+                self.index.load()
+                self._scan()
+            except Exception as e:
+                self.messages.put(("error", str(e)))
+                return
+            finally:
+                self.index.save()
+        log(f"Parsed {self.parsed} of {self.total} files")
+        self.messages.put(("done", self.cancelled))
+
+    def _scan(self):
+        work_items, mods = find_equipment_files(self.game_path)
+        self.total = len(work_items)
+        self.messages.put(("start", self.total, mods))
+        self.index.prune({file_path for file_path, _ in work_items})
+
+        # Unchanged files come straight from the index
+        changed = []
+        for index, (file_path, mod_name) in enumerate(work_items):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                self.messages.put(("batch", index, []))
+                continue
+            items = self.index.lookup(file_path, mod_name, stat)
+            if items is None:
+                changed.append((index, file_path, mod_name, stat))
+            else:
+                self.messages.put(("batch", index, items))
+
+        if not changed or self.cancelled:
+            return
+
+        # Starting worker processes costs more than parsing a few files
+        if len(changed) < MIN_POOL_FILES:
+            for index, file_path, mod_name, stat in changed:
+                if self.cancelled:
+                    return
+                self._store(index, file_path, mod_name, stat, parse_equipment_file(file_path, mod_name))
+            return
+
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {
+                executor.submit(parse_equipment_file, file_path, mod_name): (index, file_path, mod_name, stat)
+                for index, file_path, mod_name, stat in changed
+            }
+            for future in as_completed(futures):
+                if self.cancelled:
+                    break
+                index, file_path, mod_name, stat = futures[future]
+                try:
+                    items = future.result()
+                except Exception as e:
+                    log(f"Failed to scan {file_path}: {e}")
+                    items = []
+                self._store(index, file_path, mod_name, stat, items)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _store(self, index, file_path, mod_name, stat, items):
+        self.parsed += 1
+        self.index.update(file_path, mod_name, stat, items)
+        self.messages.put(("batch", index, items))
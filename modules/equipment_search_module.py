@@ -1,34 +1,18 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
-import xml.etree.ElementTree as ET
 import json
 from modules import config_editor_module
+from modules.mod_context import mod_context
+from modules.equipment_scan import EQUIPMENT_TYPES, EquipmentScan
+from modules.search_index import SearchIndex
+from modules.virtual_treeview import VirtualTreeview
+import threading
 
 PLUGIN_TITLE = "Equipment Search"
 
-# Define equipment types and remapping from scanner
-EQUIPMENT_TYPES = [
-    "Firearm", "Armor", "Grenade", "Utility",
-    "Shield", "HelmetNVG", "Scope"
-]
-
-TYPE_REMAPPING = {
-    "Lockpick": "Utility",
-    "Crowbar": "Utility",
-    "Tool": "Utility"
-}
-
-class EquipmentItem:
-    def __init__(self):
-        self.name = ""
-        self.type = ""  # Firearm, Armor, etc.
-        self.category = ""  # pistol, rifle, etc.
-        self.inventory_slot = ""
-        self.source_file = ""
-        self.source_mod = ""  # vanilla or mod name
-        self.bindings = []  # list of classes/units that can use it
-        self.attributes = {}  # other attributes like damage, etc.
+SEARCH_DELAY_MS = 150  # Wait this long after the last keystroke before searching
+RESULT_COLUMNS = ("Name", "Type", "Category", "Slot", "Mod", "Bindings")
 
 class EquipmentSearch(ttk.Frame):
     def __init__(self, parent):
@@ -36,14 +20,35 @@ class EquipmentSearch(ttk.Frame):
         self.config = config_editor_module.load_config()
         self.equipment_items = []
         self.current_filters = {}
+        self.scan = None
+        self.poll_job = None  # Pending after() of poll_scan
+        self.scan_results = {}  # work item index -> items, used to restore file order
+        self.search_index = None
+        self.search_job = None
+        self.sort_column = None
+        self.row_values = []  # Column values of every indexed item, by item id
+        self.sort_keys = {}  # column -> sort key of every indexed item, built on first use
+        self.results = []  # Item ids of the current results, in display order
         
         # Create main layout frames
         self.create_search_frame()
+        self.create_progress_frame()
         self.create_filters_frame()
         self.create_results_frame()
         
+        # Stop a running scan when the tab is destroyed (e.g. on plugin reload)
+        self.bind('<Destroy>', self.on_destroy)
+        
         # Initial scan of equipment
         self.scan_equipment()
+        mod_context.subscribe(self.rebind, owner=self)
+
+    def rebind(self, mod_path):
+        """The scan covers every mod of the game, so only a new game path needs a rescan"""
+        game_path = self.config.get("game_path", "")
+        self.config = config_editor_module.load_config()
+        if self.config.get("game_path", "") != game_path:
+            self.scan_equipment()
 
     def create_search_frame(self):
         """Create the search bar and button"""
@@ -59,8 +64,25 @@ class EquipmentSearch(ttk.Frame):
         self.search_btn = ttk.Button(search_frame, text="Search", command=self.perform_search)
         self.search_btn.pack(side="left", padx=5, pady=5)
         
-        # Bind Enter key to search
+        # Bind Enter key to search, and search as you type once typing pauses
         self.search_entry.bind('<Return>', lambda e: self.perform_search())
+        self.search_entry.bind('<KeyRelease>', self.schedule_search)
+
+    def create_progress_frame(self):
+        """Create the scan progress bar and cancel/rescan button"""
+        progress_frame = ttk.Frame(self)
+        progress_frame.pack(fill="x", padx=5, pady=2)
+        
+        self.progress_var = tk.DoubleVar(value=0)
+        self.progress_bar = ttk.Progressbar(progress_frame, variable=self.progress_var,
+                                            mode="determinate")
+        self.progress_bar.pack(side="left", fill="x", expand=True, padx=5)
+        
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(progress_frame, textvariable=self.status_var, width=30).pack(side="left", padx=5)
+        
+        self.scan_btn = ttk.Button(progress_frame, text="Rescan", command=self.toggle_scan)
+        self.scan_btn.pack(side="left", padx=5)
 
     def create_filters_frame(self):
         """Create the filters section"""
@@ -135,22 +157,14 @@ class EquipmentSearch(ttk.Frame):
         results_frame = ttk.LabelFrame(self, text="Results")
         results_frame.pack(fill="both", expand=True, padx=5, pady=5)
         
-        # Create treeview with scrollbars
-        self.tree = ttk.Treeview(results_frame, columns=("Name", "Type", "Category", "Slot", "Mod", "Bindings"),
-                                show="headings")
-        
-        # Configure scrollbars
-        vsb = ttk.Scrollbar(results_frame, orient="vertical", command=self.tree.yview)
-        hsb = ttk.Scrollbar(results_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        # Create the results table; only the visible rows exist in Tk
+        self.tree = VirtualTreeview(results_frame, RESULT_COLUMNS,
+                                    lambda row: self.row_values[self.results[row]])
+        self.tree.pack(fill="both", expand=True)
         
         # Configure columns
-        self.tree.heading("Name", text="Name", command=lambda: self.sort_treeview("Name"))
-        self.tree.heading("Type", text="Type", command=lambda: self.sort_treeview("Type"))
-        self.tree.heading("Category", text="Category", command=lambda: self.sort_treeview("Category"))
-        self.tree.heading("Slot", text="Slot", command=lambda: self.sort_treeview("Slot"))
-        self.tree.heading("Mod", text="Mod", command=lambda: self.sort_treeview("Mod"))
-        self.tree.heading("Bindings", text="Bindings", command=lambda: self.sort_treeview("Bindings"))
+        for column in RESULT_COLUMNS:
+            self.tree.heading(column, text=column, command=lambda c=column: self.sort_treeview(c))
         
         # Set column widths
         self.tree.column("Name", width=150)
@@ -160,147 +174,145 @@ class EquipmentSearch(ttk.Frame):
         self.tree.column("Mod", width=100)
         self.tree.column("Bindings", width=200)
         
-        # Grid layout
-        self.tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
-        hsb.grid(row=1, column=0, sticky="ew")
-        
-        # Configure grid weights
-        results_frame.grid_rowconfigure(0, weight=1)
-        results_frame.grid_columnconfigure(0, weight=1)
-        
         # Bind double-click event
-        self.tree.bind('<Double-1>', self.show_item_details)
+        self.tree.bind_rows('<Double-1>', self.show_item_details)
 
     def scan_equipment(self):
-        """Scan equipment files from the game directory"""
+        """Scan equipment files from the game directory in the background.
+
+        Files that did not change since the last scan are taken from the
+        equipment index, so only added or modified files are parsed again.
+        """
         game_path = self.config.get("game_path", "")
         if not game_path or not os.path.exists(game_path):
             messagebox.showerror("Error", "Game path not configured or invalid")
             return
-            
-        equipment_path = os.path.join(game_path, "data", "equipment")
-        mods_path = os.path.join(game_path, "mods")
-        
-        # Reset equipment items
-        self.equipment_items = []
-        
-        # Track unique values for filters
-        mods = {"vanilla"}
         
-        # Scan vanilla equipment
-        if os.path.exists(equipment_path):
-            self.scan_directory(equipment_path, "vanilla")
+        # The old scan's poll loop must not read the new scan's messages
+        self.cancel_scan()
+        self.stop_polling()
+        self.scan_results = {}
         
-        # Scan mod equipment
-        if os.path.exists(mods_path):
-            for mod in os.listdir(mods_path):
-                mod_equipment_path = os.path.join(mods_path, mod, "equipment")
-                if os.path.exists(mod_equipment_path):
-                    self.scan_directory(mod_equipment_path, mod)
-                    mods.add(mod)
+        self.progress_var.set(0)
+        self.status_var.set("Scanning...")
+        self.scan_btn.configure(text="Cancel")
         
-        # Update filter sections
-        self.update_filter_values("Mod", mods)
-        
-        # Perform initial search
-        self.perform_search()
-
-    def scan_directory(self, directory, mod_name):
-        """Scan a directory for equipment files"""
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.xml'):
-                    try:
-                        file_path = os.path.join(root, file)
-                        tree = ET.parse(file_path)
-                        root_elem = tree.getroot()
-                        
-                        if root_elem.tag == "Equipment":
-                            self.process_equipment_file(root_elem, file_path, mod_name)
-                    except ET.ParseError:
-                        continue
-
-    def process_equipment_file(self, root_elem, file_path, mod_name):
-        """Process an equipment XML file"""
-        # Process bindings first
-        bindings = {}
-        for bind in root_elem.findall(".//Bind"):
-            self.process_binding(bind, bindings)
-        
-        # Process equipment items
-        for elem in root_elem:
-            if elem.tag == "Ammo":
-                continue
-                
-            if elem.tag in EQUIPMENT_TYPES or elem.tag in TYPE_REMAPPING:
-                item = self.create_equipment_item(elem, file_path, mod_name)
-                if item:
-                    # Apply bindings
-                    if item.name in bindings:
-                        item.bindings = list(bindings[item.name])
-                    self.equipment_items.append(item)
+        self.scan = EquipmentScan(game_path)
+        self.scan.start()
+        self.poll_job = self.after(50, self.poll_scan)
 
-    def process_binding(self, bind_elem, bindings):
-        """Process a binding element"""
-        # Format 1: <Bind eqp="X" to="Y"/>
-        eqp = bind_elem.get("eqp")
-        to = bind_elem.get("to")
-        
-        if eqp and to:
-            if eqp not in bindings:
-                bindings[eqp] = set()
-            bindings[eqp].add(to)
+    def poll_scan(self):
+        """Merge finished batches from the running scan into the item list"""
+        self.poll_job = None
+        scan = self.scan
+        if scan is None:
             return
         
-        # Format 2: <Bind eqp="X"><to name="Y"/></Bind>
-        if eqp:
-            for to_elem in bind_elem.findall("to"):
-                to = to_elem.get("name")
-                if to:
-                    if eqp not in bindings:
-                        bindings[eqp] = set()
-                    bindings[eqp].add(to)
+        finished = None
+        complete = False
+        for message in scan.poll():
+            kind = message[0]
+            if kind == "start":
+                _, total, mods = message
+                self.progress_bar.configure(maximum=max(total, 1))
+                self.update_filter_values("Mod", mods)
+            elif kind == "batch":
+                _, index, items = message
+                self.scan_results[index] = items
+            elif kind == "done":
+                finished = "Scan cancelled" if message[1] else "Scan complete"
+                complete = not message[1]
+            elif kind == "error":
+                finished = "Scan failed"
+                messagebox.showerror("Error", f"Failed to scan equipment: {message[1]}")
+        
+        self.progress_var.set(len(self.scan_results))
+        
+        if finished is None:
+            self.status_var.set(f"Scanned {len(self.scan_results)}/{scan.total} files")
+            self.poll_job = self.after(50, self.poll_scan)
             return
         
-        # Format 3: <Bind to="Y"><eqp name="X"/></Bind>
-        if to:
-            for eqp_elem in bind_elem.findall("eqp"):
-                eqp = eqp_elem.get("name")
-                if eqp:
-                    if eqp not in bindings:
-                        bindings[eqp] = set()
-                    bindings[eqp].add(to)
+        # Splice the per-file results together in file order so the list does
+        # not depend on worker timing; a cancelled scan keeps the old list
+        if complete:
+            self.equipment_items = [item for index in sorted(self.scan_results)
+                                    for item in self.scan_results[index]]
+        self.scan_results = {}
+        self.scan = None
+        self.status_var.set(f"{finished}: {len(self.equipment_items)} items")
+        self.scan_btn.configure(text="Rescan")
+        
+        if complete or self.search_index is None:
+            self.build_search_index()
+
+    def build_search_index(self):
+        """Index the equipment items on a background thread, then search"""
+        items = self.equipment_items
+        result = {}
+        
+        def build():
+            result["rows"] = [self.get_row_values(item) for item in items]
+            result["index"] = SearchIndex(items)
+        
+        thread = threading.Thread(target=build, name="EquipmentSearchIndex", daemon=True)
+        thread.start()
+        
+        def check():
+            if not self.winfo_exists():
+                return
+            if thread.is_alive():
+                self.after(50, check)
+                return
+            # Ignore an index built for a list that was replaced meanwhile
+            if items is not self.equipment_items or "index" not in result:
+                return
+            self.search_index = result["index"]
+            self.row_values = result["rows"]
+            self.sort_keys = {}
+            self.perform_search()
+        
+        self.after(50, check)
+
+    def cancel_scan(self):
+        """Stop the running scan, if any"""
+        if self.scan is not None:
+            self.scan.cancel()
 
-    def create_equipment_item(self, elem, file_path, mod_name):
-        """Create an EquipmentItem from an XML element"""
-        item = EquipmentItem()
-        item.name = elem.get("name", "")
-        
-        # Apply type remapping if needed
-        original_type = elem.tag
-        item.type = TYPE_REMAPPING.get(original_type, original_type)
-        
-        item.category = elem.get("category", "")
-        item.inventory_slot = elem.get("inventoryBinding", "")
-        item.source_file = file_path
-        item.source_mod = mod_name
-        
-        # Extract additional attributes
-        params_elem = elem.find("Params")
-        if params_elem is not None:
-            item.attributes = {key: value for key, value in params_elem.attrib.items()}
-        
-        return item
+    def stop_polling(self):
+        """Drop the pending poll of a scan that is being replaced"""
+        if self.poll_job is not None:
+            self.after_cancel(self.poll_job)
+            self.poll_job = None
+
+    def toggle_scan(self):
+        """Cancel the running scan or start a new one"""
+        if self.scan is not None:
+            self.cancel_scan()
+        else:
+            self.scan_equipment()
+
+    def on_destroy(self, event):
+        if event.widget is self:
+            self.cancel_scan()
+            self.stop_polling()
+            self.scan = None
+
+    def schedule_search(self, event=None):
+        """Search once the user stops typing for a moment"""
+        if event is not None and event.keysym == "Return":
+            return
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DELAY_MS, self.perform_search)
 
     def perform_search(self, event=None):
         """Perform the search with current filters"""
-        # Clear current results
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Get search text
-        search_text = self.search_var.get().lower()
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+            self.search_job = None
+        if self.search_index is None:
+            return
         
         # Get active filters
         active_filters = {
@@ -308,174 +320,129 @@ class EquipmentSearch(ttk.Frame):
             'Mod': [k for k, v in self.current_filters['Mod']['vars'].items() if v.get()]
         }
         
-        # Filter and display items
-        for item in self.equipment_items:
-            # Check if item matches filters
-            if item.type not in active_filters['Type']:
-                continue
-            if item.source_mod not in active_filters['Mod']:
-                continue
-            
-            # Check if item matches search text
-            if search_text and search_text not in item.name.lower():
-                continue
-            
-            # Add item to treeview
-            self.tree.insert("", "end", values=(
-                item.name,
-                item.type,
-                item.category or "",
-                item.inventory_slot or "",
-                item.source_mod,
-                ", ".join(item.bindings) if item.bindings else ""
-            ))
+        self.results = self.search_index.search(self.search_var.get(), active_filters)
+        if self.sort_column is not None:
+            self.results.sort(key=self.get_sort_keys(self.sort_column).__getitem__)
+        self.tree.set_row_count(len(self.results))
+
+    def get_row_values(self, item):
+        """Values shown in the results table for an item"""
+        return (
+            item.name,
+            item.type,
+            item.category or "",
+            item.inventory_slot or "",
+            item.source_mod,
+            ", ".join(item.bindings) if item.bindings else ""
+        )
+
+    def get_sort_keys(self, col):
+        """Sort key of every indexed item for a column, computed once per index"""
+        keys = self.sort_keys.get(col)
+        if keys is None:
+            position = RESULT_COLUMNS.index(col)
+            keys = self.sort_keys[col] = [values[position].lower() for values in self.row_values]
+        return keys
 
     def sort_treeview(self, col):
-        """Sort treeview by column"""
-        # Get all items
-        items = [(self.tree.set(item, col), item) for item in self.tree.get_children("")]
-        
-        # Sort items
-        items.sort()
-        
-        # Rearrange items in sorted positions
-        for index, (_, item) in enumerate(items):
-            self.tree.move(item, "", index)
+        """Sort the results by column"""
+        self.sort_column = col
+        self.results.sort(key=self.get_sort_keys(col).__getitem__)
+        self.tree.set_row_count(len(self.results), keep_position=True)
 
-    def show_item_details(self, event):
+    def show_item_details(self, event, row):
         """Show detailed information about the selected item"""
-        selection = self.tree.selection()
-        if not selection:
-            return
+        # The row maps straight to the item, whose details were read during the scan
+        item = self.search_index.items[self.results[row]]
+        sections = item.details.get("sections", {})
+        
+        # Create details window
+        details = tk.Toplevel(self)
+        details.title(f"Equipment Details - {item.name}")
+        details.geometry("800x600")
+        
+        # Create text widget with scrollbar
+        frame = ttk.Frame(details)
+        frame.pack(fill="both", expand=True)
+        
+        text = tk.Text(frame, wrap="word", padx=10, pady=10)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        
+        text.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Insert basic details with formatting
+        text.tag_configure("header", font=("TkDefaultFont", 10, "bold"))
+        text.tag_configure("subheader", font=("TkDefaultFont", 9, "bold"))
+        text.tag_configure("value", font=("TkDefaultFont", 9))
+        
+        # Basic Info Section
+        text.insert("end", "Basic Information\n", "header")
+        text.insert("end", "-" * 50 + "\n")
+        text.insert("end", f"Name: {item.name}\n", "value")
+        text.insert("end", f"Type: {item.type}\n", "value")
+        text.insert("end", f"Category: {item.category}\n", "value")
+        text.insert("end", f"Inventory Slot: {item.inventory_slot}\n", "value")
+        text.insert("end", f"Source Mod: {item.source_mod}\n", "value")
+        text.insert("end", "\n")
+        
+        if item.details:
+            # Stats Section
+            text.insert("end", "Equipment Stats\n", "header")
+            text.insert("end", "-" * 50 + "\n")
             
-        # Get selected item values
-        values = self.tree.item(selection[0])['values']
-        name = values[0]
-        
-        # Find the corresponding equipment item
-        for item in self.equipment_items:
-            if item.name == name:
-                # Create details window
-                details = tk.Toplevel(self)
-                details.title(f"Equipment Details - {name}")
-                details.geometry("800x600")
-                
-                # Create text widget with scrollbar
-                frame = ttk.Frame(details)
-                frame.pack(fill="both", expand=True)
-                
-                text = tk.Text(frame, wrap="word", padx=10, pady=10)
-                scrollbar = ttk.Scrollbar(frame, orient="vertical", command=text.yview)
-                text.configure(yscrollcommand=scrollbar.set)
-                
-                text.pack(side="left", fill="both", expand=True)
-                scrollbar.pack(side="right", fill="y")
-                
-                # Insert basic details with formatting
-                text.tag_configure("header", font=("TkDefaultFont", 10, "bold"))
-                text.tag_configure("subheader", font=("TkDefaultFont", 9, "bold"))
-                text.tag_configure("value", font=("TkDefaultFont", 9))
-                
-                # Basic Info Section
-                text.insert("end", "Basic Information\n", "header")
-                text.insert("end", "-" * 50 + "\n")
-                text.insert("end", f"Name: {item.name}\n", "value")
-                text.insert("end", f"Type: {item.type}\n", "value")
-                text.insert("end", f"Category: {item.category}\n", "value")
-                text.insert("end", f"Inventory Slot: {item.inventory_slot}\n", "value")
-                text.insert("end", f"Source Mod: {item.source_mod}\n", "value")
-                text.insert("end", "\n")
-                
-                # Try to parse the source XML for detailed stats
-                try:
-                    tree = ET.parse(item.source_file)
-                    root = tree.getroot()
-                    
-                    # Find the equipment element
-                    for elem in root.findall(f".//{item.type}[@name='{item.name}']"):
-                        # Stats Section
-                        text.insert("end", "Equipment Stats\n", "header")
-                        text.insert("end", "-" * 50 + "\n")
-                        
-                        # Direct attributes
-                        for key, value in elem.attrib.items():
-                            if key != "name":  # Skip name as it's already shown
-                                text.insert("end", f"{key}: {value}\n", "value")
-                        
-                        # Parameters section
-                        params = elem.find("Params")
-                        if params is not None:
-                            text.insert("end", "\nParameters\n", "subheader")
-                            text.insert("end", "-" * 25 + "\n")
-                            for key, value in sorted(params.attrib.items()):
-                                text.insert("end", f"{key}: {value}\n", "value")
-                        
-                        # Ammo section
-                        ammo = elem.find("Ammo")
-                        if ammo is not None:
-                            text.insert("end", "\nAmmo Information\n", "subheader")
-                            text.insert("end", "-" * 25 + "\n")
-                            for key, value in sorted(ammo.attrib.items()):
-                                text.insert("end", f"{key}: {value}\n", "value")
-                        
-                        # Firing section
-                        firing = elem.find("Firing")
-                        if firing is not None:
-                            text.insert("end", "\nFiring Characteristics\n", "subheader")
-                            text.insert("end", "-" * 25 + "\n")
-                            for key, value in sorted(firing.attrib.items()):
-                                text.insert("end", f"{key}: {value}\n", "value")
-                        
-                        # Protection section (for armor)
-                        protection = elem.find("Protection")
-                        if protection is not None:
-                            text.insert("end", "\nProtection Stats\n", "subheader")
-                            text.insert("end", "-" * 25 + "\n")
-                            for key, value in sorted(protection.attrib.items()):
-                                text.insert("end", f"{key}: {value}\n", "value")
-                                
-                        # NVG section (for HelmetNVG)
-                        if item.type == "HelmetNVG":
-                            text.insert("end", "\nNVG Characteristics\n", "subheader")
-                            text.insert("end", "-" * 25 + "\n")
-                            
-                            # Get mobility modifiers
-                            mobility = elem.find("MobilityModifiers")
-                            if mobility is not None:
-                                text.insert("end", "Mobility Modifiers:\n", "value")
-                                text.insert("end", f"  Move Speed: {mobility.get('moveSpeedModifierPercent', 'N/A')}%\n", "value")
-                                text.insert("end", f"  Turn Speed: {mobility.get('turnSpeedModifierPercent', 'N/A')}%\n", "value")
-                                text.insert("end", "\n", "value")
-                            
-                            # Get FOV parameters from ModifiableParams
-                            modifiable_params = elem.find("ModifiableParams")
-                            if modifiable_params is not None:
-                                text.insert("end", "FOV Parameters:\n", "value")
-                                text.insert("end", f"  FOV Degrees: {modifiable_params.get('fovDegrees', 'N/A')}\n", "value")
-                                text.insert("end", f"  FOV Radius (meters): {modifiable_params.get('fovRadiusMeters', 'N/A')}\n", "value")
-                                text.insert("end", f"  FOV Range (meters): {modifiable_params.get('fovRangeMeters', 'N/A')}\n", "value")
-                            
-                except Exception as e:
-                    text.insert("end", f"\nError loading detailed stats: {str(e)}\n", "value")
-                
-                # Bindings Section
-                if item.bindings:
-                    text.insert("end", "\nUnit/Class Bindings\n", "header")
-                    text.insert("end", "-" * 50 + "\n")
-                    for binding in sorted(item.bindings):
-                        text.insert("end", f"- {binding}\n", "value")
+            # Direct attributes
+            for key, value in item.details.get("attributes", {}).items():
+                text.insert("end", f"{key}: {value}\n", "value")
+            
+            # Parameters, ammo, firing and protection (for armor) sections
+            for tag, title in (("Params", "Parameters"), ("Ammo", "Ammo Information"),
+                               ("Firing", "Firing Characteristics"), ("Protection", "Protection Stats")):
+                if tag in sections:
+                    text.insert("end", f"\n{title}\n", "subheader")
+                    text.insert("end", "-" * 25 + "\n")
+                    for key, value in sorted(sections[tag].items()):
+                        text.insert("end", f"{key}: {value}\n", "value")
+            
+            # NVG section (for HelmetNVG)
+            if item.type == "HelmetNVG":
+                text.insert("end", "\nNVG Characteristics\n", "subheader")
+                text.insert("end", "-" * 25 + "\n")
                 
-                # Make text widget read-only
-                text.configure(state="disabled")
+                # Get mobility modifiers
+                mobility = sections.get("MobilityModifiers")
+                if mobility is not None:
+                    text.insert("end", "Mobility Modifiers:\n", "value")
+                    text.insert("end", f"  Move Speed: {mobility.get('moveSpeedModifierPercent', 'N/A')}%\n", "value")
+                    text.insert("end", f"  Turn Speed: {mobility.get('turnSpeedModifierPercent', 'N/A')}%\n", "value")
+                    text.insert("end", "\n", "value")
                 
-                # Center the window
-                details.update_idletasks()
-                width = details.winfo_width()
-                height = details.winfo_height()
-                x = (details.winfo_screenwidth() // 2) - (width // 2)
-                y = (details.winfo_screenheight() // 2) - (height // 2)
-                details.geometry(f'+{x}+{y}')
-                break
+                # Get FOV parameters from ModifiableParams
+                modifiable_params = sections.get("ModifiableParams")
+                if modifiable_params is not None:
+                    text.insert("end", "FOV Parameters:\n", "value")
+                    text.insert("end", f"  FOV Degrees: {modifiable_params.get('fovDegrees', 'N/A')}\n", "value")
+                    text.insert("end", f"  FOV Radius (meters): {modifiable_params.get('fovRadiusMeters', 'N/A')}\n", "value")
+                    text.insert("end", f"  FOV Range (meters): {modifiable_params.get('fovRangeMeters', 'N/A')}\n", "value")
+        
+        # Bindings Section
+        if item.bindings:
+            text.insert("end", "\nUnit/Class Bindings\n", "header")
+            text.insert("end", "-" * 50 + "\n")
+            for binding in sorted(item.bindings):
+                text.insert("end", f"- {binding}\n", "value")
+        
+        # Make text widget read-only
+        text.configure(state="disabled")
+        
+        # Center the window
+        details.update_idletasks()
+        width = details.winfo_width()
+        height = details.winfo_height()
+        x = (details.winfo_screenwidth() // 2) - (width // 2)
+        y = (details.winfo_screenheight() // 2) - (height // 2)
+        details.geometry(f'+{x}+{y}')
 
 def get_plugin_tab(notebook):
     """Create and return the equipment search tab"""
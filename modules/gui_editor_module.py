@@ -6,6 +6,8 @@ import shutil
 import json
 # Use relative imports when inside a package
 from . import config_editor_module, mod_files
+from .xml_cache import document_cache
+from .mod_context import mod_context
 from modding_tool import get_gui_file
 
 PLUGIN_TITLE = "GUI Editor"
@@ -305,7 +307,8 @@ class GUIEditor(tk.Frame):
         self.selected_box = None
         self.available_classes = []  # Store available classes from XML
         self.config = config_editor_module.load_config()
-        self.mod_files = mod_files.ModFiles(self.get_mod_path())  # Initialize ModFiles
+        self.mod_files = mod_files.mod_files  # Shared mod index
+        self.mod_files.set_mod_path(self.get_mod_path())
         self.tree = None
         self.unit_elem = None
         self.unit_attr_entries = {}
@@ -314,6 +317,22 @@ class GUIEditor(tk.Frame):
         self.rank_entries = []
         self.load_available_classes()  # Load classes when initializing
         self.build_ui()
+        mod_context.subscribe(self.rebind, owner=self)
+
+    def rebind(self, mod_path):
+        """Show the layout of another mod in the existing editor"""
+        self.config = config_editor_module.load_config()
+        self.mod_files.set_mod_path(self.get_mod_path())
+        self.load_available_classes()
+        if self.selected_box is not None:
+            self.remove_selection_info()
+        # The new mod may have no layout, so don't leave the old boxes behind
+        for frame in list(self.draggable_frames.values()):
+            frame.destroy()
+        self.draggable_frames.clear()
+        self.next_box_number = 1
+        self.reload_xml()
+        self.update_row_markers()
     
     def get_mod_path(self):
         """Get the current mod path based on configuration"""
@@ -637,15 +656,19 @@ Row Index: {frame.row_index}"""
         self.update_row_markers()
         # Clear info panel if the removed box was selected
         if self.selected_box == box:
-            self.selected_box = None
-            self.info_content.config(state='normal')
-            self.info_content.delete(1.0, tk.END)
-            self.info_content.config(state='disabled')
-            # Clear class text entry
-            self.class_text_entry.delete(0, tk.END)
-            # Clear slot settings
-            for widget in self.slot_settings_frame.winfo_children():
-                widget.destroy()
+            self.remove_selection_info()
+
+    def remove_selection_info(self):
+        """Clear the info panel of the selected box"""
+        self.selected_box = None
+        self.info_content.config(state='normal')
+        self.info_content.delete(1.0, tk.END)
+        self.info_content.config(state='disabled')
+        # Clear class text entry
+        self.class_text_entry.delete(0, tk.END)
+        # Clear slot settings
+        for widget in self.slot_settings_frame.winfo_children():
+            widget.destroy()
 
     def reload_xml(self):
         try:
@@ -658,7 +681,7 @@ Row Index: {frame.row_index}"""
                 messagebox.showerror("Error", "GUI layout file not found. Please create it first.")
                 return
             
-            tree = ET.parse(xml_path)
+            tree = document_cache.parse(xml_path)
             root = tree.getroot()
             
             # Clear existing frames
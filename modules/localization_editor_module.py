@@ -3,6 +3,10 @@ from tkinter import ttk, messagebox
 import os
 import json
 from modules import config_editor_module
+from modules.background import background
+from modules.mod_context import mod_context
+from utils import read_text
+from modules.symbol_index import write_text_indexed
 
 PLUGIN_TITLE = "Localization Editor"
 
@@ -29,7 +33,21 @@ class LocalizationEditor(tk.Frame):
         self.text_area = None
         self.config = config_editor_module.load_config()
         self.current_file = None
+        self.load_job = None  # Background read of the selected file
         self.build_ui()
+        mod_context.subscribe(self.rebind, owner=self)
+
+    def rebind(self, mod_path):
+        """List the localization files of another mod"""
+        if self.load_job:
+            self.load_job.cancel()
+            self.load_job = None
+        self.config = config_editor_module.load_config()
+        self.current_file = None
+        self.text_area.delete("1.0", tk.END)
+        self.file_label.config(text="No file selected")
+        self.save_button.configure(state="disabled")
+        self.refresh_file_list()
 
     def build_ui(self):
         # Create main container with horizontal split
@@ -137,37 +155,38 @@ class LocalizationEditor(tk.Frame):
 
     def load_file(self, file_path):
         """Load the selected file into the text editor"""
-        try:
-            if not os.path.exists(file_path):
-                messagebox.showerror("Error", "File not found")
-                return
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert("1.0", content)
-            
-            # Update current file and UI
-            self.current_file = file_path
-            self.file_label.config(text=f"Editing: {os.path.basename(file_path)}")
-            self.save_button.configure(state="normal")
+        if not os.path.exists(file_path):
+            messagebox.showerror("Error", "File not found")
+            return
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file: {e}")
+        # Only the file selected last is shown
+        if self.load_job:
+            self.load_job.cancel()
+        self.load_job = background.submit(
+            read_text, file_path, owner=self, description="Loading localization file",
+            on_done=lambda content: self.on_file_loaded(file_path, content),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load file: {e}"))
+
+    def on_file_loaded(self, file_path, content):
+        self.load_job = None
+        self.text_area.delete("1.0", tk.END)
+        self.text_area.insert("1.0", content)
+        
+        # Update current file and UI
+        self.current_file = file_path
+        self.file_label.config(text=f"Editing: {os.path.basename(file_path)}")
+        self.save_button.configure(state="normal")
 
     def save_changes(self):
         """Save changes to the current file"""
         if not self.current_file:
             return
 
-        try:
-            content = self.text_area.get("1.0", tk.END)
-            with open(self.current_file, "w", encoding="utf-8") as f:
-                f.write(content)
-            messagebox.showinfo("Success", "File saved successfully")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save file: {e}")
+        content = self.text_area.get("1.0", tk.END)
+        background.submit(write_text_indexed, self.current_file, content, owner=self,
+                          description="Saving localization file",
+                          on_done=lambda _: messagebox.showinfo("Success", "File saved successfully"),
+                          on_error=lambda e: messagebox.showerror("Error", f"Failed to save file: {e}"))
 
 def get_plugin_tab(notebook):
     """Create and return the localization editor tab"""
@@ -0,0 +1,88 @@
+import os
+import json
+import traceback
+from modules.mod_files import mod_files
+from modules.background import background
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("mod_context", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[ModContext] {message}")
+
+def get_configured_mod_path(config):
+    """Full path of the mod selected in the configuration, or None"""
+    mod_path = config.get("mod_path", "")
+    current_mod = config.get("last_used_mod", "")
+    if not mod_path or not current_mod:
+        return None
+    return os.path.normpath(os.path.join(mod_path, current_mod))
+
+class ModContext:
+    """The mod the tool is working on.
+
+    Plugins subscribe a rebind(mod_path) callback that refreshes the data
+    shown in their existing widgets. When the configuration changes, the main
+    window calls rebind() with the new mod directory: the shared mod index is
+    rescanned in the background and then every subscriber is called on the
+    Tk thread, so switching mods neither reloads modules nor rebuilds tabs.
+    """
+    def __init__(self):
+        self.mod_path = None
+        self._subscribers = []  # (callback, owner widget or None)
+
+    def subscribe(self, callback, owner=None):
+        """Call callback(mod_path) on every rebind.
+
+        With an owner widget the subscription ends when the widget is destroyed.
+        """
+        self._subscribers.append((callback, owner))
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(cb, owner) for cb, owner in self._subscribers if cb != callback]
+
+    def rebind(self, mod_path):
+        """Switch to another mod directory (None if no mod is selected)"""
+        mod_path = os.path.normpath(mod_path) if mod_path else None
+        log(f"Rebinding to: {mod_path}")
+        self.mod_path = mod_path
+        background.submit(mod_files.set_mod_path, mod_path, description="Scanning mod files",
+                          on_done=lambda _: self._notify(mod_path),
+                          on_error=lambda e: self._notify(mod_path))
+
+    def _notify(self, mod_path):
+        if mod_path != self.mod_path:
+            return  # Another rebind is already on its way
+        alive = []
+        for callback, owner in self._subscribers:
+            if owner is not None and not _widget_exists(owner):
+                continue
+            alive.append((callback, owner))
+        self._subscribers = alive
+
+        for callback, _ in alive:
+            try:
+                callback(mod_path)
+            except Exception as e:
+                print(f"Error rebinding to {mod_path}: {e}")
+                traceback.print_exc()
+
+def _widget_exists(widget):
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
+
+# Global instance shared by all plugins
+mod_context = ModContext()
@@ -1,6 +1,8 @@
 import os
 import xml.etree.ElementTree as ET
 import json
+import threading
+from modules.xml_cache import document_cache
 
 def is_logging_enabled():
     """Check if logging is enabled for this module"""
@@ -19,6 +21,75 @@ def log(message):
     if is_logging_enabled():
         print(f"[ModFiles] {message}")
 
+def _is_unit_file(file):
+    # Accept files that:
+    # 1. End with _unit.xml or _units.xml
+    # 2. Are exactly unit.xml or units.xml
+    # 3. End with _unit or _units (fallback)
+    return (file.endswith("_unit.xml") or file.endswith("_units.xml") or
+            file in ["unit.xml", "units.xml"] or
+            file.endswith("_unit") or file.endswith("_units"))
+
+def _is_doctrine_nodes_file(file):
+    return file.endswith("_doctrine_nodes.xml") or file.endswith("_doctrine_nodes")
+
+def _is_doctrine_file(file):
+    return file.endswith("_doctrine.txt") or file.endswith("_doctrines.txt")
+
+def _is_doctrine_tree_file(file):
+    return file.endswith("_doctrine_tree.xml") or file.endswith("_doctrine_tree")
+
+def _is_equipment_file(file):
+    # Check for files that:
+    # 1. End with _binds.xml
+    # 2. Are exactly binds.xml
+    # 3. End with _binds (fallback)
+    return file.endswith("_binds.xml") or file == "binds.xml" or file.endswith("_binds")
+
+def _is_entities_file(file):
+    # Check for files that:
+    # 1. End with .xml and contain 'human'
+    # 2. End with _human.xml or _humans.xml
+    # 3. End with _human or _humans (fallback)
+    return ((file.lower().endswith('.xml') and 'human' in file.lower()) or
+            file.endswith("_human.xml") or file.endswith("_humans.xml") or
+            file.endswith("_human") or file.endswith("_humans"))
+
+def _is_gui_file(file):
+    # Check for files that:
+    # 1. End with _deploy.xml
+    # 2. Are exactly deploy.xml
+    # 3. End with _deploy (fallback)
+    return file.endswith("_deploy.xml") or file == "deploy.xml" or file.endswith("_deploy")
+
+# file type -> (sub directory, file name matcher, must parse as XML)
+FILE_CATEGORIES = {
+    "unit": ("units", _is_unit_file, True),
+    "doctrine_nodes": ("units", _is_doctrine_nodes_file, True),
+    "doctrine": ("localization", _is_doctrine_file, False),
+    "doctrine_tree": ("gui", _is_doctrine_tree_file, True),
+    "equipment": ("equipment", _is_equipment_file, True),
+    "entities": ("entities", _is_entities_file, True),
+    "gui": ("gui", _is_gui_file, True),
+}
+
+CATEGORY_LABELS = {
+    "unit": "unit",
+    "doctrine_nodes": "doctrine nodes",
+    "doctrine": "doctrine",
+    "doctrine_tree": "doctrine tree",
+    "equipment": "equipment",
+    "entities": "human entities",
+    "gui": "GUI",
+}
+
+def _categories_by_dir():
+    """Group the file categories by the sub directory they live in"""
+    by_dir = {}
+    for file_type, (dir_name, matches, _) in FILE_CATEGORIES.items():
+        by_dir.setdefault(dir_name, []).append((file_type, matches))
+    return by_dir
+
 class ModFiles:
     """Centralized file management for the current mod"""
     def __init__(self, mod_path=None):
@@ -31,15 +102,39 @@ class ModFiles:
             "gui": None,
             "mod": None,
             "doctrine_nodes": None,  # New: doctrine nodes file
-            "doctrine": None         # New: doctrine file
+            "doctrine": None,        # New: doctrine file
+            "doctrine_tree": None    # Doctrine tree GUI layout
         }
+        self.trees = {}  # Parsed trees kept from the last scan, by file type
+        # Plugins use the index from the Tk thread and from background jobs
+        self._lock = threading.RLock()
         if mod_path and os.path.exists(os.path.join(mod_path, "mod.xml")):
             self.scan_mod_directory()
         else:
             log("No valid mod path provided during initialization")
 
+    def set_mod_path(self, mod_path):
+        """Point the index at a mod directory, rescanning only if the path changed"""
+        mod_path = os.path.normpath(mod_path) if mod_path else None
+        with self._lock:
+            if mod_path != self.mod_path:
+                self.mod_path = mod_path
+                self.scan_mod_directory()
+
     def scan_mod_directory(self):
-        """Scan the mod directory to find all relevant files"""
+        """Scan the mod directory to find all relevant files.
+
+        Every sub directory is listed once with os.scandir and each candidate is
+        parsed at most once. Candidates are tried largest first, so the first one
+        that parses is the one we use and its tree is kept for later lookups.
+        """
+        with self._lock:
+            self._scan_mod_directory()
+
+    def _scan_mod_directory(self):
+        self.trees = {}
+        for file_type in self.files:
+            self.files[file_type] = None
         if not self.mod_path:
             return
 
@@ -51,160 +146,59 @@ class ModFiles:
             
         self.files["mod"] = mod_xml
         log("Found mod.xml")
-        
-        # Find unit file
-        unit_files = []
-        unit_dir = os.path.join(self.mod_path, "units")
-        if os.path.exists(unit_dir):
-            for file in os.listdir(unit_dir):
-                # Accept files that:
-                # 1. End with _unit.xml or _units.xml
-                # 2. Are exactly unit.xml or units.xml
-                # 3. End with _unit or _units (fallback)
-                if (file.endswith("_unit.xml") or file.endswith("_units.xml") or 
-                    file in ["unit.xml", "units.xml"] or 
-                    file.endswith("_unit") or file.endswith("_units")):
-                    full_path = os.path.normpath(os.path.join(unit_dir, file))
-                    try:
-                        # Try to parse the file to verify it's valid XML
-                        ET.parse(full_path)
-                        unit_files.append((full_path, os.path.getsize(full_path)))
-                        log(f"Found valid unit file: {file}")
-                    except ET.ParseError as e:
-                        log(f"Warning: Failed to parse {file}: {str(e)}")
-                        continue
-        if unit_files:
-            # Use the largest unit file
-            unit_files.sort(key=lambda x: x[1], reverse=True)
-            self.files["unit"] = unit_files[0][0]
-            log(f"Found unit file: {os.path.basename(self.files['unit'])}")
-        else:
-            self.files["unit"] = None
-            log("No unit file found")
 
-        # Find doctrine nodes file
-        doctrine_nodes_files = []
-        if os.path.exists(unit_dir):
-            for file in os.listdir(unit_dir):
-                if file.endswith("_doctrine_nodes.xml") or file.endswith("_doctrine_nodes"):
-                    full_path = os.path.normpath(os.path.join(unit_dir, file))
-                    try:
-                        ET.parse(full_path)
-                        doctrine_nodes_files.append((full_path, os.path.getsize(full_path)))
-                        log(f"Found valid doctrine nodes file: {file}")
-                    except ET.ParseError as e:
-                        log(f"Warning: Failed to parse {file}: {str(e)}")
-                        continue
-        if doctrine_nodes_files:
-            doctrine_nodes_files.sort(key=lambda x: x[1], reverse=True)
-            self.files["doctrine_nodes"] = doctrine_nodes_files[0][0]
-            log(f"Found doctrine nodes file: {os.path.basename(self.files['doctrine_nodes'])}")
-        else:
-            self.files["doctrine_nodes"] = None
-            log("No doctrine nodes file found")
-
-        # Find doctrine file
-        doctrine_files = []
-        localization_dir = os.path.join(self.mod_path, "localization")
-        if os.path.exists(localization_dir):
-            for file in os.listdir(localization_dir):
-                if file.endswith("_doctrine.txt") or file.endswith("_doctrines.txt"):
-                    full_path = os.path.normpath(os.path.join(localization_dir, file))
-                    doctrine_files.append((full_path, os.path.getsize(full_path)))
-                    log(f"Found valid doctrine file: {file}")
-        if doctrine_files:
-            doctrine_files.sort(key=lambda x: x[1], reverse=True)
-            self.files["doctrine"] = doctrine_files[0][0]
-            log(f"Found doctrine file: {os.path.basename(self.files['doctrine'])}")
-        else:
-            self.files["doctrine"] = None
-            log("No doctrine file found")
-
-        # Find equipment binds file
-        equipment_files = []
-        equipment_dir = os.path.join(self.mod_path, "equipment")
-        if os.path.exists(equipment_dir):
-            for file in os.listdir(equipment_dir):
-                # Check for files that:
-                # 1. End with _binds.xml
-                # 2. Are exactly binds.xml
-                # 3. End with _binds (fallback)
-                if file.endswith("_binds.xml") or file == "binds.xml" or file.endswith("_binds"):
-                    full_path = os.path.normpath(os.path.join(equipment_dir, file))
-                    try:
-                        # Try to parse the file to verify it's valid XML
-                        ET.parse(full_path)
-                        equipment_files.append((full_path, os.path.getsize(full_path)))
-                        log(f"Found valid equipment file: {file}")
-                    except ET.ParseError as e:
-                        log(f"Warning: Failed to parse {file}: {str(e)}")
-                        continue
-        if equipment_files:
-            # Use the largest binds file
-            equipment_files.sort(key=lambda x: x[1], reverse=True)
-            self.files["equipment"] = equipment_files[0][0]
-            log(f"Using equipment file: {os.path.basename(self.files['equipment'])}")
-        else:
-            self.files["equipment"] = None
-            log("No equipment file found")
-
-        # Find entities file
-        entities_files = []
-        entities_dir = os.path.join(self.mod_path, "entities")
-        if os.path.exists(entities_dir):
-            for file in os.listdir(entities_dir):
-                # Check for files that:
-                # 1. End with .xml and contain 'human'
-                # 2. End with _human.xml or _humans.xml
-                # 3. End with _human or _humans (fallback)
-                if ((file.lower().endswith('.xml') and 'human' in file.lower()) or
-                    file.endswith("_human.xml") or file.endswith("_humans.xml") or
-                    file.endswith("_human") or file.endswith("_humans")):
-                    full_path = os.path.normpath(os.path.join(entities_dir, file))
-                    try:
-                        # Try to parse the file to verify it's valid XML
-                        ET.parse(full_path)
-                        entities_files.append((full_path, os.path.getsize(full_path)))
-                        log(f"Found valid entities file: {file}")
-                    except ET.ParseError as e:
-                        log(f"Warning: Failed to parse {file}: {str(e)}")
-                        continue
-        if entities_files:
-            # Use the largest humans file
-            entities_files.sort(key=lambda x: x[1], reverse=True)
-            self.files["entities"] = entities_files[0][0]
-            log(f"Found entities file: {os.path.basename(self.files['entities'])}")
-        else:
-            self.files["entities"] = None
-            log("No human entities file found")
-
-        # Find GUI file
-        gui_files = []
-        gui_dir = os.path.join(self.mod_path, "gui")
-        if os.path.exists(gui_dir):
-            for file in os.listdir(gui_dir):
-                # Check for files that:
-                # 1. End with _deploy.xml
-                # 2. Are exactly deploy.xml
-                # 3. End with _deploy (fallback)
-                if file.endswith("_deploy.xml") or file == "deploy.xml" or file.endswith("_deploy"):
-                    full_path = os.path.normpath(os.path.join(gui_dir, file))
+        # Collect (path, size) candidates for every category in a single pass
+        candidates = {file_type: [] for file_type in FILE_CATEGORIES}
+        for dir_name, categories in _categories_by_dir().items():
+            dir_path = os.path.join(self.mod_path, dir_name)
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if not entry.is_file():
+                            continue
+                        for file_type, matches in categories:
+                            if matches(entry.name):
+                                full_path = os.path.normpath(entry.path)
+                                candidates[file_type].append((full_path, entry.stat().st_size))
+            except OSError:
+                continue
+
+        for file_type, (_, _, needs_parse) in FILE_CATEGORIES.items():
+            label = CATEGORY_LABELS[file_type]
+            # Use the largest file of each category
+            for full_path, _ in sorted(candidates[file_type], key=lambda x: x[1], reverse=True):
+                if needs_parse:
                     try:
-                        # Try to parse the file to verify it's valid XML
-                        ET.parse(full_path)
-                        gui_files.append((full_path, os.path.getsize(full_path)))
-                        log(f"Found valid GUI file: {file}")
+                        # Parse once to verify it's valid XML and keep the tree
+                        self.trees[file_type] = document_cache.parse_shared(full_path)
                     except ET.ParseError as e:
-                        log(f"Warning: Failed to parse {file}: {str(e)}")
+                        log(f"Warning: Failed to parse {os.path.basename(full_path)}: {str(e)}")
                         continue
-        if gui_files:
-            # Use the largest deploy file
-            gui_files.sort(key=lambda x: x[1], reverse=True)
-            self.files["gui"] = gui_files[0][0]
-            log(f"Found GUI file: {os.path.basename(self.files['gui'])}")
-        else:
-            self.files["gui"] = None
-            log("No GUI file found")
+                self.files[file_type] = full_path
+                log(f"Found {label} file: {os.path.basename(full_path)}")
+                break
+            else:
+                log(f"No {label} file found")
+
+    def get_tree(self, file_type):
+        """Get the parsed tree for a file type from the index.
+
+        The tree is shared through the document cache and is re-parsed only when
+        the file changed on disk (for example after an editor saved it), so it
+        must not be modified. Returns None if there is no such file or it no
+        longer parses.
+        """
+        with self._lock:
+            file_path = self.files.get(file_type)
+            if not file_path:
+                return None
+            try:
+                self.trees[file_type] = document_cache.parse_shared(file_path)
+                return self.trees[file_type]
+            except (OSError, ET.ParseError) as e:
+                log(f"Warning: Failed to parse {os.path.basename(file_path)}: {str(e)}")
+                self.trees.pop(file_type, None)
+                return None
 
     def get_file(self, file_type):
         """Get the path to a specific file type"""
@@ -231,7 +225,9 @@ class ModFiles:
             log("No unit file found, using default faction name: FACTION")
             return "FACTION"
         try:
-            tree = ET.parse(self.files["unit"])
+            tree = self.get_tree("unit")
+            if tree is None:
+                return "FACTION"
             root = tree.getroot()
             # Find the Unit element and get its name attribute
             unit_elem = root.find(".//Unit")
@@ -257,7 +253,9 @@ class ModFiles:
             log("No unit file found")
             return []
         try:
-            tree = ET.parse(self.files["unit"])
+            tree = self.get_tree("unit")
+            if tree is None:
+                return []
             root = tree.getroot()
             classes_elem = root.find(".//Classes")
             if classes_elem is not None:
@@ -297,6 +295,10 @@ class ModFiles:
         """Get the doctrine file path"""
         return self.get_file("doctrine")
 
+    def get_doctrine_tree_file(self):
+        """Get the doctrine tree GUI file path"""
+        return self.get_file("doctrine_tree")
+
     def create_doctrine_nodes_file(self):
         """Create a new doctrine nodes file with basic structure"""
         if not self.mod_path:
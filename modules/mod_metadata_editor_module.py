@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 import os
 import xml.etree.ElementTree as ET
 from modules import config_editor_module
+from modules.mod_context import mod_context
 
 PLUGIN_TITLE = "Mod Metadata"
 
@@ -16,6 +17,25 @@ class ModMetadataEditor(tk.Frame):
         
         self.load_xml()
         self.build_ui()
+        mod_context.subscribe(self.rebind, owner=self)
+
+    def rebind(self, mod_path):
+        """Show the metadata of another mod"""
+        self.config = config_editor_module.load_config()
+        self.tree = None
+        self.mod_elem = None
+        self.load_xml()
+
+        # Fill the existing entries if there are any
+        if self.mod_elem is not None and self.attr_entries:
+            for field, entry in self.attr_entries.items():
+                entry.delete(0, tk.END)
+                entry.insert(0, self.mod_elem.get(field, ''))
+            return
+        for child in self.winfo_children():
+            child.destroy()
+        self.attr_entries = {}
+        self.build_ui()
 
     def get_xml_path(self):
         """Get the current mod.xml file path based on configuration"""
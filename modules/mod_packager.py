@@ -0,0 +1,384 @@
+import os
+import json
+import time
+import zlib
+import struct
+import hashlib
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("mod_packager", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[ModPackager] {message}")
+
+# Formats that are compressed already; deflating them again costs time and
+# saves next to nothing, so they are stored as they are
+STORED_EXTENSIONS = {
+    ".dds", ".png", ".jpg", ".jpeg", ".ogg", ".mp3", ".wav", ".bik", ".webm",
+    ".zip", ".7z", ".rar", ".gz", ".bz2", ".xz",
+}
+
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1 << 20
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_MAX_ENTRIES = 0xFFFF
+
+LOCAL_HEADER = struct.Struct("<4sHHHHHLLLHH")
+CENTRAL_HEADER = struct.Struct("<4sHHHHHHLLLHHHHHLL")
+END_RECORD = struct.Struct("<4sHHHHLLH")
+ZIP64_END_RECORD = struct.Struct("<4sQHHLLQQQQ")
+ZIP64_LOCATOR = struct.Struct("<4sLQL")
+UTF8_FLAG = 0x800
+
+def manifest_path(zip_path):
+    return zip_path + ".manifest.json"
+
+def dos_date_time(mtime):
+    """ZIP date and time fields of a timestamp (ZIP cannot store years before 1980)"""
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    return ((t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday)
+
+class Entry:
+    """A file going into the archive"""
+    __slots__ = ("arcname", "path", "size", "mtime_ns", "sha256", "crc", "method",
+                 "compress_size", "offset", "source")
+
+    def __init__(self, arcname, path, size, mtime_ns):
+        self.arcname = arcname
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.sha256 = None
+        self.crc = 0
+        self.method = zipfile.ZIP_STORED
+        self.compress_size = 0
+        self.offset = 0
+        self.source = None  # "reused", "deflated" or "stored"
+
+    def manifest_record(self):
+        return {"size": self.size, "mtime_ns": self.mtime_ns, "sha256": self.sha256,
+                "crc": self.crc, "method": self.method, "compress_size": self.compress_size}
+
+def new_compressor():
+    return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+
+def read_file(path, deflate, previous_sha256=None):
+    """Hash a file and optionally deflate it; runs on a worker thread.
+
+    zlib and hashlib release the GIL on large buffers, so several files are
+    processed at the same time on several cores. previous_sha256 is the hash
+    the file had in the previous archive: the file is then hashed before it
+    is deflated, from the chunks read for the hash, and not deflated at all
+    if it is unchanged. Returns (sha256, crc, data), data being the deflated
+    bytes or None.
+    """
+    sha256 = hashlib.sha256()
+    crc = 0
+    compressor = new_compressor() if deflate and previous_sha256 is None else None
+    held = [] if deflate and previous_sha256 is not None else None
+    parts = []
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            if compressor:
+                parts.append(compressor.compress(chunk))
+            elif held is not None:
+                held.append(chunk)
+    digest = sha256.hexdigest()
+    if held is not None:
+        if digest == previous_sha256:
+            return digest, crc, None
+        compressor = new_compressor()
+        parts = [compressor.compress(chunk) for chunk in held]
+    if compressor:
+        parts.append(compressor.flush())
+    return digest, crc, b"".join(parts) if compressor else None
+
+def collect_files(mod_dir, base_dir):
+    """Entries for every file under mod_dir, named relative to base_dir"""
+    entries = []
+    for root_dir, dirs, files in os.walk(mod_dir):
+        dirs.sort()
+        for file in sorted(files):
+            path = os.path.join(root_dir, file)
+            st = os.stat(path)
+            arcname = os.path.relpath(path, base_dir).replace(os.sep, "/")
+            entries.append(Entry(arcname, path, st.st_size, st.st_mtime_ns))
+    return entries
+
+def load_manifest(zip_path):
+    """Manifest of the previous archive, or None if it does not match that archive"""
+    try:
+        with open(manifest_path(zip_path), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        st = os.stat(zip_path)
+    except (OSError, ValueError):
+        return None
+    archive = manifest.get("archive", {})
+    if (manifest.get("version") != MANIFEST_VERSION or archive.get("size") != st.st_size
+            or archive.get("mtime_ns") != st.st_mtime_ns):
+        log("Manifest does not match the previous archive, packaging everything")
+        return None
+    return manifest.get("files", {})
+
+class PreviousArchive:
+    """Raw access to the compressed entries of the previous archive"""
+    def __init__(self, zip_path):
+        self.file = open(zip_path, "rb")
+        with zipfile.ZipFile(self.file) as zf:
+            self.infos = {info.filename: info for info in zf.infolist()}
+
+    def matches(self, arcname, record):
+        info = self.infos.get(arcname)
+        return (info is not None and info.CRC == record["crc"] and info.file_size == record["size"]
+                and info.compress_type == record["method"]
+                and info.compress_size == record["compress_size"])
+
+    def copy_raw(self, arcname, out):
+        """Copy the compressed bytes of an entry to out without decompressing them"""
+        info = self.infos[arcname]
+        self.file.seek(info.header_offset)
+        header = self.file.read(LOCAL_HEADER.size)
+        fields = LOCAL_HEADER.unpack(header)
+        if fields[0] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"Bad local header for {arcname}")
+        self.file.seek(fields[9] + fields[10], os.SEEK_CUR)
+        remaining = info.compress_size
+        while remaining:
+            chunk = self.file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated entry {arcname}")
+            out.write(chunk)
+            remaining -= len(chunk)
+
+    def close(self):
+        self.file.close()
+
+class ZipWriter:
+    """Minimal ZIP writer that takes data that is already compressed.
+
+    zipfile always compresses what it is given, but reused entries are
+    copied as raw deflate streams from the previous archive. ZIP64 records
+    are written only where sizes, offsets or the entry count need them.
+    """
+    def __init__(self, fp):
+        self.fp = fp
+        self.entries = []
+
+    def write_entry(self, entry, data=None, source=None):
+        """Write a local header followed by data (bytes) or the output of source(fp).
+
+        entry.crc, method, size and compress_size must be set before.
+        """
+        entry.offset = self.fp.tell()
+        name = entry.arcname.encode("utf-8")
+        zip64 = entry.size >= ZIP64_LIMIT or entry.compress_size >= ZIP64_LIMIT
+        extra = struct.pack("<HHQQ", 1, 16, entry.size, entry.compress_size) if zip64 else b""
+        dos_time, dos_date = dos_date_time(entry.mtime_ns / 1e9)
+        self.fp.write(LOCAL_HEADER.pack(
+            b"PK\x03\x04", 45 if zip64 else 20, UTF8_FLAG, entry.method, dos_time, dos_date,
+            entry.crc, ZIP64_LIMIT if zip64 else entry.compress_size,
+            ZIP64_LIMIT if zip64 else entry.size, len(name), len(extra)))
+        self.fp.write(name)
+        self.fp.write(extra)
+        if data is not None:
+            self.fp.write(data)
+        else:
+            source(self.fp)
+        self.entries.append(entry)
+
+    def close(self):
+        """Write the central directory"""
+        start = self.fp.tell()
+        for entry in self.entries:
+            name = entry.arcname.encode("utf-8")
+            extra_fields = []
+            size, compress_size, offset = entry.size, entry.compress_size, entry.offset
+            if size >= ZIP64_LIMIT:
+                extra_fields.append(size)
+                size = ZIP64_LIMIT
+            if compress_size >= ZIP64_LIMIT:
+                extra_fields.append(compress_size)
+                compress_size = ZIP64_LIMIT
+            if offset >= ZIP64_LIMIT:
+                extra_fields.append(offset)
+                offset = ZIP64_LIMIT
+            extra = b""
+            if extra_fields:
+                extra = struct.pack(f"<HH{len(extra_fields)}Q", 1, 8 * len(extra_fields), *extra_fields)
+            version = 45 if extra_fields else 20
+            dos_time, dos_date = dos_date_time(entry.mtime_ns / 1e9)
+            self.fp.write(CENTRAL_HEADER.pack(
+                b"PK\x01\x02", version, version, UTF8_FLAG, entry.method, dos_time, dos_date,
+                entry.crc, compress_size, size, len(name), len(extra), 0, 0, 0, 0, offset))
+            self.fp.write(name)
+            self.fp.write(extra)
+
+        end = self.fp.tell()
+        count = len(self.entries)
+        cd_size = end - start
+        if count >= ZIP_MAX_ENTRIES or start >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            self.fp.write(ZIP64_END_RECORD.pack(
+                b"PK\x06\x06", ZIP64_END_RECORD.size - 12, 45, 45, 0, 0, count, count, cd_size, start))
+            self.fp.write(ZIP64_LOCATOR.pack(b"PK\x06\x07", 0, end, 1))
+        self.fp.write(END_RECORD.pack(
+            b"PK\x05\x06", 0, 0, min(count, ZIP_MAX_ENTRIES), min(count, ZIP_MAX_ENTRIES),
+            min(cd_size, ZIP64_LIMIT), min(start, ZIP64_LIMIT), 0))
+
+def copy_stored(entry):
+    """Source function that copies a file into the archive as it is.
+
+    The header was written with the CRC and size of an earlier read, so the
+    copy is checked against them; a file edited in between fails the package.
+    """
+    def source(out):
+        crc = 0
+        size = 0
+        with open(entry.path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                out.write(chunk)
+        if crc != entry.crc or size != entry.size:
+            raise OSError(f"{entry.path} changed while it was being packaged, package the mod again")
+    return source
+
+def package_mod(mod_dir, zip_path, base_dir=None, workers=None, progress=None):
+    """Package mod_dir into zip_path and return statistics about the run.
+
+    Names in the archive are relative to base_dir (default: the parent of
+    mod_dir, so they start with the mod folder). Files that are unchanged
+    since the previous run, by size and mtime or else by content hash, are
+    copied from the previous archive as raw compressed bytes. Other files
+    are hashed and deflated on worker threads, except formats in
+    STORED_EXTENSIONS and files that do not get smaller, which are stored.
+    progress(done, total, message) is called after each file.
+    """
+    start_time = time.perf_counter()
+    base_dir = base_dir or os.path.dirname(os.path.normpath(mod_dir))
+    entries = collect_files(mod_dir, base_dir)
+
+    manifest = load_manifest(zip_path) if os.path.exists(zip_path) else None
+    previous = None
+    if manifest:
+        try:
+            previous = PreviousArchive(zip_path)
+        except (OSError, zipfile.BadZipFile) as e:
+            log(f"Previous archive unreadable, packaging everything: {e}")
+            manifest = None
+
+    def previous_record(entry):
+        """The manifest record of the entry, if the previous archive still has it"""
+        record = manifest.get(entry.arcname) if manifest else None
+        if record is None or not previous.matches(entry.arcname, record):
+            return None
+        return record
+
+    def reusable(entry, sha256=None):
+        record = previous_record(entry)
+        if record is None:
+            return None
+        if sha256 is None and record["size"] == entry.size and record["mtime_ns"] == entry.mtime_ns:
+            return record
+        if sha256 is not None and record["sha256"] == sha256:
+            return record
+        return None
+
+    stats = {"files": len(entries), "reused": 0, "deflated": 0, "stored": 0,
+             "bytes_in": sum(e.size for e in entries), "bytes_out": 0}
+    workers = workers or os.cpu_count() or 1
+    tmp_path = zip_path + ".tmp"
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor, open(tmp_path, "wb") as out:
+            writer = ZipWriter(out)
+
+            def submit(entry):
+                if reusable(entry) is not None:
+                    return None
+                deflate = os.path.splitext(entry.arcname)[1].lower() not in STORED_EXTENSIONS
+                # A file that was only touched is hashed before it is deflated
+                record = previous_record(entry)
+                previous_sha256 = record["sha256"] if record and record["size"] == entry.size else None
+                return executor.submit(read_file, entry.path, deflate, previous_sha256)
+
+            # Keep a few files ahead of the writer so memory stays bounded
+            ahead = workers * 2
+            futures = [submit(entry) for entry in entries[:ahead]]
+            for i, entry in enumerate(entries):
+                if i + ahead < len(entries):
+                    futures.append(submit(entries[i + ahead]))
+                future = futures[i]
+                futures[i] = None
+
+                sha256, crc, data = future.result() if future else (None, None, None)
+                record = reusable(entry, sha256)
+                if record is not None:
+                    entry.sha256 = record["sha256"]
+                    entry.crc = record["crc"]
+                    entry.method = record["method"]
+                    entry.compress_size = record["compress_size"]
+                    entry.source = "reused"
+                    writer.write_entry(entry, source=lambda fp, name=entry.arcname: previous.copy_raw(name, fp))
+                else:
+                    entry.sha256 = sha256
+                    entry.crc = crc
+                    if data is not None and len(data) < entry.size:
+                        entry.method = zipfile.ZIP_DEFLATED
+                        entry.compress_size = len(data)
+                        entry.source = "deflated"
+                        writer.write_entry(entry, data=data)
+                    else:
+                        entry.method = zipfile.ZIP_STORED
+                        entry.compress_size = entry.size
+                        entry.source = "stored"
+                        writer.write_entry(entry, source=copy_stored(entry))
+                stats[entry.source] += 1
+                if progress:
+                    progress(i + 1, len(entries), entry.arcname)
+            writer.close()
+            stats["bytes_out"] = out.tell()
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        if previous:
+            previous.close()
+
+    os.replace(tmp_path, zip_path)
+    st = os.stat(zip_path)
+    manifest_data = {
+        "version": MANIFEST_VERSION,
+        "archive": {"size": st.st_size, "mtime_ns": st.st_mtime_ns},
+        "files": {entry.arcname: entry.manifest_record() for entry in entries}
+    }
+    with open(manifest_path(zip_path), "w", encoding="utf-8") as f:
+        json.dump(manifest_data, f)
+
+    stats["seconds"] = time.perf_counter() - start_time
+    log(f"Packaged {stats['files']} files in {stats['seconds']:.2f}s: {stats['reused']} reused, "
+        f"{stats['deflated']} deflated, {stats['stored']} stored")
+    return stats
@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import pickle
+
+_data_dir = None
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("persistent_cache", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[PersistentCache] {message}")
+
+def set_data_dir(data_dir):
+    """The directory the caches are kept in, set once the program knows it"""
+    global _data_dir
+    _data_dir = data_dir
+
+def get_data_dir():
+    """The data directory; until it is set, the program directory, which is
+    where the program keeps its data by default"""
+    return _data_dir or os.path.dirname(os.path.abspath(sys.argv[0]))
+
+def cache_path(cache_file):
+    """Where cache_file is stored: names are in the data directory, absolute
+    paths are kept. None stays None, for caches that are not persisted."""
+    if not cache_file:
+        return None
+    return os.path.join(get_data_dir(), cache_file)
+
+def load_pickle(cache_file, version):
+    """The dict saved to cache_file with save_pickle, or None if there is
+    none, it was saved by another version or it can't be read"""
+    path = cache_path(cache_file)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except Exception as e:
+        log(f"Failed to load {path}: {e}")
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        log(f"Ignoring {path} from another version")
+        return None
+    return data
+
+def save_pickle(cache_file, version, data):
+    """Write the dict data to cache_file, replacing the old file in one step.
+
+    Returns False if the cache is not persisted or the write failed.
+    """
+    path = cache_path(cache_file)
+    if not path:
+        return False
+    try:
+        tmp_file = path + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(dict(data, version=version), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, path)
+        return True
+    except Exception as e:
+        log(f"Failed to save {path}: {e}")
+        return False
@@ -0,0 +1,129 @@
+import os
+import json
+
+# Separates the fields of an item's search text so no n-gram spans two fields
+FIELD_SEPARATOR = "\x00"
+GRAM_SIZE = 3
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("search_index", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[SearchIndex] {message}")
+
+def bits_to_ids(mask):
+    """Return the positions of the set bits of mask in ascending order"""
+    bits = bin(mask)[:1:-1]  # Binary digits, lowest bit first
+    ids = []
+    position = bits.find("1")
+    while position != -1:
+        ids.append(position)
+        position = bits.find("1", position + 1)
+    return ids
+
+def ids_to_bits(ids):
+    """Build a bitset with the given positions set"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    bits = bytearray((max(ids) >> 3) + 1)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+def item_search_text(item):
+    """Lower-cased text an equipment item can be found by"""
+    fields = [item.name, item.category, item.inventory_slot]
+    fields.extend(item.bindings)
+    fields.extend(str(value) for value in item.attributes.values())
+    return FIELD_SEPARATOR.join(field for field in fields if field).lower()
+
+class SearchIndex:
+    """Inverted trigram index over a list of equipment items.
+
+    Items are identified by their position in the list. Every trigram of an
+    item's search text maps to the ids of the items containing it, and each
+    Type and Mod value to a bitset (a Python int) of its items, so filtering
+    is a handful of big-int ANDs. Trigram postings are turned into bitsets
+    the first time a query needs them. Terms shorter than a trigram are
+    matched directly against the text of the remaining candidates.
+    """
+    def __init__(self, items):
+        self.items = list(items)
+        self.texts = [item_search_text(item) for item in self.items]
+        self.all_bits = (1 << len(self.items)) - 1
+        self.postings = self._build_postings()
+        self.gram_bits = {}  # trigram -> bitset, filled on demand
+        self.facets = {
+            "Type": self._build_facet(lambda item: item.type),
+            "Mod": self._build_facet(lambda item: item.source_mod)
+        }
+        log(f"Indexed {len(self.items)} items with {len(self.postings)} trigrams")
+
+    def _build_postings(self):
+        postings = {}
+        for item_id, text in enumerate(self.texts):
+            for gram in {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}:
+                ids = postings.get(gram)
+                if ids is None:
+                    postings[gram] = [item_id]
+                else:
+                    ids.append(item_id)
+        return postings
+
+    def _build_facet(self, get_value):
+        postings = {}
+        for item_id, item in enumerate(self.items):
+            postings.setdefault(get_value(item), []).append(item_id)
+        return {value: ids_to_bits(ids) for value, ids in postings.items()}
+
+    def gram_to_bits(self, gram):
+        """Bitset of the items whose search text contains gram"""
+        bits = self.gram_bits.get(gram)
+        if bits is None:
+            bits = self.gram_bits[gram] = ids_to_bits(self.postings.get(gram, ()))
+        return bits
+
+    def facet_bits(self, facet, values):
+        """Bitset of the items whose facet value is one of values"""
+        bits = 0
+        for value in values:
+            bits |= self.facets[facet].get(value, 0)
+        return bits
+
+    def search(self, query, filters=None):
+        """Return the ids of the items matching every term of query.
+
+        filters maps a facet name ("Type" or "Mod") to the values allowed for
+        it. The ids are returned in ascending order.
+        """
+        bits = self.all_bits
+        for facet, values in (filters or {}).items():
+            bits &= self.facet_bits(facet, values)
+
+        # Narrow down with the trigrams of every term long enough to have one
+        terms = set(query.lower().split())
+        for term in terms:
+            for i in range(len(term) - GRAM_SIZE + 1):
+                if not bits:
+                    return []
+                bits &= self.gram_to_bits(term[i:i + GRAM_SIZE])
+
+        ids = bits_to_ids(bits)
+        # Trigrams only prove a term of exactly three characters; check the rest
+        unproven = [term for term in terms if len(term) != GRAM_SIZE]
+        if unproven:
+            texts = self.texts
+            ids = [i for i in ids if all(term in texts[i] for term in unproven)]
+        return ids
@@ -0,0 +1,117 @@
+import math
+
+class SpatialGrid:
+    """Uniform grid hash of axis-aligned rectangles.
+
+    Every rectangle is filed under each grid cell it touches, so point and
+    rectangle queries only look at the few rectangles near the query
+    instead of all of them. With cells about the size of the rectangles,
+    as for doctrine nodes, a query touches a handful of cells. Rectangles
+    are (x1, y1, x2, y2) in any coordinate system; keys are any hashable.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = max(1.0, float(cell_size))
+        self.cells = {}  # (column, row) -> set of keys
+        self.rects = {}  # key -> (x1, y1, x2, y2)
+        self.order = {}  # key -> insertion counter; later rectangles lie on top
+        self._counter = 0
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def _cell_range(self, rect):
+        x1, y1, x2, y2 = rect
+        size = self.cell_size
+        return (range(math.floor(x1 / size), math.floor(x2 / size) + 1),
+                range(math.floor(y1 / size), math.floor(y2 / size) + 1))
+
+    def insert(self, key, rect):
+        """Add a rectangle, or move it if the key is already in the grid"""
+        rect = (min(rect[0], rect[2]), min(rect[1], rect[3]), max(rect[0], rect[2]), max(rect[1], rect[3]))
+        if key in self.rects:
+            self.remove(key)
+        self.rects[key] = rect
+        self._counter += 1
+        self.order[key] = self._counter
+        columns, rows = self._cell_range(rect)
+        for column in columns:
+            for row in rows:
+                self.cells.setdefault((column, row), set()).add(key)
+
+    move = insert
+
+    def remove(self, key):
+        rect = self.rects.pop(key, None)
+        if rect is None:
+            return
+        del self.order[key]
+        columns, rows = self._cell_range(rect)
+        for column in columns:
+            for row in rows:
+                keys = self.cells.get((column, row))
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.cells[(column, row)]
+
+    def clear(self):
+        self.cells.clear()
+        self.rects.clear()
+        self.order.clear()
+
+    def at(self, x, y):
+        """Keys of the rectangles containing the point, topmost first"""
+        size = self.cell_size
+        keys = self.cells.get((math.floor(x / size), math.floor(y / size)), ())
+        hits = [key for key in keys if _contains(self.rects[key], x, y)]
+        hits.sort(key=self.order.__getitem__, reverse=True)
+        return hits
+
+    def overlapping(self, rect, exclude=None, touching=False):
+        """Keys of the rectangles that overlap rect.
+
+        Rectangles that only share an edge with rect count only when touching
+        is true. The key exclude is left out, e.g. the rectangle being moved.
+        """
+        rect = (min(rect[0], rect[2]), min(rect[1], rect[3]), max(rect[0], rect[2]), max(rect[1], rect[3]))
+        found = set()
+        columns, rows = self._cell_range(rect)
+        for column in columns:
+            for row in rows:
+                for key in self.cells.get((column, row), ()):
+                    if key != exclude and key not in found and _overlaps(self.rects[key], rect, touching):
+                        found.add(key)
+        return found
+
+    def collisions(self):
+        """Pairs of keys whose rectangles overlap"""
+        pairs = set()
+        for keys in self.cells.values():
+            ordered = sorted(keys, key=self.order.__getitem__)
+            for i, first in enumerate(ordered):
+                for second in ordered[i + 1:]:
+                    if _overlaps(self.rects[first], self.rects[second], False):
+                        pairs.add((first, second))
+        return pairs
+
+    def transform(self, origin_x, origin_y, ratio):
+        """Scale every rectangle around a point, like canvas.scale"""
+        rects = {key: (origin_x + (x1 - origin_x) * ratio, origin_y + (y1 - origin_y) * ratio,
+                       origin_x + (x2 - origin_x) * ratio, origin_y + (y2 - origin_y) * ratio)
+                 for key, (x1, y1, x2, y2) in self.rects.items()}
+        order = sorted(rects, key=self.order.__getitem__)
+        self.clear()
+        self.cell_size = max(1.0, self.cell_size * ratio)
+        for key in order:
+            self.insert(key, rects[key])
+
+def _contains(rect, x, y):
+    return rect[0] <= x <= rect[2] and rect[1] <= y <= rect[3]
+
+def _overlaps(a, b, touching):
+    if touching:
+        return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
@@ -0,0 +1,203 @@
+import os
+import sys
+import time
+import platform
+import threading
+from contextlib import contextmanager
+
+ENV_VAR = "DK2_PROFILE_STARTUP"
+FLAG = "--profile-startup"
+REPORT_FILE = "startup_profile.txt"
+
+def profiling_requested(argv=None, environ=None):
+    """True if the startup profiler was asked for with the env var or the flag"""
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    return FLAG in argv or environ.get(ENV_VAR, "") not in ("", "0")
+
+class ImportTimer:
+    """Meta path finder that times how long each module takes to execute.
+
+    It finds specs through the finders after it and wraps exec_module on the
+    loader instance, so the modules are loaded exactly as before. Loaders
+    that are classes (built-in and frozen modules) are left alone.
+    """
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self._finding = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._finding, "active", False):
+            return None
+        self._finding.active = True
+        try:
+            spec = None
+            index = sys.meta_path.index(self) if self in sys.meta_path else -1
+            for finder in sys.meta_path[index + 1:]:
+                find_spec = getattr(finder, "find_spec", None)
+                if find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._finding.active = False
+
+        if spec is not None and spec.loader is not None:
+            self.wrap_loader(spec.loader)
+        return spec
+
+    def wrap_loader(self, loader):
+        if isinstance(loader, type) or getattr(loader, "_startup_timed", False):
+            return
+        exec_module = getattr(loader, "exec_module", None)
+        if exec_module is None:
+            return
+        profiler = self.profiler
+
+        def timed_exec_module(module):
+            if not profiler.enabled:
+                return exec_module(module)
+            name = module.__spec__.name if module.__spec__ else module.__name__
+            profiler.import_started(name)
+            try:
+                return exec_module(module)
+            finally:
+                profiler.import_finished()
+
+        try:
+            loader.exec_module = timed_exec_module
+            loader._startup_timed = True
+        except AttributeError:
+            pass  # Loaders with __slots__ are not timed
+
+class StartupProfiler:
+    """Records where the time goes while the tool starts.
+
+    Phases are timed with phase() (or begin()/end()) and may be nested.
+    Module imports are timed by an ImportTimer on sys.meta_path, with the
+    self and cumulative time of each module like python -X importtime.
+    finish() writes a report with the slowest phases and imports first to
+    the data directory. Phases that end after that, e.g. plugin tabs built
+    when they are first opened, are added to the report as they happen.
+    Everything is a no-op unless the profiler was started.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.finished = False
+        self.start_time = None
+        self.finish_time = None
+        self.report_path = None
+        self.phases = []  # (path, start offset, seconds, after startup)
+        self.imports = []  # (name, self seconds, cumulative seconds, depth, thread name)
+        self._phase_stack = []
+        self._import_stacks = threading.local()
+        self._import_timer = None
+
+    def start(self):
+        """Start recording; call as early as possible"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start_time = time.perf_counter()
+        self._import_timer = ImportTimer(self)
+        sys.meta_path.insert(0, self._import_timer)
+
+    def stop(self):
+        self.enabled = False
+        if self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+
+    def begin(self, name):
+        if not self.enabled:
+            return
+        self._phase_stack.append((name, time.perf_counter()))
+
+    def end(self):
+        if not self.enabled or not self._phase_stack:
+            return
+        path = " > ".join(name for name, _ in self._phase_stack)
+        _, started = self._phase_stack.pop()
+        self.phases.append((path, started - self.start_time, time.perf_counter() - started, self.finished))
+        if self.finished and not self._phase_stack:
+            self.write_report()
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block of code"""
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def import_started(self, name):
+        stack = self._import_stack()
+        stack.append([name, time.perf_counter(), 0.0])
+
+    def import_finished(self):
+        stack = self._import_stack()
+        if not stack:
+            return
+        name, started, children = stack.pop()
+        cumulative = time.perf_counter() - started
+        if stack:
+            stack[-1][2] += cumulative
+        self.imports.append((name, cumulative - children, cumulative, len(stack),
+                             threading.current_thread().name))
+
+    def _import_stack(self):
+        stack = getattr(self._import_stacks, "stack", None)
+        if stack is None:
+            stack = self._import_stacks.stack = []
+        return stack
+
+    def finish(self, data_dir):
+        """Startup is complete: write the report to data_dir"""
+        if not self.enabled or self.finished:
+            return
+        self.finished = True
+        self.finish_time = time.perf_counter()
+        self.report_path = os.path.join(data_dir, REPORT_FILE)
+        self.write_report()
+        print(f"Startup profile saved to: {self.report_path}")
+
+    def format_report(self):
+        total = (self.finish_time or time.perf_counter()) - self.start_time
+        lines = [
+            "Door Kickers 2 Modding Tool - startup profile",
+            f"Recorded: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Python: {platform.python_version()} ({platform.platform()})",
+            f"Startup: {total * 1000:.1f} ms",
+            "",
+            "Phases, slowest first",
+            f"{'ms':>10} {'at ms':>10}  phase",
+        ]
+        startup = [p for p in self.phases if not p[3]]
+        for path, offset, seconds, _ in sorted(startup, key=lambda p: p[2], reverse=True):
+            lines.append(f"{seconds * 1000:10.1f} {offset * 1000:10.1f}  {path}")
+
+        later = [p for p in self.phases if p[3]]
+        if later:
+            lines += ["", "After startup, slowest first", f"{'ms':>10} {'at ms':>10}  phase"]
+            for path, offset, seconds, _ in sorted(later, key=lambda p: p[2], reverse=True):
+                lines.append(f"{seconds * 1000:10.1f} {offset * 1000:10.1f}  {path}")
+
+        lines += ["", "Imports, slowest cumulative first (like python -X importtime)",
+                  f"{'self us':>10} | {'cumulative':>10} | imported package"]
+        for name, own, cumulative, depth, thread in sorted(self.imports, key=lambda i: i[2], reverse=True):
+            suffix = f"  [{thread}]" if thread != "MainThread" else ""
+            lines.append(f"{own * 1e6:10.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}{suffix}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self):
+        if not self.report_path:
+            return
+        try:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                f.write(self.format_report())
+        except OSError as e:
+            print(f"Failed to write startup profile: {e}")
+
+# Global instance, started by modding_tool when profiling is requested
+profiler = StartupProfiler()
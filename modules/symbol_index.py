@@ -0,0 +1,348 @@
+import os
+import json
+import threading
+from xml.parsers import expat
+from utils import write_text
+from modules.xml_recovery import recovered_text, WRAPPER_TAG
+
+# Kinds of symbols that are defined in one file and referenced from others
+CLASS = "class"
+EQUIPMENT = "equipment"
+DOCTRINE_NODE = "doctrine_node"
+LOCALIZATION = "localization"
+
+DOCTRINE_TREE_CONTAINER = "#MARSOC_DoctrineTree"
+LOCALIZATION_COMMENTS = ("//", "#", ";")
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("symbol_index", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[SymbolIndex] {message}")
+
+def symbol_key(kind, name):
+    """Key a symbol is looked up by; localization keys are not case sensitive"""
+    return kind, name.lower() if kind == LOCALIZATION else name
+
+class Symbol:
+    """A definition of or a reference to a named thing at a place in a file.
+
+    owner is the name of the closest element around it that has one, e.g.
+    the doctrine node whose nameUI holds a localization reference.
+    """
+    __slots__ = ("kind", "name", "file_path", "line", "tag", "attribute", "owner")
+
+    def __init__(self, kind, name, file_path, line, tag, attribute, owner=None):
+        self.kind = kind
+        self.name = name
+        self.file_path = file_path
+        self.line = line
+        self.tag = tag
+        self.attribute = attribute
+        self.owner = owner
+
+    def __repr__(self):
+        return f"Symbol({self.kind}, {self.name!r}, {os.path.basename(self.file_path)}:{self.line})"
+
+def scan_xml_symbols(file_path):
+    """Definitions and references in an XML file, as two lists of Symbols.
+
+    Runs expat over the file without building a tree; only the stack of open
+    elements is kept to know where an element sits. Hand-merged files with
+    several XML declarations or root elements, which strict expat rejects,
+    are read again through xml_recovery, like the doctrine editor reads them.
+    """
+    definitions = []
+    references = []
+    stack = []  # (tag, attrs, owner name)
+    parser = expat.ParserCreate()
+
+    def start(tag, attrs):
+        if tag == WRAPPER_TAG and not stack:
+            return  # Around the documents of a recovered file
+        line = parser.CurrentLineNumber
+        name = attrs.get("name")
+        parent = stack[-1][0] if stack else None
+        owner = name or (stack[-1][2] if stack else None)
+
+        def define(kind, value, attribute="name"):
+            definitions.append(Symbol(kind, value, file_path, line, tag, attribute, owner))
+
+        def refer(kind, value, attribute):
+            references.append(Symbol(kind, value, file_path, line, tag, attribute, owner))
+
+        root_tag = stack[0][0] if stack else tag
+        if root_tag == "Equipment":
+            if tag == "Bind":
+                if attrs.get("eqp"):
+                    refer(EQUIPMENT, attrs["eqp"], "eqp")
+                if attrs.get("to"):
+                    refer(CLASS, attrs["to"], "to")
+            elif parent == "Bind" and name:
+                if tag == "to":
+                    refer(CLASS, name, "name")
+                elif tag == "eqp":
+                    refer(EQUIPMENT, name, "name")
+            elif len(stack) == 1 and name:
+                define(EQUIPMENT, name)
+        elif tag == "Class" and parent == "Classes" and name:
+            define(CLASS, name)
+        elif tag == "Node" and name:
+            if parent == "DoctrineNodes":
+                define(DOCTRINE_NODE, name)
+            elif parent == "Doctrine":
+                refer(DOCTRINE_NODE, name, "name")
+        elif tag == "Requirement" and parent == "Requirements" and name:
+            refer(DOCTRINE_NODE, name, "name")
+        elif (tag == "Item" and name and len(stack) >= 2
+              # Nodes are the items in the sections of the tree container
+              and stack[-2][1].get("name") == DOCTRINE_TREE_CONTAINER
+              and not name.startswith("#") and name != "level"):
+            refer(DOCTRINE_NODE, name, "name")
+        elif tag == "Id" and attrs.get("class"):
+            refer(CLASS, attrs["class"], "class")
+        elif tag == "String" and root_tag == "StringTable" and name:
+            define(LOCALIZATION, name)
+
+        for attribute, value in attrs.items():
+            if value.startswith("@") and len(value) > 1 and " " not in value:
+                refer(LOCALIZATION, value[1:], attribute)
+
+        stack.append((tag, attrs, owner))
+
+    def end(tag):
+        if stack:
+            stack.pop()
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    try:
+        with open(file_path, "rb") as f:
+            parser.ParseFile(f)
+    except expat.ExpatError as e:
+        log(f"Recovering {file_path}: {e}")
+        del definitions[:], references[:], stack[:]
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        try:
+            for text in recovered_text(file_path):
+                parser.Parse(text, False)
+            parser.Parse("", True)
+        except (expat.ExpatError, UnicodeDecodeError):
+            # Broken beyond repair, or not UTF-8; report the file's own error
+            raise e from None
+    return definitions, references
+
+def scan_localization_symbols(file_path):
+    """Keys defined in a localization text file: the first word of each line"""
+    definitions = []
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith(LOCALIZATION_COMMENTS):
+                continue
+            key = line.split(None, 1)[0]
+            definitions.append(Symbol(LOCALIZATION, key, file_path, line_number, None, None, key))
+    return definitions, []
+
+def is_localization_text(file_path):
+    return (file_path.endswith(".txt")
+            and os.path.basename(os.path.dirname(file_path)).lower() == "localization")
+
+def scan_symbols(file_path):
+    if file_path.endswith(".xml"):
+        return scan_xml_symbols(file_path)
+    return scan_localization_symbols(file_path)
+
+def find_symbol_files(directory):
+    """XML and localization files under directory"""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        for file in files:
+            file_path = os.path.normpath(os.path.join(root, file))
+            if file.endswith(".xml") or is_localization_text(file_path):
+                found.append(file_path)
+    return found
+
+class SymbolIndex:
+    """Where classes, equipment, doctrine nodes and localization keys are
+    defined and referenced across the files of a mod.
+
+    The index is built once per mod and then kept current one file at a
+    time: editors call update_file() after saving, and refresh() re-reads
+    only files whose mtime or size changed. Both definitions and references
+    are stored per (kind, name) and per file, so lookups are dictionary
+    lookups and replacing a file only touches that file's symbols. Base
+    directories (the game's data) contribute definitions only, so mods
+    referring to vanilla classes or equipment are not reported as dangling.
+    """
+    def __init__(self):
+        self.mod_path = None
+        self.base_paths = set()
+        self.files = {}  # file path -> (mtime_ns, size, is_base, definitions, references)
+        self.definitions = {}  # (kind, key) -> {file path: [Symbol]}
+        self.references = {}
+        self._built = False
+        self._lock = threading.RLock()
+
+    def ensure(self, mod_path, base_paths=()):
+        """Make sure the index covers mod_path and the base directories.
+
+        Switching to another mod starts over; base directories are kept.
+        """
+        mod_path = os.path.normpath(mod_path) if mod_path else None
+        with self._lock:
+            if mod_path != self.mod_path:
+                self._forget(lambda is_base: not is_base)
+                self.mod_path = mod_path
+                self._built = False
+            if not self._built and mod_path and os.path.isdir(mod_path):
+                self._index_directory(mod_path, False)
+                self._built = True
+            for base_path in base_paths:
+                base_path = os.path.normpath(base_path)
+                if base_path not in self.base_paths and os.path.isdir(base_path):
+                    self._index_directory(base_path, True)
+                    self.base_paths.add(base_path)
+        return self
+
+    def is_ready(self, mod_path):
+        """Whether mod_path has been indexed; does not wait for an indexing run"""
+        return self._built and mod_path is not None and self.mod_path == os.path.normpath(mod_path)
+
+    def clear(self):
+        with self._lock:
+            self._forget(lambda is_base: True)
+            self.mod_path = None
+            self.base_paths.clear()
+            self._built = False
+
+    def refresh(self):
+        """Re-read files that changed on disk, drop deleted ones and add new ones"""
+        with self._lock:
+            roots = [(path, True) for path in self.base_paths]
+            if self._built and self.mod_path:
+                roots.append((self.mod_path, False))
+            seen = set()
+            for root, is_base in roots:
+                for file_path in find_symbol_files(root):
+                    seen.add(file_path)
+                    self.update_file(file_path, is_base)
+            for file_path in [path for path in self.files if path not in seen]:
+                self._remove_file(file_path)
+
+    def update_file(self, file_path, is_base=None):
+        """Re-read one file if it changed since it was indexed.
+
+        Files outside the indexed directories are ignored, so editors can call
+        this after every save.
+        """
+        file_path = os.path.normpath(file_path)
+        with self._lock:
+            if is_base is None:
+                if not self._built or not self._contains(self.mod_path, file_path):
+                    return
+                is_base = False
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                self._remove_file(file_path)
+                return
+            entry = self.files.get(file_path)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                return
+            self._remove_file(file_path)
+            try:
+                definitions, references = scan_symbols(file_path)
+            except (OSError, expat.ExpatError) as e:
+                log(f"Skipping {file_path}: {e}")
+                definitions, references = [], []
+            if is_base:
+                references = []  # Only the mod's own references are checked
+            self.files[file_path] = (stat.st_mtime_ns, stat.st_size, is_base, definitions, references)
+            self._add(self.definitions, definitions)
+            self._add(self.references, references)
+
+    def find_definitions(self, kind, name):
+        """Symbols defining name, in file order"""
+        return self._lookup(self.definitions, kind, name)
+
+    def find_references(self, kind, name):
+        """Symbols referring to name, in file order"""
+        return self._lookup(self.references, kind, name)
+
+    def is_defined(self, kind, name):
+        return symbol_key(kind, name) in self.definitions
+
+    def dangling(self):
+        """References of the mod to names that are defined nowhere"""
+        with self._lock:
+            missing = [symbol for key, by_file in self.references.items()
+                       if key not in self.definitions
+                       for symbols in by_file.values() for symbol in symbols]
+        missing.sort(key=lambda symbol: (symbol.file_path, symbol.line))
+        return missing
+
+    def _lookup(self, table, kind, name):
+        with self._lock:
+            by_file = table.get(symbol_key(kind, name), {})
+            return [symbol for file_path in sorted(by_file) for symbol in by_file[file_path]]
+
+    def _index_directory(self, directory, is_base):
+        files = find_symbol_files(directory)
+        for file_path in files:
+            self.update_file(file_path, is_base)
+        log(f"Indexed {len(files)} files in {directory}")
+
+    @staticmethod
+    def _contains(directory, file_path):
+        if not directory:
+            return False
+        return os.path.normcase(file_path).startswith(os.path.normcase(directory) + os.sep)
+
+    @staticmethod
+    def _add(table, symbols):
+        for symbol in symbols:
+            table.setdefault(symbol_key(symbol.kind, symbol.name), {}) \
+                 .setdefault(symbol.file_path, []).append(symbol)
+
+    @staticmethod
+    def _discard(table, symbols):
+        for symbol in symbols:
+            key = symbol_key(symbol.kind, symbol.name)
+            by_file = table.get(key)
+            if by_file is None:
+                continue
+            by_file.pop(symbol.file_path, None)
+            if not by_file:
+                del table[key]
+
+    def _remove_file(self, file_path):
+        entry = self.files.pop(file_path, None)
+        if entry:
+            self._discard(self.definitions, entry[3])
+            self._discard(self.references, entry[4])
+
+    def _forget(self, predicate):
+        for file_path in [path for path, entry in self.files.items() if predicate(entry[2])]:
+            self._remove_file(file_path)
+
+# Global instance shared by all plugins
+symbol_index = SymbolIndex()
+
+def write_text_indexed(file_path, content):
+    """write_text for editor saves: keeps the symbol index current with the file"""
+    write_text(file_path, content)
+    symbol_index.update_file(file_path)
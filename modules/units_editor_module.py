@@ -3,9 +3,13 @@ from tkinter import ttk, messagebox
 import xml.etree.ElementTree as ET
 import os
 import json
-from utils import load_xml as util_load_xml
+from modules.symbol_index import write_text_indexed
+from modules.xml_writer import to_string, write_xml_file
 from modules import config_editor_module
 from modules.mod_files import mod_files
+from modules.xml_cache import document_cache
+from modules.background import background
+from modules.mod_context import mod_context
 
 PLUGIN_TITLE = "Units Editor"
 
@@ -35,38 +39,10 @@ class UnitsEditor(tk.Frame):
         self.class_entries = []       # List of tuples: (class_elem, {field: entry}, remove_btn)
         self.trooper_rank_entries = []  # List of tuples: (rank_elem, {field: entry})
         self.rank_entries = []          # List of tuples: (rank_elem, {field: entry})
+        self.load_job = None            # Background parse of the unit file
         self.config = config_editor_module.load_config()
         
-        # Initialize mod_files with proper error handling
-        try:
-            mod_path = self.config.get("mod_path", "")
-            current_mod = self.config.get("last_used_mod", "")
-            
-            if not mod_path or not current_mod:
-                log(f"Invalid configuration - mod_path: {mod_path}, current_mod: {current_mod}")
-                raise ValueError("Mod path or current mod not configured")
-                
-            full_mod_path = os.path.join(mod_path, current_mod)
-            log(f"Initializing mod_files with path: {full_mod_path}")
-            
-            if not os.path.exists(full_mod_path):
-                log(f"Mod directory does not exist: {full_mod_path}")
-                raise ValueError(f"Mod directory not found: {full_mod_path}")
-            
-            # Initialize mod_files
-            mod_files.__init__(full_mod_path)
-            
-            # Verify initialization by checking if we can get the unit file
-            unit_file = mod_files.get_unit_file()
-            if unit_file:
-                log(f"Successfully found unit file: {unit_file}")
-            else:
-                log("No unit file found, creating default unit file...")
-                self.create_default_unit_file()
-                
-        except Exception as e:
-            log(f"Error initializing mod_files: {str(e)}")
-            messagebox.showerror("Error", f"Failed to initialize mod files: {str(e)}")
+        self.init_mod_files()
         
         # Create main frame to hold both scrollbars
         self.main_frame = ttk.Frame(self)
@@ -109,8 +85,57 @@ class UnitsEditor(tk.Frame):
         self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
         self.canvas.bind_all("<Shift-MouseWheel>", self._on_shift_mousewheel)
         
+        # build_ui runs once the unit file has been parsed in the background
+        self.load_xml()
+        mod_context.subscribe(self.rebind, owner=self)
+
+    def rebind(self, mod_path):
+        """Show the unit file of another mod in the existing editor"""
+        if self.load_job:
+            self.load_job.cancel()
+        self.config = config_editor_module.load_config()
+        self.init_mod_files()
+        for child in self.content_frame.winfo_children():
+            child.destroy()
+        self.tree = None
+        self.unit_elem = None
+        self.unit_attr_entries = {}
+        self.class_entries = []
+        self.trooper_rank_entries = []
+        self.rank_entries = []
         self.load_xml()
-        self.build_ui()
+
+    def init_mod_files(self):
+        """Point the shared mod index at the configured mod, creating a unit file if needed"""
+        try:
+            mod_path = self.config.get("mod_path", "")
+            current_mod = self.config.get("last_used_mod", "")
+            
+            if not mod_path or not current_mod:
+                log(f"Invalid configuration - mod_path: {mod_path}, current_mod: {current_mod}")
+                raise ValueError("Mod path or current mod not configured")
+                
+            full_mod_path = os.path.join(mod_path, current_mod)
+            log(f"Initializing mod_files with path: {full_mod_path}")
+            
+            if not os.path.exists(full_mod_path):
+                log(f"Mod directory does not exist: {full_mod_path}")
+                raise ValueError(f"Mod directory not found: {full_mod_path}")
+            
+            # Point the shared mod index at this mod (rescans only on change)
+            mod_files.set_mod_path(full_mod_path)
+            
+            # Verify initialization by checking if we can get the unit file
+            unit_file = mod_files.get_unit_file()
+            if unit_file:
+                log(f"Successfully found unit file: {unit_file}")
+            else:
+                log("No unit file found, creating default unit file...")
+                self.create_default_unit_file()
+                
+        except Exception as e:
+            log(f"Error initializing mod_files: {str(e)}")
+            messagebox.showerror("Error", f"Failed to initialize mod files: {str(e)}")
 
     def _on_frame_configure(self, event=None):
         """Reset the scroll region to encompass the inner frame"""
@@ -141,40 +166,40 @@ class UnitsEditor(tk.Frame):
             return None
 
     def load_xml(self):
-        try:
-            xml_path = self.get_xml_path()
-            if not xml_path:
-                log("No XML path returned from get_xml_path()")
-                messagebox.showerror("Error", "No unit file found. Please ensure you have selected a valid mod directory.")
-                return
-            
-            log(f"Loading XML from: {xml_path}")
-            
-            if not os.path.exists(xml_path):
-                log(f"XML file does not exist: {xml_path}")
-                messagebox.showerror("Error", f"Unit file not found: {xml_path}")
-                return
-            
-            self.tree, root = util_load_xml(xml_path)
-            if root is None:
-                log("Failed to load XML - root is None")
-                messagebox.showerror("Error", "Failed to load XML file - no root element found")
-                return
-                
-            self.unit_elem = root.find('Unit')
-            if self.unit_elem is None:
-                log("No Unit element found in XML")
-                messagebox.showerror("Error", "No <Unit> element found in the XML file. Please ensure the XML structure is correct.")
-                return
-                
+        """Parse the unit file in the background and build the UI when it is done"""
+        xml_path = self.get_xml_path()
+        if not xml_path:
+            log("No XML path returned from get_xml_path()")
+            messagebox.showerror("Error", "No unit file found. Please ensure you have selected a valid mod directory.")
+            self.build_ui()
+            return
+
+        log(f"Loading XML from: {xml_path}")
+        self.load_job = background.submit(document_cache.parse, xml_path, owner=self,
+                                          description="Loading unit file",
+                                          on_done=self.on_xml_loaded, on_error=self.on_xml_error)
+
+    def on_xml_loaded(self, tree):
+        self.tree = tree
+        self.unit_elem = tree.getroot().find('Unit')
+        if self.unit_elem is None:
+            log("No Unit element found in XML")
+            messagebox.showerror("Error", "No <Unit> element found in the XML file. Please ensure the XML structure is correct.")
+        else:
             log("Successfully loaded XML file")
-            
-        except ET.ParseError as e:
+        self.build_ui()
+
+    def on_xml_error(self, e):
+        if isinstance(e, FileNotFoundError):
+            log(f"XML file does not exist: {e.filename}")
+            messagebox.showerror("Error", f"Unit file not found: {e.filename}")
+        elif isinstance(e, ET.ParseError):
             log(f"XML Parse Error: {str(e)}")
             messagebox.showerror("Error", f"Failed to parse unit file: {str(e)}")
-        except Exception as e:
+        else:
             log(f"Unexpected error loading XML: {str(e)}")
             messagebox.showerror("Error", f"Error loading unit file: {str(e)}")
+        self.build_ui()
 
     def remove_class(self, class_elem, entries, remove_btn, row_index):
         """Remove a class from both the XML and UI"""
@@ -613,6 +638,9 @@ class UnitsEditor(tk.Frame):
                 row_index += 1
 
     def save_changes(self):
+        if self.unit_elem is None:
+            messagebox.showerror("Error", "The unit file has not been loaded")
+            return
         xml_path = self.get_xml_path()
         if not xml_path:
             messagebox.showerror("Error", "No valid XML path found")
@@ -630,14 +658,13 @@ class UnitsEditor(tk.Frame):
             messagebox.showerror("Error", "Directory does not exist. Please create it first.")
             return
         
-        # Write back to XML file with proper formatting
-        try:
-            # Format the entire XML with proper indentation
-            ET.indent(self.tree, space="    ")
-            self.tree.write(xml_path, encoding='utf-8', xml_declaration=True)
-            messagebox.showinfo("Success", "XML file updated successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to write XML: {e}")
+        # Serialize here, the tree belongs to the Tk thread; only the write is
+        # done in the background
+        data = to_string(self.tree)
+        background.submit(write_text_indexed, xml_path, data, owner=self,
+                          description="Saving unit file",
+                          on_done=lambda _: messagebox.showinfo("Success", "XML file updated successfully."),
+                          on_error=lambda e: messagebox.showerror("Error", f"Failed to write XML: {e}"))
 
     def create_default_unit_file(self):
         """Create a default unit file if none exists"""
@@ -675,22 +702,7 @@ class UnitsEditor(tk.Frame):
             trooper_ranks = ET.SubElement(unit, "TrooperRanks")
             
             # Format and save the XML
-            tree = ET.ElementTree(root)
-            
-            # Use minidom for pretty formatting
-            xml_str = ET.tostring(root, encoding='unicode')
-            dom = xml.dom.minidom.parseString(xml_str)
-            pretty_xml = dom.toprettyxml(indent='    ')
-            
-            # Clean up empty lines while preserving structure
-            lines = [line for line in pretty_xml.split('\n') if line.strip()]
-            formatted_xml = '\n'.join(lines)
-            
-            with open(unit_file, 'w', encoding='utf-8') as f:
-                if formatted_xml.startswith('<?xml'):
-                    formatted_xml = formatted_xml[formatted_xml.find('?>')+2:].strip()
-                f.write('<?xml version="1.0" encoding="utf-8"?>\n')
-                f.write(formatted_xml)
+            write_xml_file(root, unit_file)
             
             log(f"Created default unit file: {unit_file}")
             
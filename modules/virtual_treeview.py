@@ -0,0 +1,177 @@
+import tkinter as tk
+from tkinter import ttk
+
+DEFAULT_ROW_HEIGHT = 20
+WHEEL_ROWS = 3  # Rows scrolled per mouse wheel notch
+
+class VirtualTreeview(ttk.Frame):
+    """Table that only creates Treeview rows for the part that is visible.
+
+    The rows live on the Python side: the widget is told how many there are
+    with set_row_count() and asks get_values(row) for the values of the rows
+    in view. Scrolling just rewrites the values of the few materialized rows,
+    so a result set of any size costs about as much as one screen of rows.
+    The selection is tracked as a row index as well.
+    """
+    def __init__(self, parent, columns, get_values):
+        super().__init__(parent)
+        self.get_values = get_values
+        self.row_count = 0
+        self.offset = 0  # Index of the first visible row
+        self.selected_row = None
+        self._shown = {}  # iid -> row index it currently shows
+        self._refresh_job = None
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse")
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=hsb.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        hsb.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', lambda e: self.schedule_refresh())
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_rows(-WHEEL_ROWS))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_rows(WHEEL_ROWS))
+        for key, step in (('<Up>', -1), ('<Down>', 1)):
+            self.tree.bind(key, lambda e, step=step: self.move_selection(step))
+        for key, pages in (('<Prior>', -1), ('<Next>', 1)):
+            self.tree.bind(key, lambda e, pages=pages: self.move_selection(pages * self.visible_rows()))
+        self.tree.bind('<Home>', lambda e: self.move_selection(-self.row_count))
+        self.tree.bind('<End>', lambda e: self.move_selection(self.row_count))
+
+    def heading(self, column, **kwargs):
+        return self.tree.heading(column, **kwargs)
+
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+
+    def bind_rows(self, sequence, callback):
+        """Bind an event on the rows; callback gets the event and the row index"""
+        def handler(event):
+            iid = self.tree.identify_row(event.y)
+            if iid in self._shown:
+                return callback(event, self._shown[iid])
+        self.tree.bind(sequence, handler, add="+")
+
+    def set_row_count(self, row_count, keep_position=False):
+        """Show row_count rows, e.g. after the result list changed"""
+        self.row_count = row_count
+        self.selected_row = None
+        if not keep_position:
+            self.offset = 0
+        self.invalidate()
+
+    def row_height(self):
+        style = ttk.Style(self)
+        try:
+            return int(style.lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        except (tk.TclError, ValueError):
+            return DEFAULT_ROW_HEIGHT
+
+    def visible_rows(self):
+        """Number of rows that fit in the tree"""
+        height = self.tree.winfo_height()
+        if height <= 1:  # Not mapped yet
+            return 1
+        row_height = self.row_height()
+        # The first row starts below the headings
+        first = next(iter(self._shown), None)
+        bbox = self.tree.bbox(first) if first else None
+        top = bbox[1] if bbox else row_height
+        return max(1, (height - top) // row_height)
+
+    def schedule_refresh(self):
+        """Refresh once the pending resize events are handled"""
+        if self._refresh_job is None:
+            self._refresh_job = self.after_idle(self.refresh)
+
+    def refresh(self):
+        """Write the visible rows into the tree"""
+        self._refresh_job = None
+        visible = self.visible_rows()
+        self.offset = max(0, min(self.offset, self.row_count - visible))
+        count = max(0, min(visible, self.row_count - self.offset))
+
+        # Add or remove materialized rows to match the window size
+        for slot in range(len(self._shown), count):
+            self.tree.insert("", "end", iid=f"row{slot}")
+            self._shown[f"row{slot}"] = None
+        for slot in range(count, len(self._shown)):
+            self.tree.delete(f"row{slot}")
+            del self._shown[f"row{slot}"]
+
+        selected_iid = None
+        for slot in range(count):
+            iid = f"row{slot}"
+            row = self.offset + slot
+            if self._shown[iid] != row:
+                self.tree.item(iid, values=self.get_values(row))
+                self._shown[iid] = row
+            if row == self.selected_row:
+                selected_iid = iid
+
+        if selected_iid is not None:
+            if self.tree.selection() != (selected_iid,):
+                self.tree.selection_set(selected_iid)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if self.row_count:
+            self.vsb.set(self.offset / self.row_count, (self.offset + count) / self.row_count)
+        else:
+            self.vsb.set(0, 1)
+
+    def invalidate(self):
+        """Rewrite the visible rows, e.g. after the row order changed"""
+        for iid in self._shown:
+            self._shown[iid] = None
+        self.refresh()
+
+    def yview(self, *args):
+        """Scrollbar command"""
+        visible = self.visible_rows()
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * self.row_count)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self.offset += amount * visible if args[2] == "pages" else amount
+        self.refresh()
+
+    def scroll_rows(self, amount):
+        self.offset += amount
+        self.refresh()
+        return "break"
+
+    def on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        notches = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll_rows(-notches * WHEEL_ROWS)
+
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._shown:
+            self.selected_row = self._shown[selection[0]]
+
+    def move_selection(self, step):
+        """Move the selection by step rows, scrolling it into view"""
+        if not self.row_count:
+            return "break"
+        row = self.offset if self.selected_row is None else self.selected_row + step
+        self.see(max(0, min(row, self.row_count - 1)))
+        return "break"
+
+    def see(self, row):
+        """Select row and scroll it into view"""
+        self.selected_row = row
+        visible = self.visible_rows()
+        if row < self.offset:
+            self.offset = row
+        elif row >= self.offset + visible:
+            self.offset = row - visible + 1
+        self.refresh()
@@ -0,0 +1,108 @@
+import os
+import json
+import copy
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+MAX_CACHE_BYTES = 64 * 1024 * 1024  # Total source file size kept in memory
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("xml_cache", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[XMLCache] {message}")
+
+class DocumentCache:
+    """Shared cache of parsed XML documents keyed by (path, mtime, size).
+
+    Entries are evicted least recently used first once the summed size of the
+    cached source files exceeds max_bytes. The cache lives for one session
+    only: unpickling a large tree takes longer than parsing the file again.
+    It is safe to use from the background worker and the Tk thread at the
+    same time.
+    """
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # path -> (mtime_ns, size, root)
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+
+    def parse(self, file_path):
+        """Return an ElementTree for file_path that the caller may modify freely"""
+        return ET.ElementTree(copy.deepcopy(self._get_root(file_path)))
+
+    def parse_shared(self, file_path):
+        """Return the cached ElementTree itself. Callers must not modify it."""
+        return ET.ElementTree(self._get_root(file_path))
+
+    def _get_root(self, file_path):
+        key = os.path.normpath(os.path.abspath(file_path))
+        stat = os.stat(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[2]
+            self.misses += 1
+
+        # Parse outside the lock so other files can be served meanwhile
+        root = ET.parse(key).getroot()
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, root)
+            self._total_bytes += stat.st_size
+            log(f"Parsed {os.path.basename(key)}")
+            self._evict()
+        return root
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def _evict(self):
+        """Drop least recently used documents until we are within budget"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._remove(key)
+            log(f"Evicted {os.path.basename(key)}")
+
+    def invalidate(self, file_path):
+        """Forget a cached document"""
+        with self._lock:
+            self._remove(os.path.normpath(os.path.abspath(file_path)))
+
+    def clear(self):
+        """Forget all cached documents and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current size of the cache"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes
+        }
+
+# Global instance shared by all editors
+document_cache = DocumentCache()
@@ -0,0 +1,225 @@
+import os
+import re
+import json
+import codecs
+import xml.etree.ElementTree as ET
+
+CHUNK_SIZE = 1 << 16
+WRAPPER_TAG = "__recovered__"
+WRAPPER_START = f"<{WRAPPER_TAG}>"
+WRAPPER_END = f"</{WRAPPER_TAG}>"
+DECLARATION_START = "<?xml"
+MAX_DECLARATION = 4096  # A "<?xml" without "?>" within this many characters is left alone
+BOM = "\ufeff"
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("xml_recovery", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[XmlRecovery] {message}")
+
+class Repair:
+    """Something recover_xml changed to make a file parse; line is 1-based, 0 if unknown"""
+    __slots__ = ("line", "message")
+
+    def __init__(self, line, message):
+        self.line = line
+        self.message = message
+
+    def __str__(self):
+        return f"line {self.line}: {self.message}" if self.line else self.message
+
+class _DeclarationFilter:
+    """Removes XML declarations from text arriving in chunks.
+
+    Only the declaration itself is dropped; the newlines in it are kept so
+    the parser's line numbers still match the file. A declaration split
+    across two chunks is held back until its end arrives.
+    """
+    def __init__(self):
+        self.pending = ""
+        self.line = 1  # Line of the start of pending
+        self.declarations = []  # Lines of the removed declarations
+
+    def feed(self, chunk):
+        text = self.pending + chunk
+        out = []
+        position = 0
+        while True:
+            start = text.find(DECLARATION_START, position)
+            if start < 0:
+                # Keep a tail that could be the start of a declaration
+                keep = _partial_start(text, position)
+                break
+            after = start + len(DECLARATION_START)
+            if after >= len(text):
+                keep = start
+                break
+            if not text[after].isspace():
+                # A processing instruction like <?xml-stylesheet?>
+                out.append(text[position:after])
+                self.line += text.count("\n", position, after)
+                position = after
+                continue
+            end = text.find("?>", after)
+            if end < 0:
+                if len(text) - start > MAX_DECLARATION:
+                    out.append(text[position:after])
+                    self.line += text.count("\n", position, after)
+                    position = after
+                    continue
+                keep = start
+                break
+            out.append(text[position:start])
+            self.line += text.count("\n", position, start)
+            self.declarations.append(self.line)
+            newlines = text.count("\n", start, end)
+            out.append("\n" * newlines)
+            self.line += newlines
+            position = end + 2
+        out.append(text[position:keep])
+        self.line += text.count("\n", position, keep)
+        self.pending = text[keep:]
+        return "".join(out)
+
+    def close(self):
+        rest, self.pending = self.pending, ""
+        return rest
+
+def _partial_start(text, position):
+    """Index of a trailing prefix of DECLARATION_START in text, or len(text)"""
+    for length in range(min(len(DECLARATION_START) - 1, len(text) - position), 0, -1):
+        if DECLARATION_START.startswith(text[-length:]):
+            return len(text) - length
+    return len(text)
+
+def _is_blank(text):
+    return not text or not text.replace(BOM, "").strip()
+
+def _snippet(text):
+    text = " ".join(text.replace(BOM, "").split())
+    return text if len(text) <= 40 else text[:37] + "..."
+
+def recovered_text(source, declarations=None, chunk_size=CHUNK_SIZE):
+    """The text of a file in chunks, ready to be fed to any XML parser.
+
+    source is a file path or a binary file. The text is wrapped in a
+    WRAPPER_TAG element and its XML declarations and byte order marks are
+    dropped, so a file holding several documents parses as the children of
+    the wrapper. The wrapper's start tag takes no line of its own, so line
+    numbers match the file. Pass a _DeclarationFilter as declarations to
+    learn where the declarations were.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from recovered_text(f, declarations, chunk_size)
+        return
+    if declarations is None:
+        declarations = _DeclarationFilter()
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    yield WRAPPER_START
+    while True:
+        data = source.read(chunk_size)
+        if not data:
+            break
+        yield declarations.feed(decoder.decode(data))
+    yield declarations.feed(decoder.decode(b"", final=True))
+    yield declarations.close()
+    yield WRAPPER_END
+
+def recover_xml(source, root_tag=None, chunk_size=CHUNK_SIZE):
+    """Parse a hand-edited or concatenated XML file, repairing what it can.
+
+    source is a file path or a binary file. The file is read in chunks and
+    parsed as it comes in, inside a wrapper element, so it may hold several
+    documents one after the other: repeated XML declarations and byte
+    order marks are dropped, several top-level elements are accepted, and
+    text between them is ignored. The top-level elements then become one
+    root: elements named root_tag are merged into a single one and other
+    elements are moved into it. Without root_tag, the file must hold one
+    top-level element, or several with the same name.
+
+    Returns (root element, list of Repairs); a file that was fine gives no
+    repairs. Raises ET.ParseError for anything else that is not well-formed,
+    with the position in the file.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return recover_xml(f, root_tag, chunk_size)
+
+    declarations = _DeclarationFilter()
+    parser = ET.XMLParser()
+    try:
+        for text in recovered_text(source, declarations, chunk_size):
+            parser.feed(text)
+        wrapper = parser.close()
+    except ET.ParseError as e:
+        raise _file_position(e, len(WRAPPER_START)) from None
+
+    repairs = [Repair(line, "removed a repeated XML declaration")
+               for line in declarations.declarations[1:]]
+    if declarations.declarations and declarations.declarations[0] != 1:
+        repairs.insert(0, Repair(declarations.declarations[0], "removed an XML declaration that was not at the start"))
+
+    stray = [wrapper.text] + [child.tail for child in wrapper]
+    for text in stray:
+        if not _is_blank(text):
+            repairs.append(Repair(0, f"ignored text outside the root element: '{_snippet(text)}'"))
+
+    elements = list(wrapper)
+    if root_tag is None:
+        tags = {element.tag for element in elements}
+        if len(tags) != 1:
+            raise ET.ParseError("no root element" if not tags else
+                                f"several root elements: {', '.join(sorted(tags))}")
+        root_tag = tags.pop()
+
+    roots = [element for element in elements if element.tag == root_tag]
+    if len(elements) == 1 and roots:
+        root = roots[0]
+        root.tail = None
+    else:
+        root = ET.Element(root_tag, roots[0].attrib if roots else {})
+        children = []
+        for element in elements:
+            element.tail = None
+            if element.tag == root_tag:
+                children.extend(element)
+            else:
+                children.append(element)
+        root[:] = children
+        if len(roots) > 1:
+            repairs.append(Repair(0, f"merged {len(roots)} <{root_tag}> elements into one"))
+        loose = len(elements) - len(roots)
+        if loose:
+            elements_text = f"{loose} element{'s' if loose != 1 else ''}"
+            if roots:
+                repairs.append(Repair(0, f"moved {elements_text} outside <{root_tag}> into it"))
+            else:
+                repairs.append(Repair(0, f"added the missing <{root_tag}> root around {elements_text}"))
+
+    for repair in repairs:
+        log(str(repair))
+    return root, repairs
+
+def _file_position(error, shift):
+    """The parse error with its column on line 1 moved back past the wrapper tag"""
+    line, column = getattr(error, "position", (0, 0))
+    if line == 1:
+        column = max(0, column - shift)
+    message = re.sub(r": line \d+, column \d+$", "", str(error))
+    recovered = ET.ParseError(f"{message}: line {line}, column {column}")
+    recovered.code = getattr(error, "code", None)
+    recovered.position = (line, column)
+    return recovered
@@ -0,0 +1,171 @@
+import os
+import json
+import threading
+from xml.parsers import expat
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from modules.persistent_cache import load_pickle, save_pickle
+
+CACHE_FILE = "xml_validation_cache.pickle"  # In the data directory
+CACHE_VERSION = 1
+MIN_POOL_FILES = 8  # Fewer changed files than this are checked in this process
+READ_SIZE = 1 << 16
+
+def is_logging_enabled():
+    """Check if logging is enabled for this module"""
+    try:
+        config_path = os.path.join(os.path.dirname(__file__), 'logging_config.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+                return config.get("xml_validation", False)
+    except Exception:
+        pass
+    return False
+
+def log(message):
+    """Module specific logging function"""
+    if is_logging_enabled():
+        print(f"[XmlValidation] {message}")
+
+class ValidationResult:
+    """Outcome of checking one file; line and column are 1-based, 0 if unknown"""
+    __slots__ = ("file_path", "valid", "line", "column", "message", "cached")
+
+    def __init__(self, file_path, valid, line=0, column=0, message="", cached=False):
+        self.file_path = file_path
+        self.valid = valid
+        self.line = line
+        self.column = column
+        self.message = message
+        self.cached = cached
+
+def find_xml_files(directory):
+    """All .xml files under directory, sorted"""
+    xml_files = []
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith('.xml'):
+                xml_files.append(os.path.normpath(os.path.join(root, file)))
+    xml_files.sort()
+    return xml_files
+
+def check_file(file_path):
+    """Check that a file is well-formed XML.
+
+    Runs in the worker processes. The file goes through expat without
+    building a tree, so only the parser state is kept in memory. Returns
+    (valid, line, column, message).
+    """
+    parser = expat.ParserCreate()
+    try:
+        with open(file_path, "rb") as f:
+            parser.ParseFile(f)
+    except expat.ExpatError as e:
+        return False, e.lineno, e.offset + 1, expat.ErrorString(e.code)
+    except OSError as e:
+        return False, 0, 0, str(e)
+    return True, 0, 0, ""
+
+class ValidationCache:
+    """Results of earlier runs, keyed by file path and its mtime and size.
+
+    A file whose stat did not change since it was checked keeps its result,
+    so a run only has to parse files that were edited. The cache is pickled
+    to cache_file in the data directory.
+    """
+    def __init__(self, cache_file=CACHE_FILE):
+        self.cache_file = cache_file
+        self.files = {}  # file path -> (mtime_ns, size, (valid, line, column, message))
+        self.lock = threading.Lock()  # Held by the run that is updating the cache
+        self._loaded = False
+        self._dirty = False
+
+    def lookup(self, file_path, stat):
+        entry = self.files.get(file_path)
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            return None
+        return entry[2]
+
+    def update(self, file_path, stat, outcome):
+        self.files[file_path] = (stat.st_mtime_ns, stat.st_size, outcome)
+        self._dirty = True
+
+    def load(self):
+        """Read the persisted cache from disk once per session"""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = load_pickle(self.cache_file, CACHE_VERSION)
+        if data is not None:
+            self.files = data.get("files", {})
+            log(f"Loaded validation cache with {len(self.files)} files")
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        if self._dirty and save_pickle(self.cache_file, CACHE_VERSION, {"files": self.files}):
+            self._dirty = False
+            log(f"Saved validation cache with {len(self.files)} files")
+
+# Global instance shared by all runs
+validation_cache = ValidationCache()
+
+def validate_files(file_paths, cache=None, max_workers=None, progress=None):
+    """Check every file in file_paths and return their ValidationResults in order.
+
+    Unchanged files take their result from the cache; the others are parsed
+    on a process pool, since expat holds the GIL. progress(done, total,
+    message) is called as results come in.
+    """
+    cache = validation_cache if cache is None else cache
+    results = [None] * len(file_paths)
+    done = 0
+
+    def report(file_path):
+        nonlocal done
+        done += 1
+        if progress:
+            progress(done, len(file_paths), os.path.basename(file_path))
+
+    with cache.lock:
+        cache.load()
+        changed = []
+        for index, file_path in enumerate(file_paths):
+            try:
+                stat = os.stat(file_path)
+            except OSError as e:
+                results[index] = ValidationResult(file_path, False, message=str(e))
+                report(file_path)
+                continue
+            outcome = cache.lookup(file_path, stat)
+            if outcome is None:
+                changed.append((index, file_path, stat))
+            else:
+                results[index] = ValidationResult(file_path, *outcome, cached=True)
+                report(file_path)
+
+        def store(index, file_path, stat, outcome):
+            cache.update(file_path, stat, outcome)
+            results[index] = ValidationResult(file_path, *outcome)
+            report(file_path)
+
+        try:
+            # Starting worker processes costs more than parsing a few files
+            if len(changed) < MIN_POOL_FILES:
+                for index, file_path, stat in changed:
+                    store(index, file_path, stat, check_file(file_path))
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {executor.submit(check_file, file_path): (index, file_path, stat)
+                               for index, file_path, stat in changed}
+                    for future in as_completed(futures):
+                        index, file_path, stat = futures[future]
+                        try:
+                            outcome = future.result()
+                        except Exception as e:
+                            outcome = (False, 0, 0, str(e))
+                        store(index, file_path, stat, outcome)
+        finally:
+            cache.save()
+
+    log(f"Validated {len(file_paths)} files, {len(changed)} parsed")
+    return results
@@ -0,0 +1,128 @@
+import io
+import xml.etree.ElementTree as ET
+
+DECLARATION = '<?xml version="1.0" encoding="utf-8"?>'
+INDENT = "    "
+
+def escape_text(text):
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+def escape_attribute(value):
+    value = escape_text(value)
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+class XmlWriter:
+    """Writes indented XML to a text stream as it goes.
+
+    Elements can be written one call at a time (start/end/empty/comment) or
+    as whole ElementTree subtrees with element(). Every element goes on its
+    own line, indented by its depth; an element with only text keeps it on
+    the same line. Whitespace-only text and tails from parsed files are
+    dropped so re-saved files are indented the same way as new ones.
+    Nothing is buffered beyond the stream's own buffer.
+    """
+    def __init__(self, out, indent=INDENT, declaration=DECLARATION):
+        self.out = out
+        self.indent = indent
+        self.open_tags = []
+        if declaration:
+            out.write(declaration + "\n")
+
+    def _line(self, text):
+        self.out.write(self.indent * len(self.open_tags) + text + "\n")
+
+    @staticmethod
+    def _start_tag(tag, attrib):
+        if not attrib:
+            return "<" + tag
+        return "<" + tag + "".join(f' {key}="{escape_attribute(str(value))}"'
+                                   for key, value in attrib.items())
+
+    def start(self, tag, attrib=None):
+        """Open an element whose children follow"""
+        self._line(self._start_tag(tag, attrib) + ">")
+        self.open_tags.append(tag)
+
+    def end(self):
+        """Close the element opened last"""
+        tag = self.open_tags.pop()
+        self._line(f"</{tag}>")
+
+    def empty(self, tag, attrib=None, text=None):
+        """An element without children, with optional text"""
+        if text:
+            self._line(f"{self._start_tag(tag, attrib)}>{escape_text(text)}</{tag}>")
+        else:
+            self._line(self._start_tag(tag, attrib) + "/>")
+
+    def comment(self, text):
+        self._line(f"<!-- {text} -->")
+
+    def blank_line(self):
+        self.out.write("\n")
+
+    def text(self, text):
+        """Text inside the open element, on a line of its own"""
+        text = text.strip()
+        if text:
+            self._line(escape_text(text))
+
+    def element(self, elem):
+        """Write an ElementTree element and everything in it"""
+        if elem.tag is ET.Comment:
+            self.comment((elem.text or "").strip())
+            return
+        if elem.tag is ET.ProcessingInstruction:
+            self._line(f"<?{elem.text}?>")
+            return
+
+        if len(elem) == 0:
+            # Text is kept as it is, unless it is only whitespace
+            has_text = bool(elem.text and elem.text.strip())
+            self.empty(elem.tag, elem.attrib, elem.text if has_text else None)
+            return
+
+        self.start(elem.tag, elem.attrib)
+        if elem.text:
+            self.text(elem.text)
+        for child in elem:
+            self.element(child)
+            if child.tail:
+                self.text(child.tail)
+        self.end()
+
+    def close(self):
+        while self.open_tags:
+            self.end()
+
+def write_element(root, out, indent=INDENT, declaration=DECLARATION):
+    """Write an element (or ElementTree) with a declaration to a text stream"""
+    if isinstance(root, ET.ElementTree):
+        root = root.getroot()
+    writer = XmlWriter(out, indent, declaration)
+    writer.element(root)
+
+def write_xml_file(root, file_path, indent=INDENT, declaration=DECLARATION):
+    """Write an element (or ElementTree) to a UTF-8 file in one pass"""
+    with open(file_path, "w", encoding="utf-8") as f:
+        write_element(root, f, indent, declaration)
+
+def to_string(root, indent=INDENT, declaration=DECLARATION):
+    """Serialize an element for writing later, e.g. from a background job"""
+    out = io.StringIO()
+    write_element(root, out, indent, declaration)
+    return out.getvalue()
@@ -1,6 +1,8 @@
+import os
 import tkinter as tk
 from tkinter import messagebox
 import xml.etree.ElementTree as ET
+from modules.xml_cache import document_cache
 
 
 def load_file(file_path):
@@ -25,10 +27,52 @@ def save_file(file_path, content):
         return False
 
 
+def read_text(file_path):
+    """Read a UTF-8 text file; raises on error, for use in background jobs."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def write_text(file_path, content):
+    """Write a UTF-8 text file; raises on error, for use in background jobs."""
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def write_files(contents):
+    """Write several files as one step: contents maps file paths to str or bytes.
+
+    Everything is written to temporary files next to the targets first, so
+    a failure leaves all of the originals untouched; the temporary files
+    then replace the originals. str is written as UTF-8 text, bytes as is,
+    and a function is called with the open UTF-8 text file to write into.
+    """
+    temp_paths = {}
+    try:
+        for file_path, content in contents.items():
+            temp_paths[file_path] = temp_path = file_path + ".tmp"
+            if isinstance(content, bytes):
+                with open(temp_path, "wb") as f:
+                    f.write(content)
+            elif callable(content):
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    content(f)
+            else:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(content)
+    except BaseException:
+        for temp_path in temp_paths.values():
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+    for file_path, temp_path in temp_paths.items():
+        os.replace(temp_path, file_path)
+
+
 def load_xml(file_path):
     """Load and parse XML file with error handling in a friendly manner."""
     try:
-        tree = ET.parse(file_path)
+        tree = document_cache.parse(file_path)
         return tree, tree.getroot()
     except Exception as e:
         messagebox.showerror("XML Error", f"Oops, we couldn't parse the XML file:\n{file_path}\nPlease check the file format.\nError details: {e}")